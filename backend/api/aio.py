@@ -0,0 +1,311 @@
+import asyncio
+import contextlib
+import functools
+import importlib
+import os
+import time
+import weakref
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+from psycopg_pool import AsyncConnectionPool
+
+from core import (
+    DB_POOL_MAX_SIZE, DB_POOL_MIN_SIZE, DB_POOL_PING_AFTER, DB_POOL_TIMEOUT, TABLE_VERSIONS_QUERY,
+    WORKSPACE_BIND_QUERY, catalog_cache, compress_response, current_metrics, empty_response,
+    etag_headers, etag_matches, event_dispatcher, get_header, get_workspace_id,
+    instrument_async_handler, json_response, make_table_etag, options_response, parse_wait,
+    record_phase
+)
+from router import RESOURCES, cached_response, handlers as sync_handlers
+
+SNAPSHOT_BEGIN = 'BEGIN ISOLATION LEVEL REPEATABLE READ, READ ONLY'
+
+class WorkspaceNotFound(Exception):
+    pass
+
+class AsyncPool:
+    '''
+    Business: асинхронный пул соединений движка API_ENGINE=async, переживающий тёплые вызовы
+    Args: min_size, max_size, timeout, ping_after - те же настройки DB_POOL_*, что у синхронного пула
+    
+    Пул открывается при первом запросе внутри работающего event loop. Соединения в autocommit:
+    границы транзакции, если они нужны, задаёт сам пакет запросов (BEGIN ... COMMIT в конвейере).
+    Пул и его замок привязаны к своему циклу: если вызов пришёл в другом цикле (среда запускает
+    обработчик через asyncio.run), пул прежнего цикла закрывается и открывается новый. Воркеры
+    старого пула умерли вместе с циклом, и его close() не доходит до соединений, поэтому пул
+    запоминает свои соединения через configure и закрывает их сам.
+    '''
+    def __init__(self, min_size: int, max_size: int, timeout: float, ping_after: float):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._pool: Optional[AsyncConnectionPool] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connections: weakref.WeakSet = weakref.WeakSet()
+        self._released_at: Dict[int, float] = {}
+        self._workspaces: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.stats = {'pipelines': 0, 'statements': 0, 'reconnects': 0, 'loop_changes': 0}
+    
+    async def _check(self, conn) -> None:
+        if time.monotonic() - self._released_at.get(id(conn), 0.0) < self.ping_after:
+            return
+        try:
+            await conn.execute('SELECT 1')
+        except Exception:
+            self.stats['reconnects'] += 1
+            raise
+    
+    async def _track(self, conn) -> None:
+        self._connections.add(conn)
+    
+    async def _drop_stale(self, pool: AsyncConnectionPool, connections: List[Any]) -> None:
+        self.stats['loop_changes'] += 1
+        with contextlib.suppress(Exception):
+            await pool.close(timeout=0)
+        for conn in connections:
+            with contextlib.suppress(Exception):
+                await conn.close()
+    
+    async def _get_pool(self) -> AsyncConnectionPool:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            stale, connections = self._pool, list(self._connections)
+            self._loop, self._lock, self._pool = loop, asyncio.Lock(), None
+            self._connections = weakref.WeakSet()
+            self._released_at.clear()
+            if stale is not None:
+                await self._drop_stale(stale, connections)
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    pool = AsyncConnectionPool(
+                        os.environ.get('DATABASE_URL'), min_size=self.min_size, max_size=self.max_size,
+                        timeout=self.timeout, kwargs={'autocommit': True}, check=self._check,
+                        configure=self._track, open=False
+                    )
+                    await pool.open()
+                    self._pool = pool
+        return self._pool
+    
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        started = time.perf_counter()
+        pool = await self._get_pool()
+        async with pool.connection() as conn:
+            record_phase('connect', started)
+            try:
+                yield conn
+            finally:
+                self._released_at[id(conn)] = time.monotonic()
+    
+    def is_bound(self, conn, workspace_id: int) -> bool:
+        return self._workspaces.get(conn) == workspace_id
+    
+    def remember_workspace(self, conn, workspace_id: int) -> None:
+        self._workspaces[conn] = workspace_id
+    
+    def forget_workspace(self, conn) -> None:
+        self._workspaces.pop(conn, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats, engine='async', min_size=self.min_size, max_size=self.max_size)
+        if self._pool is not None:
+            stats.update(self._pool.get_stats())
+        return stats
+
+async_pool = AsyncPool(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT, DB_POOL_PING_AFTER)
+
+class AsyncReader:
+    '''
+    Business: пакетное чтение на одном соединении в режиме конвейера (pipeline mode): запросы пакета
+              уходят в БД не дожидаясь ответов, результаты забираются после одной синхронизации
+    Args: conn - соединение из AsyncPool, workspace_id - рабочее пространство запроса,
+          bind - выставить app.workspace_id первым запросом первого пакета
+    '''
+    def __init__(self, conn, workspace_id: int, bind: bool):
+        self.conn = conn
+        self.workspace_id = workspace_id
+        self.bind = bind
+    
+    async def run(self, statements: Sequence[Tuple[str, Any]], snapshot: bool = False) -> List[Tuple[List[tuple], Any]]:
+        '''
+        Business: выполняет пакет запросов за один round-trip
+        Args: statements - пары (SQL, аргументы или None),
+              snapshot - обернуть пакет в BEGIN REPEATABLE READ ... COMMIT
+        Returns: пары (строки, description) в порядке запросов; WorkspaceNotFound, если пространства нет
+        '''
+        bind = self.bind
+        if bind:
+            statements = [(WORKSPACE_BIND_QUERY, (str(self.workspace_id), self.workspace_id)), *statements]
+        if snapshot:
+            # пакет конвейера до Sync - одна неявная транзакция, поэтому BEGIN обязан идти первым
+            statements = [(SNAPSHOT_BEGIN, None), *statements, ('COMMIT', None)]
+        
+        started = time.perf_counter()
+        cursors = []
+        async with self.conn.pipeline():
+            for query, args in statements:
+                cursor = self.conn.cursor()
+                await cursor.execute(query, args)
+                cursors.append(cursor)
+        record_phase('execute', started)
+        
+        started = time.perf_counter()
+        results = []
+        for cursor in cursors:
+            rows = await cursor.fetchall() if cursor.description else []
+            results.append((rows, cursor.description))
+        record_phase('fetch', started)
+        
+        async_pool.stats['pipelines'] += 1
+        async_pool.stats['statements'] += len(statements)
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.queries += len(statements)
+            metrics.rows += sum(len(rows) for rows, _ in results)
+        
+        if snapshot:
+            results = results[1:-1]
+        if bind:
+            self.bind = False
+            if not results[0][0][0][1]:
+                async_pool.forget_workspace(self.conn)
+                raise WorkspaceNotFound()
+            async_pool.remember_workspace(self.conn, self.workspace_id)
+            results = results[1:]
+        return results
+    
+    async def read(self, event: Dict[str, Any], tables: Tuple[str, ...], etag_params: Dict[str, Any],
+                   statements: List[Tuple[str, Any]], snapshot: bool = False):
+        '''
+        Business: чтение с ETag: версии таблиц и запросы ответа идут одним пакетом, а при
+                  If-None-Match версии проверяются отдельным коротким пакетом, чтобы 304 не
+                  выполнял запросы ответа
+        Args: tables/etag_params - как у get_table_etag, statements - запросы ответа,
+              snapshot - выполнить запросы ответа в одном снимке REPEATABLE READ
+        Returns: (ответ 304 или None, заголовки кэширования, результаты statements)
+        '''
+        versions_statement = (TABLE_VERSIONS_QUERY, (self.workspace_id, list(tables)))
+        headers = None
+        batch = list(statements)
+        if get_header(event, 'If-None-Match'):
+            [(versions, _)] = await self.run([versions_statement])
+            headers = etag_headers(make_table_etag(versions, etag_params, self.workspace_id))
+            if etag_matches(event, headers['ETag']):
+                return empty_response(304, headers), headers, []
+        else:
+            batch.insert(0, versions_statement)
+        
+        results = await self.run(batch, snapshot)
+        if headers is None:
+            versions = results.pop(0)[0]
+            headers = etag_headers(make_table_etag(versions, etag_params, self.workspace_id))
+        return None, headers, results
+
+async def serve_async(resource: str, event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    '''
+    Business: асинхронный двойник router.serve для чтений: CORS, статистика пула и кэша, рабочее
+              пространство, кэш справочников, соединение из AsyncPool, сжатие ответа
+    Args: resource - имя ресурса, event/context - как у handler
+    Returns: HTTP response dict того же вида, что у синхронного движка
+    '''
+    method: str = event.get('httpMethod', 'GET')
+    if method == 'OPTIONS':
+        return options_response()
+    
+    params = event.get('queryStringParameters') or {}
+    if method == 'GET' and params.get('action') == 'pool':
+        return json_response(200, {'pool': async_pool.get_stats()})
+    if method == 'GET' and params.get('action') == 'cache':
+        return json_response(200, {'cache': catalog_cache.get_stats(), 'events': event_dispatcher.get_stats()})
+    
+    try:
+        workspace_id = get_workspace_id(event)
+    except ValueError as e:
+        return json_response(400, {'error': str(e)})
+    
+    module = importlib.import_module(f'resources.{resource}')
+    if method == 'GET' and params.get('action') in getattr(module, 'LONG_POLL_ACTIONS', ()):
+        return compress_response(event, await long_poll_async(module, event, workspace_id))
+    
+    namespace = getattr(module, 'CACHE_NAMESPACE', None)
+    cache_key = None
+    if namespace and not params.get('action'):
+        namespace = f'{namespace}:{workspace_id}'
+        cache_key = catalog_cache.make_key(params)
+        generation = await run_cache_call(catalog_cache.generation, namespace)
+        cached = await run_cache_call(catalog_cache.get, namespace, cache_key, generation)
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.cache = 'miss' if cached is None else 'hit'
+        if cached is not None:
+            return cached_response(event, cached)
+    
+    async with async_pool.connection() as conn:
+        reader = AsyncReader(conn, workspace_id, not async_pool.is_bound(conn, workspace_id))
+        try:
+            response = await module.handle_async(event, reader, workspace_id)
+        except WorkspaceNotFound:
+            return json_response(404, {'error': 'Workspace not found'})
+    
+    if cache_key is not None and response['statusCode'] == 200:
+        await run_cache_call(
+            catalog_cache.set, namespace, cache_key, {'body': response['body'], 'headers': response['headers']}, generation
+        )
+    return compress_response(event, response)
+
+async def long_poll_async(module, event: Dict[str, Any], workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: асинхронный двойник router.long_poll: ожидание уведомления не занимает ни соединение,
+              ни поток - корутина ждёт future, который будит EventDispatcher
+    Args: module - ресурс с poll_async(event, db, workspace_id, final)
+    Returns: HTTP response dict от module.poll_async
+    '''
+    try:
+        wait = parse_wait(event.get('queryStringParameters') or {})
+    except ValueError as e:
+        return json_response(400, {'error': str(e)})
+    
+    deadline = time.monotonic() + wait
+    if wait and not event_dispatcher.running:
+        await asyncio.to_thread(event_dispatcher.start)
+    while True:
+        position = event_dispatcher.position(workspace_id)
+        final = not event_dispatcher.running or time.monotonic() >= deadline
+        async with async_pool.connection() as conn:
+            reader = AsyncReader(conn, workspace_id, not async_pool.is_bound(conn, workspace_id))
+            try:
+                response = await module.poll_async(event, reader, workspace_id, final)
+            except WorkspaceNotFound:
+                return json_response(404, {'error': 'Workspace not found'})
+        if response is not None:
+            return response
+        await event_dispatcher.wait_async(workspace_id, position, max(deadline - time.monotonic(), 0))
+
+async def run_cache_call(call: Callable, *args):
+    if catalog_cache.shared_url:
+        return await asyncio.to_thread(call, *args)
+    return call(*args)
+
+async_handlers: Dict[str, Callable] = {
+    resource: instrument_async_handler(resource)(functools.partial(serve_async, resource))
+    for resource in RESOURCES
+}
+
+async def dispatch_async(resource: str, event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    '''
+    Business: точка входа движка API_ENGINE=async: чтения, которые ресурс умеет выполнять
+              асинхронно, идут через AsyncPool, остальное - синхронным движком в пуле потоков
+    Args: resource - имя ресурса, event/context - как у handler
+    Returns: HTTP response dict
+    '''
+    if resource not in async_handlers:
+        return json_response(404, {'error': 'Unknown resource'})
+    method: str = event.get('httpMethod', 'GET')
+    params = event.get('queryStringParameters') or {}
+    module = importlib.import_module(f'resources.{resource}')
+    if method != 'OPTIONS' and params.get('action') not in ('pool', 'cache') and not module.handles_async(method, params):
+        return await asyncio.to_thread(sync_handlers[resource], event, context)
+    return await async_handlers[resource](event, context)
@@ -0,0 +1,883 @@
+import asyncio
+import base64
+import contextvars
+import functools
+import gzip
+import hashlib
+import json
+import os
+import random
+import select
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', '1'))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', '5'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '5'))
+DB_POOL_PING_AFTER = float(os.environ.get('DB_POOL_PING_AFTER', '30'))
+
+DEFAULT_WORKSPACE_ID = int(os.environ.get('DEFAULT_WORKSPACE_ID', '1'))
+
+CATALOG_CACHE_TTL = float(os.environ.get('CATALOG_CACHE_TTL', '5'))
+CATALOG_CACHE_SIZE = int(os.environ.get('CATALOG_CACHE_SIZE', '128'))
+CATALOG_CACHE_URL = os.environ.get('CATALOG_CACHE_URL', '')
+CATALOG_CACHE_SHARED_TTL = int(os.environ.get('CATALOG_CACHE_SHARED_TTL', '60'))
+
+RESPONSE_COMPRESS_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', '1024'))
+RESPONSE_GZIP_LEVEL = int(os.environ.get('RESPONSE_GZIP_LEVEL', '6'))
+RESPONSE_BROTLI_QUALITY = int(os.environ.get('RESPONSE_BROTLI_QUALITY', '5'))
+
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '200'))
+SLOW_QUERY_EXPLAIN_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_RATE', '0.1'))
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'false').lower() in ('1', 'true', 'yes')
+REQUEST_LOG = os.environ.get('REQUEST_LOG', 'true').lower() in ('1', 'true', 'yes')
+API_ENGINE = os.environ.get('API_ENGINE', 'sync')
+
+LONG_POLL_MAX_WAIT = float(os.environ.get('LONG_POLL_MAX_WAIT', '20'))
+EVENTS_LISTEN_TIMEOUT = float(os.environ.get('EVENTS_LISTEN_TIMEOUT', '5'))
+
+request_metrics: contextvars.ContextVar = contextvars.ContextVar('request_metrics', default=None)
+
+class RequestMetrics:
+    '''
+    Business: замеры одного вызова: время по фазам, число запросов и строк, медленные запросы
+    Args: function - имя функции, request_id - идентификатор вызова из context
+    '''
+    def __init__(self, function: str, request_id: Optional[str]):
+        self.function = function
+        self.request_id = request_id
+        self.started = time.perf_counter()
+        self.phases = {'connect': 0.0, 'execute': 0.0, 'fetch': 0.0, 'serialize': 0.0}
+        self.queries = 0
+        self.rows = 0
+        self.slow_queries: List[Dict[str, Any]] = []
+        self.cache: Optional[str] = None
+    
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+    
+    def server_timing(self, total_ms: float) -> str:
+        parts = [f'{phase};dur={ms:.1f}' for phase, ms in self.phases.items()]
+        parts.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(parts)
+    
+    def log(self, event: Dict[str, Any], status: Any, total_ms: float) -> None:
+        print(json.dumps({
+            'request_id': self.request_id,
+            'function': self.function,
+            'method': event.get('httpMethod'),
+            'params': event.get('queryStringParameters') or {},
+            'status': status,
+            'duration_ms': round(total_ms, 3),
+            'phases_ms': {phase: round(ms, 3) for phase, ms in self.phases.items()},
+            'queries': self.queries,
+            'rows': self.rows,
+            'cache': self.cache,
+            'slow_queries': self.slow_queries
+        }, ensure_ascii=False, default=str), flush=True)
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return request_metrics.get()
+
+def record_phase(phase: str, started: float) -> None:
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.phases[phase] += (time.perf_counter() - started) * 1000
+
+def explain_query(conn, statement: str) -> Any:
+    head = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+    if head not in ('SELECT', 'WITH') or any(
+        keyword in statement.upper() for keyword in ('INSERT ', 'UPDATE ', 'DELETE ', 'FOR UPDATE')
+    ):
+        return None
+    with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cursor:
+        cursor.execute('SAVEPOINT explain_slow_query')
+        try:
+            cursor.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + statement)
+            plan = cursor.fetchone()[0]
+            cursor.execute('RELEASE SAVEPOINT explain_slow_query')
+            return plan
+        except psycopg2.Error as e:
+            cursor.execute('ROLLBACK TO SAVEPOINT explain_slow_query')
+            return {'error': str(e).strip()}
+
+class InstrumentedCursorMixin:
+    '''
+    Business: учитывает время execute/fetch, число запросов и строк в метриках текущего вызова
+    '''
+    def execute(self, query, vars=None):
+        metrics = current_metrics()
+        started = time.perf_counter()
+        result = super().execute(query, vars)
+        if metrics is not None:
+            elapsed = (time.perf_counter() - started) * 1000
+            metrics.phases['execute'] += elapsed
+            metrics.queries += 1
+            if elapsed >= SLOW_QUERY_MS:
+                statement = self.query.decode('utf-8', 'replace') if self.query else str(query)
+                slow = {'sql': statement[:2000], 'ms': round(elapsed, 3)}
+                if random.random() < SLOW_QUERY_EXPLAIN_RATE:
+                    slow['plan'] = explain_query(self.connection, statement)
+                metrics.slow_queries.append(slow)
+        return result
+    
+    def copy_expert(self, sql, file, size=8192):
+        started = time.perf_counter()
+        result = super().copy_expert(sql, file, size)
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.phases['execute'] += (time.perf_counter() - started) * 1000
+            metrics.queries += 1
+        return result
+    
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.phases['fetch'] += (time.perf_counter() - started) * 1000
+            metrics.rows += row is not None
+        return row
+    
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(size) if size is not None else super().fetchmany()
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.phases['fetch'] += (time.perf_counter() - started) * 1000
+            metrics.rows += len(rows)
+        return rows
+    
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.phases['fetch'] += (time.perf_counter() - started) * 1000
+            metrics.rows += len(rows)
+        return rows
+
+class InstrumentedDictCursor(InstrumentedCursorMixin, RealDictCursor):
+    pass
+
+class InstrumentedCursor(InstrumentedCursorMixin, psycopg2.extensions.cursor):
+    pass
+
+def add_server_timing(metrics: RequestMetrics, response: Dict[str, Any]) -> None:
+    headers = dict(response.get('headers') or {})
+    headers['Server-Timing'] = metrics.server_timing(metrics.elapsed_ms())
+    exposed = headers.get('Access-Control-Expose-Headers')
+    headers['Access-Control-Expose-Headers'] = f'{exposed}, Server-Timing' if exposed else 'Server-Timing'
+    response['headers'] = headers
+
+def instrument_handler(function: str):
+    '''
+    Business: оборачивает handler: метрики вызова, структурный JSON-лог и заголовок Server-Timing
+    Args: function - имя функции для логов
+    Returns: декоратор handler(event, context)
+    '''
+    def decorate(handler):
+        @functools.wraps(handler)
+        def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            metrics = RequestMetrics(function, getattr(context, 'request_id', None))
+            token = request_metrics.set(metrics)
+            status: Any = 'error'
+            try:
+                response = handler(event, context)
+                status = response.get('statusCode')
+                if SERVER_TIMING:
+                    add_server_timing(metrics, response)
+                return response
+            finally:
+                request_metrics.reset(token)
+                if REQUEST_LOG:
+                    metrics.log(event, status, metrics.elapsed_ms())
+        return wrapper
+    return decorate
+
+def instrument_async_handler(function: str):
+    '''
+    Business: то же, что instrument_handler, для корутин асинхронного движка; метрики живут
+              в contextvar, поэтому параллельные запросы одного event loop не смешиваются
+    Args: function - имя функции для логов
+    Returns: декоратор async handler(event, context)
+    '''
+    def decorate(handler):
+        @functools.wraps(handler)
+        async def wrapper(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+            metrics = RequestMetrics(function, getattr(context, 'request_id', None))
+            token = request_metrics.set(metrics)
+            status: Any = 'error'
+            try:
+                response = await handler(event, context)
+                status = response.get('statusCode')
+                if SERVER_TIMING:
+                    add_server_timing(metrics, response)
+                return response
+            finally:
+                request_metrics.reset(token)
+                if REQUEST_LOG:
+                    metrics.log(event, status, metrics.elapsed_ms())
+        return wrapper
+    return decorate
+
+WORKSPACE_BIND_QUERY = "SELECT set_config('app.workspace_id', %s, false), EXISTS (SELECT 1 FROM workspaces WHERE id = %s)"
+
+class ConnectionPool:
+    '''
+    Business: пул соединений с БД, переживающий тёплые вызовы функции
+    Args: min_size, max_size - границы пула, timeout - ожидание свободного слота в секундах,
+          ping_after - через сколько секунд простоя проверять соединение перед выдачей
+    '''
+    def __init__(self, min_size: int, max_size: int, timeout: float, ping_after: float):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self._pool = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._released_at: Dict[int, float] = {}
+        self._workspaces: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.stats = {'hits': 0, 'misses': 0, 'reconnects': 0, 'waits': 0, 'wait_ms': 0.0, 'max_wait_ms': 0.0}
+    
+    def _get_pool(self) -> ThreadedConnectionPool:
+        if self._pool is None:
+            self._pool = ThreadedConnectionPool(
+                self.min_size, self.max_size,
+                os.environ.get('DATABASE_URL'), cursor_factory=InstrumentedDictCursor
+            )
+        return self._pool
+    
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - self._released_at.get(id(conn), 0.0) < self.ping_after:
+            return True
+        try:
+            with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cursor:
+                cursor.execute('SELECT 1')
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+    
+    def getconn(self):
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolError('connection pool exhausted')
+        waited_ms = (time.monotonic() - started) * 1000
+        self.stats['wait_ms'] += waited_ms
+        if waited_ms > 1:
+            self.stats['waits'] += 1
+        self.stats['max_wait_ms'] = max(self.stats['max_wait_ms'], waited_ms)
+        
+        try:
+            with self._lock:
+                pool = self._get_pool()
+                reused = bool(pool._pool)
+                conn = pool.getconn()
+                while reused and not self._is_healthy(conn):
+                    self._released_at.pop(id(conn), None)
+                    pool.putconn(conn, close=True)
+                    self.stats['reconnects'] += 1
+                    reused = bool(pool._pool)
+                    conn = pool.getconn()
+            self.stats['hits' if reused else 'misses'] += 1
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def putconn(self, conn) -> None:
+        close = bool(conn.closed)
+        if not close and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                close = True
+        with self._lock:
+            if close:
+                self._released_at.pop(id(conn), None)
+            else:
+                self._released_at[id(conn)] = time.monotonic()
+            self._get_pool().putconn(conn, close=close)
+        self._slots.release()
+    
+    def bind_workspace(self, conn, workspace_id: int) -> bool:
+        '''
+        Business: выставляет app.workspace_id на соединении, по которому фильтруют политики RLS
+        Args: conn - соединение из пула, workspace_id - рабочее пространство запроса
+        Returns: False, если такого рабочего пространства нет
+        
+        Значение ставится на сессию и фиксируется, поэтому повторный запрос того же
+        пространства на этом соединении не тратит лишний round-trip. Привязка к несуществующему
+        пространству не запоминается: следующий запрос на этом соединении снова её проверит.
+        '''
+        if self._workspaces.get(conn) == workspace_id:
+            return True
+        with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cursor:
+            cursor.execute(WORKSPACE_BIND_QUERY, (str(workspace_id), workspace_id))
+            exists = cursor.fetchone()[1]
+        conn.commit()
+        if exists:
+            self._workspaces[conn] = workspace_id
+        else:
+            self._workspaces.pop(conn, None)
+        return exists
+    
+    def get_stats(self) -> Dict[str, Any]:
+        pool = self._pool
+        return dict(
+            self.stats,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            idle=len(pool._pool) if pool else 0,
+            in_use=len(pool._used) if pool else 0
+        )
+
+db_pool = ConnectionPool(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT, DB_POOL_PING_AFTER)
+
+def get_db_connection():
+    started = time.perf_counter()
+    conn = db_pool.getconn()
+    record_phase('connect', started)
+    return conn
+
+def release_db_connection(conn) -> None:
+    db_pool.putconn(conn)
+
+def get_workspace_id(event: Dict[str, Any]) -> int:
+    '''
+    Business: рабочее пространство запроса из заголовка X-Workspace-Id
+    Args: event - событие запроса
+    Returns: id рабочего пространства, DEFAULT_WORKSPACE_ID без заголовка
+    
+    Лента ?action=events принимает пространство и в параметре workspace_id: EventSource в
+    браузере не умеет слать свои заголовки. Заголовок, если он есть, главнее параметра.
+    
+    Заголовок только выбирает область данных и ничего не удостоверяет: идентификаторы
+    последовательные, клиент может подставить любой. RLS по app.workspace_id разделяет данные
+    пространств внутри одного запроса, но не отделяет арендаторов друг от друга - для этого
+    пространство нужно выводить из аутентифицированных учётных данных, а не из заголовка.
+    '''
+    value, name = get_header(event, 'X-Workspace-Id'), 'X-Workspace-Id'
+    params = event.get('queryStringParameters') or {}
+    if not value and params.get('action') == 'events':
+        value, name = params.get('workspace_id'), 'workspace_id'
+    if value is None or value == '':
+        return DEFAULT_WORKSPACE_ID
+    if not value.isdigit():
+        raise ValueError(f'Invalid {name}')
+    return int(value)
+
+class CatalogCache:
+    '''
+    Business: read-through кэш готовых ответов справочников (теги, проекты) в тёплом экземпляре
+    Args: ttl - время жизни локальной записи в секундах, max_entries - размер LRU,
+          shared_url - необязательный Redis-совместимый backend, общий для всех экземпляров,
+          shared_ttl - время жизни записи в общем backend
+    
+    Запись в своём экземпляре сбрасывает пространство имён сразу, в общем backend - для всех
+    экземпляров; локальные копии в других экземплярах живут не дольше ttl. Поколение общего
+    backend входит в имя его ключа: ответ, прочитанный до записи, попадает в уже брошенный ключ.
+    '''
+    def __init__(self, ttl: float, max_entries: int, shared_url: str = '', shared_ttl: int = 60):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared_url = shared_url
+        self.shared_ttl = shared_ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._shared = None
+        if shared_url:
+            import redis
+            self._shared = redis.Redis.from_url(shared_url, socket_timeout=0.2)
+        self.stats = {
+            'hits': 0, 'shared_hits': 0, 'misses': 0, 'invalidations': 0, 'evictions': 0,
+            'stale_stores': 0, 'shared_errors': 0
+        }
+    
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        return json.dumps(params, sort_keys=True, separators=(',', ':'))
+    
+    def generation(self, namespace: str) -> Tuple[int, Optional[int]]:
+        '''
+        Business: снимок поколения пространства имён до чтения из БД; set с этим снимком не сохранит
+                  ответ, если запись успела сбросить кэш, пока ответ строился
+        Returns: локальное поколение и поколение общего backend (None без него или при ошибке)
+        '''
+        with self._lock:
+            local = self._generations.get(namespace, 0)
+        if self._shared is None:
+            return local, None
+        try:
+            return local, int(self._shared.get(f'catalog:{namespace}:generation') or 0)
+        except Exception:
+            self.stats['shared_errors'] += 1
+            return local, None
+    
+    def get(self, namespace: str, key: str, generation: Tuple[int, Optional[int]]) -> Optional[Dict[str, Any]]:
+        local_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(local_key)
+            if entry is not None:
+                expires_at, stored, value = entry
+                if expires_at > time.monotonic() and stored == self._generations.get(namespace, 0):
+                    self._entries.move_to_end(local_key)
+                    self.stats['hits'] += 1
+                    return value
+                del self._entries[local_key]
+        
+        if generation[1] is not None:
+            try:
+                raw = self._shared.hget(f'catalog:{namespace}:{generation[1]}', key)
+            except Exception:
+                raw = None
+                self.stats['shared_errors'] += 1
+            if raw is not None:
+                value = json.loads(raw)
+                self._store(local_key, value, generation[0])
+                self.stats['shared_hits'] += 1
+                return value
+        
+        self.stats['misses'] += 1
+        return None
+    
+    def set(self, namespace: str, key: str, value: Dict[str, Any], generation: Tuple[int, Optional[int]]) -> None:
+        self._store((namespace, key), value, generation[0])
+        if generation[1] is not None:
+            try:
+                name = f'catalog:{namespace}:{generation[1]}'
+                pipe = self._shared.pipeline()
+                pipe.hset(name, key, json.dumps(value))
+                pipe.expire(name, self.shared_ttl)
+                pipe.execute()
+            except Exception:
+                self.stats['shared_errors'] += 1
+    
+    def _store(self, local_key: Tuple[str, str], value: Dict[str, Any], generation: int) -> None:
+        with self._lock:
+            if generation != self._generations.get(local_key[0], 0):
+                self.stats['stale_stores'] += 1
+                return
+            self._entries[local_key] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end(local_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def invalidate(self, namespace: str, shared: bool = True) -> None:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self.stats['invalidations'] += 1
+        if shared and self._shared is not None:
+            try:
+                generation = self._shared.incr(f'catalog:{namespace}:generation')
+                self._shared.delete(f'catalog:{namespace}:{generation - 1}')
+            except Exception:
+                self.stats['shared_errors'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['shared_hits'] + self.stats['misses']
+        hits = self.stats['hits'] + self.stats['shared_hits']
+        return dict(
+            self.stats,
+            entries=len(self._entries),
+            hit_ratio=round(hits / lookups, 4) if lookups else None,
+            ttl=self.ttl,
+            shared=self._shared is not None
+        )
+
+catalog_cache = CatalogCache(CATALOG_CACHE_TTL, CATALOG_CACHE_SIZE, CATALOG_CACHE_URL, CATALOG_CACHE_SHARED_TTL)
+
+class EventDispatcher:
+    '''
+    Business: диспетчер уведомлений об изменениях в тёплом экземпляре: одно выделенное соединение
+              слушает канал LISTEN и будит long-poll запросы своего рабочего пространства
+    Args: channel - канал pg_notify, в payload которого приходит workspace_id
+    
+    Запускается первым long-poll запросом. Ожидающий запрос запоминает позицию счётчика своего
+    пространства до чтения из БД, поэтому уведомление между чтением и ожиданием не теряется.
+    Подписчики (subscribe) получают workspace_id каждого уведомления - так события
+    сбрасывают локальный кэш справочников в каждом слушающем экземпляре.
+    '''
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._changed = threading.Condition()
+        self._positions: Dict[int, int] = {}
+        self._futures: Dict[int, List[Tuple[Any, Any]]] = {}
+        self._subscribers: List[Callable[[int], None]] = []
+        self.stats = {'notifications': 0, 'reconnects': 0, 'wakeups': 0, 'timeouts': 0}
+    
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        self._subscribers.append(callback)
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._ready.is_set()
+    
+    def start(self) -> None:
+        with self._changed:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f'listen-{self.channel}', daemon=True)
+                self._thread.start()
+        self._ready.wait(EVENTS_LISTEN_TIMEOUT)
+    
+    def position(self, workspace_id: int) -> int:
+        with self._changed:
+            return self._positions.get(workspace_id, 0)
+    
+    def wait(self, workspace_id: int, position: int, timeout: float) -> bool:
+        '''
+        Business: ждёт уведомления для рабочего пространства не дольше timeout секунд
+        Returns: True, если позиция сдвинулась с position
+        '''
+        with self._changed:
+            changed = self._changed.wait_for(lambda: self._positions.get(workspace_id, 0) != position, timeout)
+        self.stats['wakeups' if changed else 'timeouts'] += 1
+        return changed
+    
+    async def wait_async(self, workspace_id: int, position: int, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        with self._changed:
+            if self._positions.get(workspace_id, 0) != position:
+                return True
+            self._futures.setdefault(workspace_id, []).append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+            self.stats['wakeups'] += 1
+            return True
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            return False
+        finally:
+            with self._changed:
+                waiters = self._futures.get(workspace_id, [])
+                if waiter in waiters:
+                    waiters.remove(waiter)
+    
+    def _publish(self, workspace_ids) -> None:
+        with self._changed:
+            if workspace_ids is None:
+                workspace_ids = set(self._positions) | set(self._futures)
+            futures = []
+            for workspace_id in workspace_ids:
+                self._positions[workspace_id] = self._positions.get(workspace_id, 0) + 1
+                futures.extend(self._futures.pop(workspace_id, []))
+            self._changed.notify_all()
+        for loop, future in futures:
+            loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(True))
+        for workspace_id in workspace_ids:
+            for callback in self._subscribers:
+                callback(workspace_id)
+    
+    def _run(self) -> None:
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.channel}')
+                if self._ready.is_set():
+                    # уведомления, пришедшие пока соединения не было, потеряны: пусть все перечитают
+                    self._publish(None)
+                self._ready.set()
+                while True:
+                    if not select.select([conn], [], [], 60)[0]:
+                        continue
+                    conn.poll()
+                    workspace_ids = set()
+                    while conn.notifies:
+                        payload = conn.notifies.pop(0).payload
+                        if payload.isdigit():
+                            workspace_ids.add(int(payload))
+                    self.stats['notifications'] += len(workspace_ids)
+                    self._publish(workspace_ids)
+            except Exception as e:
+                self.stats['reconnects'] += 1
+                print(json.dumps({'event': 'listen_failed', 'channel': self.channel, 'error': str(e)}, ensure_ascii=False), flush=True)
+                time.sleep(1)
+            finally:
+                if conn is not None:
+                    conn.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, running=self.running, workspaces=len(self._positions))
+
+event_dispatcher = EventDispatcher('task_events')
+
+def parse_wait(params: Dict[str, Any]) -> float:
+    value = params.get('wait')
+    if value is None or value == '':
+        return LONG_POLL_MAX_WAIT
+    try:
+        wait = float(value)
+    except ValueError:
+        raise ValueError('Invalid wait')
+    if wait < 0:
+        raise ValueError('Invalid wait')
+    return min(wait, LONG_POLL_MAX_WAIT)
+
+TEMPORAL_TYPE_CODES = (1082, 1114, 1184)
+
+class RowEncoder:
+    '''
+    Business: превращает кортежи обычного курсора в словари без промежуточных копий
+    Args: description - cursor.description запроса, по нему один раз вычисляются колонки и позиции дат
+    Returns: encode(rows) - список словарей, готовых для dumps
+    '''
+    
+    def __init__(self, description):
+        self.columns = tuple(column.name for column in description)
+        self.temporal = tuple(
+            index for index, column in enumerate(description)
+            if column.type_code in TEMPORAL_TYPE_CODES
+        )
+    
+    def encode(self, rows: List[tuple]) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        columns = self.columns
+        if orjson is not None or not self.temporal:
+            encoded = [dict(zip(columns, row)) for row in rows]
+        else:
+            temporal = self.temporal
+            encoded = []
+            for row in rows:
+                item = dict(zip(columns, row))
+                for index in temporal:
+                    value = row[index]
+                    if value is not None:
+                        item[columns[index]] = value.isoformat()
+                encoded.append(item)
+        record_phase('serialize', started)
+        return encoded
+    
+    def encode_rows(self, rows: List[tuple]) -> List[Any]:
+        '''
+        Business: колоночный вид - значения строк без повторения имён ключей, имена берутся из columns
+        '''
+        if orjson is not None or not self.temporal:
+            return rows
+        started = time.perf_counter()
+        temporal = self.temporal
+        encoded = []
+        for row in rows:
+            values = list(row)
+            for index in temporal:
+                if values[index] is not None:
+                    values[index] = values[index].isoformat()
+            encoded.append(values)
+        record_phase('serialize', started)
+        return encoded
+
+row_encoders: Dict[Tuple[Tuple[str, int], ...], RowEncoder] = {}
+
+def get_row_encoder(description) -> RowEncoder:
+    key = tuple((column.name, column.type_code) for column in description)
+    encoder = row_encoders.get(key)
+    if encoder is None:
+        encoder = row_encoders[key] = RowEncoder(description)
+    return encoder
+
+def dumps(payload: Dict[str, Any]) -> str:
+    started = time.perf_counter()
+    if orjson is not None:
+        body = orjson.dumps(payload).decode()
+    else:
+        body = json.dumps(payload, separators=(',', ':'))
+    record_phase('serialize', started)
+    return body
+
+def dumps_lines(items: List[Dict[str, Any]]) -> bytes:
+    '''
+    Business: сериализует пачку объектов в NDJSON - по объекту на строку
+    Args: items - словари из RowEncoder.encode
+    Returns: байты UTF-8, каждая строка заканчивается переводом строки
+    '''
+    started = time.perf_counter()
+    if orjson is not None:
+        body = b''.join(orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE) for item in items)
+    else:
+        body = ''.join(json.dumps(item, separators=(',', ':')) + '\n' for item in items).encode()
+    record_phase('serialize', started)
+    return body
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, PATCH, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, If-None-Match, If-Match, X-Workspace-Id',
+    'Access-Control-Max-Age': '86400'
+}
+
+def options_response() -> Dict[str, Any]:
+    return {'statusCode': 200, 'headers': dict(CORS_HEADERS), 'body': '', 'isBase64Encoded': False}
+
+def raw_response(status: int, body: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    return {
+        'statusCode': status,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            **(headers or {})
+        },
+        'body': body,
+        'isBase64Encoded': False
+    }
+
+def binary_response(status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    return {
+        'statusCode': status,
+        'headers': {'Access-Control-Allow-Origin': '*', **(headers or {})},
+        'body': base64.b64encode(body).decode('ascii'),
+        'isBase64Encoded': True
+    }
+
+def json_response(status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    return raw_response(status, dumps(payload), headers)
+
+def empty_response(status: int, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    return {
+        'statusCode': status,
+        'headers': {'Access-Control-Allow-Origin': '*', **(headers or {})},
+        'body': '',
+        'isBase64Encoded': False
+    }
+
+CACHE_CONTROL = os.environ.get('CACHE_CONTROL', 'public, max-age=0, must-revalidate')
+
+def get_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+def choose_encoding(event: Dict[str, Any], supported: Tuple[str, ...]) -> Optional[str]:
+    '''
+    Business: выбирает сжатие по Accept-Encoding с учётом q-весов
+    Args: supported - доступные кодировки в порядке предпочтения сервера
+    Returns: кодировка или None, если клиент не принимает ни одну из них
+    '''
+    weights: Dict[str, float] = {}
+    for item in (get_header(event, 'Accept-Encoding') or '').lower().split(','):
+        coding, _, params = item.partition(';')
+        weight = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding.strip():
+            weights[coding.strip()] = weight
+    best, best_weight = None, 0.0
+    for coding in supported:
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+RESPONSE_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress_response(event: Dict[str, Any], response: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Business: сжимает текстовое тело ответа brotli или gzip, если клиент это принимает и тело
+              не меньше RESPONSE_COMPRESS_MIN_BYTES; платформа требует base64 для бинарного тела
+    Args: event - запрос с Accept-Encoding, response - готовый ответ обработчика
+    Returns: сжатый ответ с Content-Encoding и ETag с суффиксом кодировки, либо исходный ответ
+    '''
+    body = response.get('body')
+    if response.get('isBase64Encoded') or not isinstance(body, str) or len(body) < RESPONSE_COMPRESS_MIN_BYTES:
+        return response
+    coding = choose_encoding(event, RESPONSE_ENCODINGS)
+    if coding is None:
+        return response
+    
+    started = time.perf_counter()
+    data = body.encode()
+    if coding == 'br':
+        compressed = brotli.compress(data, quality=RESPONSE_BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)
+    record_phase('serialize', started)
+    
+    headers = dict(response.get('headers') or {})
+    headers['Content-Encoding'] = coding
+    headers['Vary'] = ', '.join(filter(None, (headers.get('Vary'), 'Accept-Encoding')))
+    if headers.get('ETag', '').endswith('"'):
+        headers['ETag'] = headers['ETag'][:-1] + f'-{coding}"'
+    return {
+        **response,
+        'headers': headers,
+        'body': base64.b64encode(compressed).decode('ascii'),
+        'isBase64Encoded': True
+    }
+
+TABLE_VERSIONS_QUERY = 'SELECT name, version FROM table_versions WHERE workspace_id = %s AND name = ANY(%s) ORDER BY name'
+
+def get_table_etag(cursor, tables: Tuple[str, ...], params: Dict[str, Any], workspace_id: int) -> str:
+    '''
+    Business: строит сильный ETag ответа из версий таблиц рабочего пространства, которые увеличивают
+              триггеры на запись
+    Args: tables - таблицы, от которых зависит ответ, params - query-параметры запроса,
+          workspace_id - рабочее пространство, чтобы ETag одного пространства не совпал с другим
+    Returns: ETag в кавычках
+    '''
+    cursor.execute(TABLE_VERSIONS_QUERY, (workspace_id, list(tables)))
+    return make_table_etag([(row['name'], row['version']) for row in cursor.fetchall()], params, workspace_id)
+
+def make_table_etag(versions: List[Tuple[str, int]], params: Dict[str, Any], workspace_id: int) -> str:
+    stamp = ','.join(f'{name}:{version}' for name, version in versions)
+    query = '&'.join(f'{key}={value}' for key, value in sorted(params.items()))
+    return '"' + hashlib.sha256(f'{workspace_id}|{stamp}|{query}'.encode()).hexdigest()[:32] + '"'
+
+def etag_matches(event: Dict[str, Any], etag: str) -> bool:
+    header = get_header(event, 'If-None-Match')
+    if not header:
+        return False
+    candidates = [strip_etag_coding(c.strip().removeprefix('W/')) for c in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+def strip_etag_coding(etag: str) -> str:
+    '''
+    Business: убирает суффикс кодировки, который compress_response добавляет к ETag сжатого ответа
+    Args: etag - ETag в кавычках из If-None-Match или If-Match
+    Returns: ETag несжатого представления
+    '''
+    for coding in ('br', 'gzip'):
+        if etag.endswith(f'-{coding}"'):
+            return etag[:-len(coding) - 2] + '"'
+    return etag
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    return {
+        'ETag': etag,
+        'Cache-Control': CACHE_CONTROL,
+        'Vary': 'X-Workspace-Id',
+        'Access-Control-Expose-Headers': 'ETag'
+    }
@@ -0,0 +1,28 @@
+from typing import Dict, Any
+
+from core import API_ENGINE
+from router import dispatch
+
+if API_ENGINE == 'async':
+    from aio import dispatch_async
+    
+    async def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        '''
+        Business: единая точка входа API задач, тегов и проектов с общим пулом соединений;
+                  асинхронный движок, включается API_ENGINE=async
+        Args: event - dict с httpMethod, body, queryStringParameters (resource=tasks|tags|projects)
+              context - объект с атрибутами request_id, function_name
+        Returns: HTTP response dict
+        '''
+        params = event.get('queryStringParameters') or {}
+        return await dispatch_async(params.get('resource', ''), event, context)
+else:
+    def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        '''
+        Business: единая точка входа API задач, тегов и проектов с общим пулом соединений
+        Args: event - dict с httpMethod, body, queryStringParameters (resource=tasks|tags|projects)
+              context - объект с атрибутами request_id, function_name
+        Returns: HTTP response dict
+        '''
+        params = event.get('queryStringParameters') or {}
+        return dispatch(params.get('resource', ''), event, context)
@@ -0,0 +1,157 @@
+import json
+from typing import Dict, Any, Tuple
+
+from core import empty_response, etag_headers, etag_matches, get_table_etag, json_response, raw_response
+
+CACHE_NAMESPACE = 'projects'
+CACHE_INVALIDATES = ('projects',)
+
+def etag_tables(params: Dict[str, Any]) -> Tuple[str, ...]:
+    return ('projects', 'tasks') if params.get('with_counts') == 'true' else ('projects',)
+
+def list_projects_query(with_counts: bool) -> str:
+    '''
+    Business: запрос списка проектов рабочего пространства одним JSON-массивом, собранным в БД
+    Args: with_counts - добавить счётчики задач
+    Returns: SQL с одним параметром workspace_id, JSON-массив текстом, отсортированный по имени
+    '''
+    if with_counts:
+        query = '''
+            SELECT p.id, p.name, p.description, p.color, p.created_at, p.updated_at,
+                   c.task_count, c.completed_count, c.high_priority_count
+            FROM projects p
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) AS task_count,
+                       COUNT(*) FILTER (WHERE completed) AS completed_count,
+                       COUNT(*) FILTER (WHERE priority = 'high' AND NOT completed) AS high_priority_count
+                FROM tasks
+                WHERE project_id = p.id
+            ) c
+            WHERE p.workspace_id = %s
+        '''
+    else:
+        query = '''
+            SELECT id, name, description, color, created_at, updated_at
+            FROM projects
+            WHERE workspace_id = %s
+        '''
+    return f'''
+        SELECT COALESCE(json_agg(r ORDER BY r.name), '[]')::text AS projects
+        FROM ({query}) r
+    '''
+
+def list_projects_json(cursor, workspace_id: int, with_counts: bool) -> str:
+    cursor.execute(list_projects_query(with_counts), (workspace_id,))
+    return cursor.fetchone()['projects']
+
+def handles_async(method: str, params: Dict[str, Any]) -> bool:
+    return method == 'GET'
+
+async def handle_async(event: Dict[str, Any], db, workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: чтение списка проектов асинхронным движком: версии таблиц для ETag и сам список
+              уходят в БД одним пакетом конвейера
+    Args: event - как у handle, db - AsyncReader соединения, workspace_id - рабочее пространство
+    Returns: HTTP response dict, совпадающий с ответом handle
+    '''
+    params = event.get('queryStringParameters') or {}
+    statement = (list_projects_query(params.get('with_counts') == 'true'), (workspace_id,))
+    not_modified, cache_headers, results = await db.read(event, etag_tables(params), params, [statement])
+    if not_modified is not None:
+        return not_modified
+    
+    rows, _ = results[0]
+    return raw_response(200, '{"projects":' + rows[0][0] + '}', cache_headers)
+
+def handle(event: Dict[str, Any], conn, cursor, workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: API для управления проектами с поддержкой CRUD операций
+    Args: event - dict с httpMethod, body, queryStringParameters
+          conn, cursor - соединение из общего пула и курсор со строками-словарями,
+          workspace_id - рабочее пространство запроса
+    Returns: HTTP response dict
+    '''
+    method: str = event.get('httpMethod', 'GET')
+    params = event.get('queryStringParameters') or {}
+    
+    cache_headers = {}
+    if method == 'GET':
+        etag = get_table_etag(cursor, etag_tables(params), params, workspace_id)
+        cache_headers = etag_headers(etag)
+        if etag_matches(event, etag):
+            return empty_response(304, cache_headers)
+    
+    if method == 'GET':
+        projects_json = list_projects_json(cursor, workspace_id, params.get('with_counts') == 'true')
+        
+        return raw_response(200, '{"projects":' + projects_json + '}', cache_headers)
+    
+    elif method == 'POST':
+        body = json.loads(event.get('body', '{}'))
+        
+        cursor.execute('''
+            INSERT INTO projects (name, description, color)
+            VALUES (%s, %s, %s)
+            RETURNING id, name, description, color, created_at, updated_at
+        ''', (
+            body.get('name'),
+            body.get('description'),
+            body.get('color')
+        ))
+        
+        project = cursor.fetchone()
+        conn.commit()
+        
+        project_dict = dict(project)
+        if project_dict.get('created_at'):
+            project_dict['created_at'] = project_dict['created_at'].isoformat()
+        if project_dict.get('updated_at'):
+            project_dict['updated_at'] = project_dict['updated_at'].isoformat()
+        
+        return json_response(201, {'project': project_dict})
+    
+    elif method == 'PUT':
+        body = json.loads(event.get('body', '{}'))
+        project_id = body.get('id')
+        
+        cursor.execute('''
+            UPDATE projects 
+            SET name = %s, description = %s, color = %s, updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND workspace_id = %s
+            RETURNING id, name, description, color, created_at, updated_at
+        ''', (
+            body.get('name'),
+            body.get('description'),
+            body.get('color'),
+            project_id,
+            workspace_id
+        ))
+        
+        project = cursor.fetchone()
+        conn.commit()
+        
+        if not project:
+            return json_response(404, {'error': 'Project not found'})
+        
+        project_dict = dict(project)
+        if project_dict.get('created_at'):
+            project_dict['created_at'] = project_dict['created_at'].isoformat()
+        if project_dict.get('updated_at'):
+            project_dict['updated_at'] = project_dict['updated_at'].isoformat()
+        
+        return json_response(200, {'project': project_dict})
+    
+    elif method == 'DELETE':
+        params = event.get('queryStringParameters', {})
+        project_id = params.get('id')
+        
+        cursor.execute('DELETE FROM projects WHERE id = %s AND workspace_id = %s RETURNING id', (project_id, workspace_id))
+        deleted = cursor.fetchone()
+        conn.commit()
+        
+        if not deleted:
+            return json_response(404, {'error': 'Project not found'})
+        
+        return json_response(200, {'success': True})
+    
+    return json_response(405, {'error': 'Method not allowed'})
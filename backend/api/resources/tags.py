@@ -0,0 +1,156 @@
+import json
+from typing import Dict, Any, Tuple
+
+from core import empty_response, etag_headers, etag_matches, get_table_etag, json_response, raw_response
+
+CACHE_NAMESPACE = 'tags'
+CACHE_INVALIDATES = ('tags',)
+
+def etag_tables(params: Dict[str, Any]) -> Tuple[str, ...]:
+    return ('tags', 'task_tags', 'tasks') if params.get('with_counts') == 'true' else ('tags',)
+
+def list_tags_query(with_counts: bool) -> str:
+    '''
+    Business: запрос списка тегов рабочего пространства одним JSON-массивом, собранным в БД
+    Args: with_counts - добавить счётчики задач
+    Returns: SQL с одним параметром workspace_id, JSON-массив текстом, отсортированный по имени
+    '''
+    if with_counts:
+        query = '''
+            SELECT g.id, g.name, g.color, g.description, g.created_at, g.updated_at,
+                   c.task_count, c.completed_count
+            FROM tags g
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) AS task_count,
+                       COUNT(*) FILTER (WHERE t.completed) AS completed_count
+                FROM task_tags tt JOIN tasks t ON t.id = tt.task_id
+                WHERE tt.tag_id = g.id
+            ) c
+            WHERE g.workspace_id = %s
+        '''
+    else:
+        query = '''
+            SELECT id, name, color, description, created_at, updated_at
+            FROM tags
+            WHERE workspace_id = %s
+        '''
+    return f'''
+        SELECT COALESCE(json_agg(r ORDER BY r.name), '[]')::text AS tags
+        FROM ({query}) r
+    '''
+
+def list_tags_json(cursor, workspace_id: int, with_counts: bool) -> str:
+    cursor.execute(list_tags_query(with_counts), (workspace_id,))
+    return cursor.fetchone()['tags']
+
+def handles_async(method: str, params: Dict[str, Any]) -> bool:
+    return method == 'GET'
+
+async def handle_async(event: Dict[str, Any], db, workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: чтение списка тегов асинхронным движком: версии таблиц для ETag и сам список
+              уходят в БД одним пакетом конвейера
+    Args: event - как у handle, db - AsyncReader соединения, workspace_id - рабочее пространство
+    Returns: HTTP response dict, совпадающий с ответом handle
+    '''
+    params = event.get('queryStringParameters') or {}
+    statement = (list_tags_query(params.get('with_counts') == 'true'), (workspace_id,))
+    not_modified, cache_headers, results = await db.read(event, etag_tables(params), params, [statement])
+    if not_modified is not None:
+        return not_modified
+    
+    rows, _ = results[0]
+    return raw_response(200, '{"tags":' + rows[0][0] + '}', cache_headers)
+
+def handle(event: Dict[str, Any], conn, cursor, workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: API для управления тегами с поддержкой CRUD операций
+    Args: event - dict с httpMethod, body, queryStringParameters
+          conn, cursor - соединение из общего пула и курсор со строками-словарями,
+          workspace_id - рабочее пространство запроса
+    Returns: HTTP response dict
+    '''
+    method: str = event.get('httpMethod', 'GET')
+    params = event.get('queryStringParameters') or {}
+    
+    cache_headers = {}
+    if method == 'GET':
+        etag = get_table_etag(cursor, etag_tables(params), params, workspace_id)
+        cache_headers = etag_headers(etag)
+        if etag_matches(event, etag):
+            return empty_response(304, cache_headers)
+    
+    if method == 'GET':
+        tags_json = list_tags_json(cursor, workspace_id, params.get('with_counts') == 'true')
+        
+        return raw_response(200, '{"tags":' + tags_json + '}', cache_headers)
+    
+    elif method == 'POST':
+        body = json.loads(event.get('body', '{}'))
+        
+        cursor.execute('''
+            INSERT INTO tags (name, color, description)
+            VALUES (%s, %s, %s)
+            RETURNING id, name, color, description, created_at, updated_at
+        ''', (
+            body.get('name'),
+            body.get('color'),
+            body.get('description')
+        ))
+        
+        tag = cursor.fetchone()
+        conn.commit()
+        
+        tag_dict = dict(tag)
+        if tag_dict.get('created_at'):
+            tag_dict['created_at'] = tag_dict['created_at'].isoformat()
+        if tag_dict.get('updated_at'):
+            tag_dict['updated_at'] = tag_dict['updated_at'].isoformat()
+        
+        return json_response(201, {'tag': tag_dict})
+    
+    elif method == 'PUT':
+        body = json.loads(event.get('body', '{}'))
+        tag_id = body.get('id')
+        
+        cursor.execute('''
+            UPDATE tags 
+            SET name = %s, color = %s, description = %s, updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND workspace_id = %s
+            RETURNING id, name, color, description, created_at, updated_at
+        ''', (
+            body.get('name'),
+            body.get('color'),
+            body.get('description'),
+            tag_id,
+            workspace_id
+        ))
+        
+        tag = cursor.fetchone()
+        conn.commit()
+        
+        if not tag:
+            return json_response(404, {'error': 'Tag not found'})
+        
+        tag_dict = dict(tag)
+        if tag_dict.get('created_at'):
+            tag_dict['created_at'] = tag_dict['created_at'].isoformat()
+        if tag_dict.get('updated_at'):
+            tag_dict['updated_at'] = tag_dict['updated_at'].isoformat()
+        
+        return json_response(200, {'tag': tag_dict})
+    
+    elif method == 'DELETE':
+        params = event.get('queryStringParameters', {})
+        tag_id = params.get('id')
+        
+        cursor.execute('DELETE FROM tags WHERE id = %s AND workspace_id = %s RETURNING id', (tag_id, workspace_id))
+        deleted = cursor.fetchone()
+        conn.commit()
+        
+        if not deleted:
+            return json_response(404, {'error': 'Tag not found'})
+        
+        return json_response(200, {'success': True})
+    
+    return json_response(405, {'error': 'Method not allowed'})
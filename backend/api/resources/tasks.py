@@ -0,0 +1,1503 @@
+import base64
+import csv
+import gzip
+import hmac
+import io
+import json
+import os
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+import psycopg2
+from psycopg2.extras import execute_values
+
+from core import (
+    InstrumentedCursor, binary_response, catalog_cache, choose_encoding, dumps, dumps_lines,
+    empty_response, etag_headers, etag_matches, event_dispatcher, get_header, get_row_encoder,
+    get_table_etag, json_response, raw_response, record_phase, strip_etag_coding
+)
+from resources.projects import list_projects_json, list_projects_query
+from resources.tags import list_tags_json, list_tags_query
+
+TASKS_PAGE_SIZE = int(os.environ.get('TASKS_PAGE_SIZE', '100'))
+TASKS_MAX_PAGE_SIZE = int(os.environ.get('TASKS_MAX_PAGE_SIZE', '500'))
+TASK_PRIORITIES = ('high', 'medium', 'low')
+CACHE_INVALIDATES = ('tags', 'projects')
+TASK_COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'completed': 'completed',
+    'priority': 'priority',
+    'tags': '''ARRAY(
+        SELECT g.name FROM task_tags tt JOIN tags g ON g.id = tt.tag_id
+        WHERE tt.task_id = tasks.id ORDER BY g.name
+    ) AS tags''',
+    'category': 'category',
+    'project': 'COALESCE((SELECT p.name FROM projects p WHERE p.id = tasks.project_id), project) AS project',
+    'due_date': 'due_date',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'version': 'version'
+}
+ARCHIVED_TASK_COLUMNS = dict(TASK_COLUMNS, tags='tags', project='project')
+TASK_LIST_FORMATS = ('objects', 'columns')
+
+def select_task_columns(params: Dict[str, Any], required: Tuple[str, ...],
+                        columns: Dict[str, str] = TASK_COLUMNS) -> str:
+    '''
+    Business: проекция задач по параметру fields - в SELECT попадают только нужные клиенту колонки,
+              дорогие подзапросы tags и project вычисляются лишь когда их запросили
+    Args: params - fields через запятую; required - колонки, без которых не построить ответ
+          (id и ключ пагинации), они добавляются всегда; columns - выражения колонок
+          (ARCHIVED_TASK_COLUMNS для tasks_archive)
+    Returns: список выражений для SELECT
+    '''
+    if not params.get('fields'):
+        return ', '.join(columns.values())
+    fields = {f.strip() for f in params['fields'].split(',') if f.strip()}
+    unknown = fields - set(columns)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return ', '.join(expr for name, expr in columns.items() if name in fields or name in required)
+
+def parse_list_format(params: Dict[str, Any]) -> str:
+    list_format = params.get('format') or 'objects'
+    if list_format not in TASK_LIST_FORMATS:
+        raise ValueError('Invalid format')
+    return list_format
+
+def encode_task_rows(encoder, rows: List[tuple], list_format: str) -> Dict[str, Any]:
+    '''
+    Business: тело списка задач: массив объектов либо колоночный вид, где имена колонок идут один раз
+    Returns: {'tasks': [...]} или {'columns': [...], 'rows': [[...], ...]}
+    '''
+    if list_format == 'columns':
+        return {'columns': list(encoder.columns), 'rows': encoder.encode_rows(rows)}
+    return {'tasks': encoder.encode(rows)}
+
+def encode_cursor(created_at: datetime, task_id: int) -> str:
+    raw = f'{created_at.isoformat()}|{task_id}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        created_at, task_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+def parse_bool(value: str, name: str) -> bool:
+    if value.lower() in ('true', '1', 'yes'):
+        return True
+    if value.lower() in ('false', '0', 'no'):
+        return False
+    raise ValueError(f'Invalid {name}')
+
+def parse_datetime(value: str, name: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'Invalid {name}')
+
+def parse_limit(params: Dict[str, Any]) -> int:
+    try:
+        limit = int(params.get('limit') or TASKS_PAGE_SIZE)
+    except ValueError:
+        raise ValueError('Invalid limit')
+    if limit < 1:
+        raise ValueError('Invalid limit')
+    return min(limit, TASKS_MAX_PAGE_SIZE)
+
+def build_task_filters(params: Dict[str, Any], workspace_id: int, archive: bool = False) -> Tuple[List[str], List[Any]]:
+    '''
+    Business: собирает WHERE-условия списка задач из query-параметров
+    Args: params - completed, priority, project, category, tags (через запятую),
+          tags_mode (any|all), due_from, due_to; workspace_id - рабочее пространство,
+          его условие идёт первым и ведёт все составные индексы; archive - условия для
+          tasks_archive, где теги и проект хранятся в самой строке
+    Returns: список SQL-условий и список аргументов к ним
+    '''
+    conditions: List[str] = ['workspace_id = %s']
+    args: List[Any] = [workspace_id]
+    
+    if params.get('completed'):
+        conditions.append('completed = %s')
+        args.append(parse_bool(params['completed'], 'completed'))
+    if params.get('priority'):
+        priorities = [p.strip() for p in params['priority'].split(',') if p.strip()]
+        if any(p not in TASK_PRIORITIES for p in priorities):
+            raise ValueError('Invalid priority')
+        conditions.append('priority = ANY(%s)')
+        args.append(priorities)
+    if params.get('project') and archive:
+        conditions.append('project = %s')
+        args.append(params['project'])
+    elif params.get('project'):
+        conditions.append(
+            '(project_id IN (SELECT id FROM projects WHERE workspace_id = %s AND name = %s)'
+            ' OR (project_id IS NULL AND project = %s))'
+        )
+        args.extend([workspace_id, params['project'], params['project']])
+    if params.get('category'):
+        conditions.append('category = %s')
+        args.append(params['category'])
+    if params.get('tags'):
+        tags = [t.strip() for t in params['tags'].split(',') if t.strip()]
+        mode = params.get('tags_mode', 'any')
+        if mode not in ('any', 'all'):
+            raise ValueError('Invalid tags_mode')
+        linked = (
+            'SELECT tt.task_id FROM task_tags tt JOIN tags g ON g.id = tt.tag_id'
+            ' WHERE g.workspace_id = %s AND g.name = ANY(%s)'
+        )
+        if archive:
+            conditions.append('tags && %s' if mode == 'any' else 'tags @> %s')
+            args.append(tags)
+        elif mode == 'any':
+            conditions.append(f'id IN ({linked})')
+            args.extend([workspace_id, tags])
+        else:
+            conditions.append(f'id IN ({linked} GROUP BY tt.task_id HAVING COUNT(*) = %s)')
+            args.extend([workspace_id, tags, len(set(tags))])
+    if params.get('due_from'):
+        conditions.append('due_date >= %s')
+        args.append(parse_datetime(params['due_from'], 'due_from'))
+    if params.get('due_to'):
+        conditions.append('due_date < %s')
+        args.append(parse_datetime(params['due_to'], 'due_to'))
+    
+    return conditions, args
+
+TASK_VIEWS = {
+    'calendar': ('due_date IS NOT NULL', 'due_date', 'ASC'),
+    'overdue': ("NOT completed AND due_date < date_trunc('minute', LOCALTIMESTAMP)", 'due_date', 'ASC'),
+    'upcoming': ("NOT completed AND due_date >= date_trunc('minute', LOCALTIMESTAMP)", 'due_date', 'ASC'),
+    'urgent': ("NOT completed AND priority = 'high'", 'created_at', 'DESC'),
+}
+TIME_DEPENDENT_VIEWS = ('overdue', 'upcoming')
+
+def build_view_query(params: Dict[str, Any], workspace_id: int) -> Tuple[str, List[Any], str]:
+    '''
+    Business: строит запрос представления задач, которое обслуживается частичным индексом
+    Args: params - view (calendar|overdue|upcoming|urgent), фильтры списка, limit, cursor;
+          для calendar обязательны due_from и due_to; workspace_id - рабочее пространство
+    Returns: SQL, аргументы и колонка ключа пагинации
+    '''
+    if params['view'] not in TASK_VIEWS:
+        raise ValueError('Invalid view')
+    if params['view'] == 'calendar' and not (params.get('due_from') and params.get('due_to')):
+        raise ValueError('Calendar view requires due_from and due_to')
+    condition, key, direction = TASK_VIEWS[params['view']]
+    columns = select_task_columns(params, ('id', key))
+    conditions, args = build_task_filters(params, workspace_id)
+    conditions.insert(1, condition)
+    if params.get('cursor'):
+        conditions.append(f"({key}, id) {'>' if direction == 'ASC' else '<'} (%s, %s)")
+        args.extend(decode_cursor(params['cursor']))
+    args.append(parse_limit(params) + 1)
+    return f'''
+        SELECT {columns}
+        FROM tasks
+        WHERE {' AND '.join(conditions)}
+        ORDER BY {key} {direction}, id {direction}
+        LIMIT %s
+    ''', args, key
+
+TASK_STATS_SOURCE = os.environ.get('TASK_STATS_SOURCE', 'live')
+
+LIVE_STATS_QUERY = '''
+    WITH t AS MATERIALIZED (
+        SELECT tasks.id, completed, priority, category,
+               COALESCE(p.name, tasks.project) AS project
+        FROM tasks LEFT JOIN projects p ON p.id = tasks.project_id
+        WHERE tasks.workspace_id = %s
+    )
+    SELECT CASE
+               WHEN GROUPING(category) = 0 THEN 'category'
+               WHEN GROUPING(project) = 0 THEN 'project'
+               ELSE 'total'
+           END AS kind,
+           COALESCE(category, project) AS key,
+           COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE completed) AS completed,
+           COUNT(*) FILTER (WHERE priority = 'high' AND NOT completed) AS high_priority
+    FROM t
+    GROUP BY GROUPING SETS ((), (category), (project))
+    UNION ALL
+    SELECT 'tag', g.name, COUNT(*),
+           COUNT(*) FILTER (WHERE completed),
+           COUNT(*) FILTER (WHERE priority = 'high' AND NOT completed)
+    FROM t
+    JOIN task_tags tt ON tt.task_id = t.id
+    JOIN tags g ON g.id = tt.tag_id
+    GROUP BY g.name
+'''
+
+SUMMARY_STATS_QUERY = '''
+    SELECT CASE WHEN s.kind = 'project_id' THEN 'project' ELSE s.kind END AS kind,
+           CASE s.kind
+               WHEN 'tag' THEN g.name
+               WHEN 'project_id' THEN p.name
+               ELSE NULLIF(s.key, '')
+           END AS key,
+           SUM(s.total)::int AS total,
+           SUM(s.completed)::int AS completed,
+           SUM(s.high_priority)::int AS high_priority
+    FROM task_stats s
+    LEFT JOIN tags g ON s.kind = 'tag' AND g.id::text = s.key
+    LEFT JOIN projects p ON s.kind = 'project_id' AND p.id::text = s.key
+    WHERE s.workspace_id = %s
+      AND s.total > 0
+      AND (s.kind <> 'tag' OR g.id IS NOT NULL)
+      AND (s.kind <> 'project_id' OR p.id IS NOT NULL)
+    GROUP BY 1, 2
+'''
+
+def build_stats(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    '''
+    Business: собирает сводку дашборда из сгруппированных строк (kind, key, total, completed, high_priority)
+    Returns: dict с общими счётчиками, категориями, проектами и тегами
+    '''
+    totals = {'total': 0, 'completed': 0, 'active': 0, 'high_priority': 0}
+    categories, projects, tags = [], [], []
+    
+    for row in rows:
+        total, completed = row['total'], row['completed']
+        if row['kind'] == 'total':
+            totals = {
+                'total': total,
+                'completed': completed,
+                'active': total - completed,
+                'high_priority': row['high_priority']
+            }
+        elif row['kind'] == 'category':
+            categories.append({'category': row['key'], 'total': total})
+        elif row['kind'] == 'project':
+            projects.append({
+                'project': row['key'],
+                'total': total,
+                'completed': completed,
+                'active': total - completed,
+                'high_priority': row['high_priority'],
+                'completion_ratio': completed / total if total else 0
+            })
+        elif row['kind'] == 'tag':
+            tags.append({'tag': row['key'], 'total': total, 'completed': completed})
+    
+    for category in categories:
+        category['percentage'] = category['total'] * 100 / totals['total'] if totals['total'] else 0
+    categories.sort(key=lambda c: -c['total'])
+    projects.sort(key=lambda p: -p['total'])
+    tags.sort(key=lambda t: -t['total'])
+    
+    return {'stats': totals, 'categories': categories, 'projects': projects, 'tags': tags}
+
+TASKS_BULK_CHUNK_SIZE = int(os.environ.get('TASKS_BULK_CHUNK_SIZE', '500'))
+TASK_FIELDS = ('title', 'description', 'completed', 'priority', 'tags', 'category', 'project', 'due_date')
+TASK_SELECT = ', '.join(TASK_COLUMNS.values())
+
+def read_written_tasks(cursor, workspace_id: int, task_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    '''
+    Business: перечитывает задачи после записи теми же выражениями TASK_COLUMNS, что и чтения:
+              теги и проект берутся из task_tags и projects, а не из устаревающих колонок tags/project
+    Args: cursor - курсор транзакции записи (связи тегов к этому моменту обновлены триггерами
+          оператора), task_ids - id записанных задач
+    Returns: строки задач по id
+    '''
+    if not task_ids:
+        return {}
+    cursor.execute(f'SELECT {TASK_SELECT} FROM tasks WHERE workspace_id = %s AND id = ANY(%s)', (workspace_id, task_ids))
+    return {row['id']: row for row in cursor.fetchall()}
+
+def serialize_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    task_dict = dict(task)
+    if task_dict.get('due_date'):
+        task_dict['due_date'] = task_dict['due_date'].isoformat()
+    if task_dict.get('created_at'):
+        task_dict['created_at'] = task_dict['created_at'].isoformat()
+    if task_dict.get('updated_at'):
+        task_dict['updated_at'] = task_dict['updated_at'].isoformat()
+    return task_dict
+
+def task_values(item: Dict[str, Any]) -> Tuple[Any, ...]:
+    if not item.get('title'):
+        raise ValueError('Task title is required')
+    if item.get('priority', 'medium') not in TASK_PRIORITIES:
+        raise ValueError('Invalid priority')
+    return (
+        item.get('title'),
+        item.get('description'),
+        item.get('completed', False),
+        item.get('priority', 'medium'),
+        item.get('tags', []),
+        item.get('category'),
+        item.get('project'),
+        item.get('due_date')
+    )
+
+def patch_values(body: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Business: отбирает для PATCH только переданные поля задачи и проверяет их
+    Args: body - тело запроса с id, необязательной version и изменяемыми полями
+    Returns: поля для SET в порядке TASK_FIELDS
+    '''
+    unknown = set(body) - set(TASK_FIELDS) - {'id', 'version'}
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    values = {field: body[field] for field in TASK_FIELDS if field in body}
+    if not values:
+        raise ValueError('No fields to update')
+    if 'title' in values and not values['title']:
+        raise ValueError('Task title is required')
+    if 'priority' in values and values['priority'] not in TASK_PRIORITIES:
+        raise ValueError('Invalid priority')
+    if 'completed' in values and not isinstance(values['completed'], bool):
+        raise ValueError('completed must be a boolean')
+    if 'tags' in values and values['tags'] is None:
+        values['tags'] = []
+    return values
+
+def task_etag(task: Dict[str, Any]) -> str:
+    return f'"{task["id"]}-{task["version"]}"'
+
+def task_headers(task: Dict[str, Any]) -> Dict[str, str]:
+    return {'ETag': task_etag(task), 'Access-Control-Expose-Headers': 'ETag'}
+
+def parse_version(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not str(value).isdigit():
+        raise ValueError('Invalid version')
+    return int(value)
+
+def read_write_precondition(event: Dict[str, Any], body: Dict[str, Any], task_id: Any) -> Optional[List[int]]:
+    '''
+    Business: читает предусловие записи из If-Match или поля version в теле
+    Args: event - запрос с заголовками, body - тело запроса, task_id - id изменяемой задачи
+    Returns: версии строки, при которых запись разрешена, или None для безусловной записи
+    '''
+    header = get_header(event, 'If-Match')
+    if header:
+        candidates = [strip_etag_coding(c.strip()) for c in header.split(',')]
+        if '*' in candidates:
+            return None
+        versions = []
+        for candidate in candidates:
+            etag_id, _, version = candidate.strip('"').rpartition('-')
+            if etag_id == str(task_id) and version.isdigit():
+                versions.append(int(version))
+        return versions
+    version = parse_version(body.get('version'))
+    return None if version is None else [version]
+
+def chunked(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def run_bulk_operations(cursor, operations: List[Dict[str, Any]], chunk_size: int, workspace_id: int) -> List[Dict[str, Any]]:
+    '''
+    Business: выполняет пакет create/update/delete операций над задачами
+    Args: cursor - курсор открытой транзакции, operations - список {op, ...поля задачи},
+          chunk_size - сколько строк отправлять в БД одним запросом, workspace_id - рабочее пространство
+    Returns: результаты в порядке операций: index, op, status и task или id
+    '''
+    creates, updates, deletes = [], [], []
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise ValueError(f'Operation {index} must be an object')
+        op = operation.get('op')
+        if op == 'create':
+            creates.append((index, task_values(operation)))
+        elif op == 'update':
+            if operation.get('id') is None:
+                raise ValueError(f'Operation {index}: id is required')
+            updates.append((index, (int(operation['id']),) + task_values(operation)
+                            + (parse_version(operation.get('version')),)))
+        elif op == 'delete':
+            if operation.get('id') is None:
+                raise ValueError(f'Operation {index}: id is required')
+            deletes.append((index, int(operation['id'])))
+        else:
+            raise ValueError(f'Operation {index}: unknown op')
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+    
+    for chunk in chunked(creates, chunk_size):
+        rows = execute_values(cursor, '''
+            INSERT INTO tasks (title, description, completed, priority, tags, category, project, due_date)
+            VALUES %s
+            RETURNING id
+        ''', [values for _, values in chunk], page_size=len(chunk), fetch=True)
+        created = read_written_tasks(cursor, workspace_id, [row['id'] for row in rows])
+        for (index, _), row in zip(chunk, rows):
+            results[index] = {'index': index, 'op': 'create', 'status': 201, 'task': serialize_task(created[row['id']])}
+    
+    for chunk in chunked(updates, chunk_size):
+        rows = execute_values(cursor, f'''
+            UPDATE tasks AS t
+            SET title = v.title, description = v.description, completed = v.completed,
+                priority = v.priority, tags = v.tags, category = v.category,
+                project = v.project, due_date = v.due_date, updated_at = CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v(id, title, description, completed, priority, tags, category, project, due_date, version)
+            WHERE t.workspace_id = {int(workspace_id)} AND t.id = v.id
+              AND (v.version IS NULL OR t.version = v.version)
+            RETURNING t.id, t.version
+        ''', [values for _, values in chunk],
+            template='(%s::int, %s, %s, %s::boolean, %s, %s::text[], %s, %s, %s::timestamp, %s::int)',
+            page_size=len(chunk), fetch=True)
+        updated = read_written_tasks(cursor, workspace_id, [row['id'] for row in rows])
+        missing = [values[0] for _, values in chunk if values[0] not in updated]
+        current = {row['id']: row['version'] for row in updated.values()}
+        if missing:
+            cursor.execute(
+                'SELECT id, version FROM tasks WHERE workspace_id = %s AND id = ANY(%s)',
+                (workspace_id, missing)
+            )
+            current.update((row['id'], row['version']) for row in cursor.fetchall())
+        for index, values in chunk:
+            row = updated.get(values[0])
+            if row and (values[-1] is None or row['version'] == values[-1] + 1):
+                results[index] = {'index': index, 'op': 'update', 'status': 200, 'task': serialize_task(row)}
+            elif values[0] in current:
+                results[index] = {
+                    'index': index, 'op': 'update', 'status': 412,
+                    'id': values[0], 'version': current[values[0]]
+                }
+            else:
+                results[index] = {'index': index, 'op': 'update', 'status': 404, 'id': values[0]}
+    
+    for chunk in chunked(deletes, chunk_size):
+        cursor.execute(
+            'DELETE FROM tasks WHERE workspace_id = %s AND id = ANY(%s) RETURNING id',
+            (workspace_id, [task_id for _, task_id in chunk])
+        )
+        deleted = {row['id'] for row in cursor.fetchall()}
+        for index, task_id in chunk:
+            results[index] = {
+                'index': index, 'op': 'delete', 'id': task_id,
+                'status': 200 if task_id in deleted else 404
+            }
+    
+    return results
+
+def format_pg_array(values: List[Any]) -> str:
+    items = []
+    for value in values or []:
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+        items.append(f'"{escaped}"')
+    return '{' + ','.join(items) + '}'
+
+class NdjsonCsvStream:
+    '''
+    Business: отдаёт NDJSON-задачи в COPY построчно как CSV, не собирая весь файл в памяти
+    '''
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ''
+        self.count = 0
+    
+    def _next_row(self) -> Optional[str]:
+        for line in self._lines:
+            if not line.strip():
+                continue
+            values = list(task_values(json.loads(line)))
+            values[4] = format_pg_array(values[4])
+            out = io.StringIO()
+            csv.writer(out, lineterminator='\n').writerow(['' if v is None else v for v in values])
+            self.count += 1
+            return out.getvalue()
+        return None
+    
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            row = self._next_row()
+            if row is None:
+                break
+            self._buffer += row
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+    
+    readline = read
+
+TASK_EXPORT_ONLY_COLUMNS = ('id', 'created_at', 'updated_at', 'version', 'archived')
+
+def copy_import_tasks(cursor, body: str, content_type: str) -> int:
+    '''
+    Business: потоковый импорт задач через COPY FROM STDIN
+    Args: body - CSV с заголовком из колонок задачи или NDJSON (по задаче на строку),
+          content_type - text/csv или application/x-ndjson
+    Returns: количество импортированных задач
+    
+    CSV выгрузки импортируется как есть: служебные колонки TASK_EXPORT_ONLY_COLUMNS
+    (id, даты, version, archived) читаются во временную таблицу и не переносятся в tasks.
+    COPY в таблицу с row-level security запрещён, поэтому строки сначала идут во временную
+    таблицу, а в tasks попадают одним INSERT ... SELECT под политикой рабочего пространства.
+    '''
+    if content_type.startswith('text/csv'):
+        header = next(csv.reader([body.split('\n', 1)[0]]), [])
+        copied = [c.strip() for c in header]
+        if 'title' not in copied or any(c not in TASK_FIELDS and c not in TASK_EXPORT_ONLY_COLUMNS for c in copied):
+            raise ValueError('CSV header must list task columns including title')
+        source = io.StringIO(body)
+        options = 'FORMAT csv, HEADER true'
+    else:
+        copied = list(TASK_FIELDS)
+        source = NdjsonCsvStream(io.StringIO(body))
+        options = 'FORMAT csv'
+    
+    columns = [c for c in copied if c in TASK_FIELDS]
+    column_list = ', '.join(columns)
+    cursor.execute(f'CREATE TEMP TABLE task_import ON COMMIT DROP AS SELECT {column_list} FROM tasks WITH NO DATA')
+    for column in copied:
+        if column not in TASK_FIELDS:
+            cursor.execute(f'ALTER TABLE task_import ADD COLUMN {column} text')
+    cursor.copy_expert(f"COPY task_import ({', '.join(copied)}) FROM STDIN WITH ({options})", source)
+    cursor.execute(f'INSERT INTO tasks ({column_list}) SELECT {column_list} FROM task_import')
+    return cursor.rowcount
+
+TASKS_EXPORT_BATCH_SIZE = int(os.environ.get('TASKS_EXPORT_BATCH_SIZE', '2000'))
+TASKS_EXPORT_MAX_ROWS = int(os.environ.get('TASKS_EXPORT_MAX_ROWS', '20000'))
+TASKS_EXPORT_GZIP_LEVEL = int(os.environ.get('TASKS_EXPORT_GZIP_LEVEL', '6'))
+TASKS_EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv; charset=utf-8'}
+
+def export_csv_rows(rows: List[tuple], temporal: Tuple[int, ...], tags_index: Optional[int]) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    for row in rows:
+        values = ['' if v is None else v for v in row]
+        for index in temporal:
+            if row[index] is not None:
+                values[index] = row[index].isoformat()
+        if tags_index is not None:
+            values[tags_index] = format_pg_array(row[tags_index])
+        writer.writerow(values)
+    return out.getvalue()
+
+def export_tasks(conn, query: str, args: List[Any], export_format: str,
+                 sink, max_rows: int) -> Tuple[int, Optional[str]]:
+    '''
+    Business: выгрузка задач через серверный (именованный) курсор пачками по TASKS_EXPORT_BATCH_SIZE:
+              в памяти процесса одновременно лежит одна пачка строк и уже сжатый вывод
+    Args: query/args - запрос из build_tasks_query с пределом max_rows + 1, export_format - ndjson или csv,
+          sink - файловый объект для байтов (GzipFile или BytesIO), max_rows - предел строк в ответе
+    Returns: число выгруженных задач и курсор продолжения, если выгрузка упёрлась в max_rows
+    
+    CSV совместим с импортом: теги записываются литералом массива PostgreSQL.
+    '''
+    with conn.cursor(name='task_export', cursor_factory=InstrumentedCursor) as rows_cursor:
+        rows_cursor.itersize = TASKS_EXPORT_BATCH_SIZE
+        rows_cursor.execute(query, args)
+        
+        exported, truncated, last, encoder = 0, False, None, None
+        while not truncated:
+            rows = rows_cursor.fetchmany(min(TASKS_EXPORT_BATCH_SIZE, max_rows + 1 - exported))
+            if exported + len(rows) > max_rows:
+                truncated, rows = True, rows[:max_rows - exported]
+            if not rows:
+                break
+            if encoder is None:
+                encoder = get_row_encoder(rows_cursor.description)
+                if export_format == 'csv':
+                    sink.write((','.join(encoder.columns) + '\n').encode())
+            
+            started = time.perf_counter()
+            if export_format == 'csv':
+                tags_index = encoder.columns.index('tags') if 'tags' in encoder.columns else None
+                chunk = export_csv_rows(rows, encoder.temporal, tags_index).encode()
+            else:
+                chunk = dumps_lines(encoder.encode(rows))
+                started = time.perf_counter()
+            sink.write(chunk)
+            record_phase('serialize', started)
+            exported += len(rows)
+            last = rows[-1]
+    
+    if not truncated or last is None:
+        return exported, None
+    row = dict(zip(encoder.columns, last))
+    return exported, encode_cursor(row['created_at'], row['id'])
+
+TASKS_SEARCH_CONFIG = 'russian'
+TASKS_SEARCH_DOCUMENT = "(title || ' ' || COALESCE(description, ''))"
+
+def search_tasks(cursor, query: str, columns: str, conditions: List[str], args: List[Any],
+                 limit: int, offset: int) -> List[Dict[str, Any]]:
+    '''
+    Business: ранжированный поиск задач по tsvector и триграммам с подсветкой совпадений
+    Args: query - строка поиска, columns - проекция из select_task_columns (title и description
+          нужны для подсветки), conditions/args - фильтры из build_task_filters,
+          limit/offset - страница результатов
+    Returns: строки задач с rank, title_highlight и description_highlight
+    '''
+    pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    match = (
+        f"(search_vector @@ websearch_to_tsquery('{TASKS_SEARCH_CONFIG}', %s)"
+        f" OR {TASKS_SEARCH_DOCUMENT} ILIKE %s"
+        f" OR %s <%% {TASKS_SEARCH_DOCUMENT})"
+    )
+    where = ' AND '.join(conditions + [match])
+    
+    cursor.execute(f'''
+        SELECT page.*,
+               ts_headline('{TASKS_SEARCH_CONFIG}', page.title, tsq,
+                           'StartSel=<mark>, StopSel=</mark>, HighlightAll=true') AS title_highlight,
+               ts_headline('{TASKS_SEARCH_CONFIG}', COALESCE(page.description, ''), tsq,
+                           'StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10') AS description_highlight
+        FROM (
+            SELECT {columns},
+                   ts_rank_cd(search_vector, websearch_to_tsquery('{TASKS_SEARCH_CONFIG}', %s))
+                       + word_similarity(%s, {TASKS_SEARCH_DOCUMENT}) AS rank
+            FROM tasks
+            WHERE {where}
+            ORDER BY rank DESC, id DESC
+            LIMIT %s OFFSET %s
+        ) page, websearch_to_tsquery('{TASKS_SEARCH_CONFIG}', %s) AS tsq
+        ORDER BY page.rank DESC, page.id DESC
+    ''', [query, query] + args + [query, pattern, query] + [limit, offset, query])
+    return cursor.fetchall()
+
+TASKS_SYNC_RETENTION_DAYS = 30
+TASKS_SYNC_MAX_CHANGES = int(os.environ.get('TASKS_SYNC_MAX_CHANGES', '5000'))
+
+SYNC_TOKEN_QUERY = '''
+    SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS xmin,
+           (SELECT json_object_agg(name, version) FROM table_versions
+            WHERE workspace_id = %s AND name IN ('tags', 'projects')) AS versions
+'''
+
+def read_sync_token(cursor, workspace_id: int) -> Tuple[str, Dict[str, int]]:
+    '''
+    Business: выдаёт токен синхронизации: xmin текущего снимка и версии каталогов тегов и проектов
+    Args: workspace_id - рабочее пространство, чьи версии каталогов попадают в токен
+    Returns: токен и версии каталогов
+    '''
+    cursor.execute(SYNC_TOKEN_QUERY, (workspace_id,))
+    row = cursor.fetchone()
+    return make_sync_token(row['xmin'], row['versions'])
+
+def make_sync_token(xmin: str, versions: Optional[Dict[str, int]]) -> Tuple[str, Dict[str, int]]:
+    versions = versions or {}
+    raw = json.dumps({'x': int(xmin), 't': int(time.time()), 'v': versions}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('='), versions
+
+def decode_sync_token(token: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        data = json.loads(raw)
+        return {'xmin': int(data['x']), 'issued_at': int(data['t']), 'versions': dict(data['v'])}
+    except (ValueError, UnicodeDecodeError, KeyError, TypeError):
+        raise ValueError('Invalid sync token')
+
+TASKS_ARCHIVE_AFTER_DAYS = int(os.environ.get('TASKS_ARCHIVE_AFTER_DAYS', '90'))
+TASKS_ARCHIVE_BATCH_SIZE = int(os.environ.get('TASKS_ARCHIVE_BATCH_SIZE', '1000'))
+TASKS_ARCHIVE_MAX_BATCH_SIZE = int(os.environ.get('TASKS_ARCHIVE_MAX_BATCH_SIZE', '5000'))
+TASKS_ARCHIVE_MAX_BATCHES = int(os.environ.get('TASKS_ARCHIVE_MAX_BATCHES', '10'))
+TASKS_ARCHIVE_TOKEN = os.environ.get('TASKS_ARCHIVE_TOKEN', '')
+TASK_SOURCES = {
+    'exclude': (('tasks', TASK_COLUMNS),),
+    'include': (('tasks', TASK_COLUMNS), ('tasks_archive', ARCHIVED_TASK_COLUMNS)),
+    'only': (('tasks_archive', ARCHIVED_TASK_COLUMNS),)
+}
+
+ARCHIVE_CANDIDATES_QUERY = '''
+    SELECT id, date_part('year', created_at)::int AS year
+    FROM tasks
+    WHERE workspace_id = %s AND completed AND updated_at < LOCALTIMESTAMP - %s * INTERVAL '1 day'
+    ORDER BY updated_at, id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+'''
+
+ARCHIVE_MOVE_QUERY = '''
+    WITH moved AS (
+        DELETE FROM tasks
+        WHERE workspace_id = %s AND id = ANY(%s)
+        RETURNING id, workspace_id, title, description, completed, priority, category, project,
+                  project_id, due_date, created_at, updated_at, version
+    )
+    INSERT INTO tasks_archive (id, workspace_id, title, description, completed, priority, tags,
+                               category, project, due_date, created_at, updated_at, version)
+    SELECT m.id, m.workspace_id, m.title, m.description, m.completed, m.priority,
+           ARRAY(
+               SELECT g.name FROM task_tags tt JOIN tags g ON g.id = tt.tag_id
+               WHERE tt.task_id = m.id ORDER BY g.name
+           ),
+           m.category, COALESCE(p.name, m.project), m.due_date, m.created_at, m.updated_at, m.version
+    FROM moved m
+    LEFT JOIN projects p ON p.id = m.project_id
+'''
+
+ARCHIVE_STATS_QUERY = '''
+    SELECT CASE
+               WHEN GROUPING(category) = 0 THEN 'category'
+               WHEN GROUPING(project) = 0 THEN 'project'
+               ELSE 'total'
+           END AS kind,
+           COALESCE(category, project) AS key,
+           COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE completed) AS completed,
+           COUNT(*) FILTER (WHERE priority = 'high' AND NOT completed) AS high_priority
+    FROM tasks_archive
+    WHERE workspace_id = %s
+    GROUP BY GROUPING SETS ((), (category), (project))
+    UNION ALL
+    SELECT 'tag', tag, COUNT(*),
+           COUNT(*) FILTER (WHERE completed),
+           COUNT(*) FILTER (WHERE priority = 'high' AND NOT completed)
+    FROM tasks_archive, unnest(tags) AS tag
+    WHERE workspace_id = %s
+    GROUP BY tag
+'''
+
+def parse_archived(params: Dict[str, Any]) -> str:
+    archived = params.get('archived') or 'exclude'
+    if archived not in TASK_SOURCES:
+        raise ValueError('Invalid archived')
+    return archived
+
+def parse_archive_setting(params: Dict[str, Any], name: str, default: int, maximum: Optional[int] = None) -> int:
+    try:
+        value = int(params.get(name) or default)
+    except ValueError:
+        raise ValueError(f'Invalid {name}')
+    if value < 1:
+        raise ValueError(f'Invalid {name}')
+    return value if maximum is None else min(value, maximum)
+
+def archive_job_allowed(event: Dict[str, Any]) -> bool:
+    '''
+    Business: пускает задание архивации только с токеном обслуживания из TASKS_ARCHIVE_TOKEN
+    Args: event - событие запроса, токен приходит в заголовке X-Archive-Token
+    Returns: False, если токен не настроен или не совпал
+    
+    Без настроенного токена задание закрыто: его запускает планировщик, а не клиент API.
+    '''
+    token = get_header(event, 'X-Archive-Token') or ''
+    return bool(TASKS_ARCHIVE_TOKEN) and hmac.compare_digest(token.encode(), TASKS_ARCHIVE_TOKEN.encode())
+
+def build_tasks_query(params: Dict[str, Any], workspace_id: int, required: Tuple[str, ...],
+                      extra: Tuple[List[str], List[Any]], limit: int) -> Tuple[str, List[Any]]:
+    '''
+    Business: запрос задач в порядке (created_at DESC, id DESC) по горячей таблице tasks и, по явному
+              параметру archived, по архиву tasks_archive
+    Args: params - фильтры, fields и archived (exclude - только горячие задачи, по умолчанию;
+          include - вместе с архивом; only - только архив); required - как у select_task_columns;
+          extra - дополнительные условия и аргументы (курсор страницы); limit - предел строк
+    Returns: SQL и аргументы; ValueError, если параметры неверны
+    
+    С архивом каждая ветка UNION ALL сама сортирует и ограничивает свои строки по своему индексу,
+    а строки помечаются колонкой archived.
+    '''
+    archived = parse_archived(params)
+    branches, args = [], []
+    for table, columns in TASK_SOURCES[archived]:
+        conditions, branch_args = build_task_filters(params, workspace_id, archive=table == 'tasks_archive')
+        select = select_task_columns(params, required, columns)
+        if archived != 'exclude':
+            select += f", {table == 'tasks_archive'} AS archived"
+        branches.append(f'''
+        SELECT {select}
+        FROM {table}
+        WHERE {' AND '.join(conditions + extra[0])}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    ''')
+        args.extend(branch_args + extra[1] + [limit])
+    
+    if len(branches) == 1:
+        return branches[0], args
+    return f'''
+        SELECT * FROM ({' UNION ALL '.join(f'({branch})' for branch in branches)}) tasks
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    ''', args + [limit]
+
+def stats_statements(source: str, archived: str, workspace_id: int) -> List[Tuple[str, Any]]:
+    statements = []
+    if archived != 'only':
+        statements.append((SUMMARY_STATS_QUERY if source == 'summary' else LIVE_STATS_QUERY, (workspace_id,)))
+    if archived != 'exclude':
+        statements.append((ARCHIVE_STATS_QUERY, (workspace_id, workspace_id)))
+    return statements
+
+def merge_stats_rows(row_sets: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    '''
+    Business: складывает сгруппированные строки счётчиков горячих задач и архива по (kind, key)
+    '''
+    merged: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+    for rows in row_sets:
+        for row in rows:
+            current = merged.get((row['kind'], row['key']))
+            if current is None:
+                merged[(row['kind'], row['key'])] = dict(row)
+            else:
+                for field in ('total', 'completed', 'high_priority'):
+                    current[field] += row[field]
+    return list(merged.values())
+
+def archive_tasks_batch(cursor, workspace_id: int, older_than_days: int, batch_size: int) -> int:
+    '''
+    Business: переносит в tasks_archive пачку выполненных задач, не менявшихся older_than_days дней
+    Args: cursor - курсор открытой транзакции, её фиксирует вызывающий
+    Returns: число перенесённых задач
+    
+    Кандидаты блокируются с SKIP LOCKED, поэтому задание не ждёт задачи, которые сейчас правят.
+    Удаление из tasks проходит обычными триггерами: счётчики, надгробия для синхронизации и
+    события ленты (с op archive) обновляются в той же транзакции, что и вставка в архив.
+    '''
+    cursor.execute("SELECT set_config('app.archiving', 'on', true)")
+    cursor.execute(ARCHIVE_CANDIDATES_QUERY, (workspace_id, older_than_days, batch_size))
+    candidates = cursor.fetchall()
+    if not candidates:
+        return 0
+    for year in sorted({row['year'] for row in candidates}):
+        cursor.execute('SELECT ensure_tasks_archive_partition(%s)', (year,))
+    cursor.execute(ARCHIVE_MOVE_QUERY, (workspace_id, [row['id'] for row in candidates]))
+    return cursor.rowcount
+
+def build_list_page(params: Dict[str, Any], workspace_id: int) -> Tuple[str, List[Any], int, str]:
+    '''
+    Business: запрос страницы списка задач по ключу (created_at, id)
+    Args: params - фильтры, fields, format, limit, cursor, archived; workspace_id - рабочее пространство
+    Returns: SQL, аргументы, размер страницы и формат списка; ValueError, если параметры неверны
+    '''
+    list_format = parse_list_format(params)
+    limit = parse_limit(params)
+    extra: Tuple[List[str], List[Any]] = ([], [])
+    if params.get('cursor'):
+        extra = (['(created_at, id) < (%s, %s)'], list(decode_cursor(params['cursor'])))
+    
+    query, args = build_tasks_query(params, workspace_id, ('id', 'created_at'), extra, limit + 1)
+    return query, args, limit, list_format
+
+def paginate(encoder, rows: List[tuple], limit: int, key: str) -> Tuple[List[tuple], Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = dict(zip(encoder.columns, rows[-1]))
+    return rows, encode_cursor(last[key], last['id'])
+
+def list_tasks_page(conn, cursor, params: Dict[str, Any], workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: страница списка задач; первая страница несёт токен синхронизации
+    Args: params - как у build_list_page, workspace_id - рабочее пространство
+    Returns: тело ответа со страницей задач, next_cursor и sync_token; ValueError до первого запроса,
+             если параметры неверны
+    '''
+    query, args, limit, list_format = build_list_page(params, workspace_id)
+    
+    sync_token = None if params.get('cursor') else read_sync_token(cursor, workspace_id)[0]
+    with conn.cursor(cursor_factory=InstrumentedCursor) as rows_cursor:
+        rows_cursor.execute(query, args)
+        tasks = rows_cursor.fetchall()
+        encoder = get_row_encoder(rows_cursor.description)
+    
+    tasks, next_cursor = paginate(encoder, tasks, limit, 'created_at')
+    return {
+        **encode_task_rows(encoder, tasks, list_format),
+        'next_cursor': next_cursor,
+        'sync_token': sync_token
+    }
+
+TASK_ETAG_TABLES = ('tasks', 'task_tags', 'tags', 'projects')
+
+def task_etag_params(event: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    if params.get('view') in TIME_DEPENDENT_VIEWS:
+        return dict(params, minute=str(int(time.time() // 60)))
+    if params.get('action') == 'export':
+        return dict(params, encoding=choose_encoding(event, ('gzip',)) or 'identity')
+    return params
+
+def read_stats_source(params: Dict[str, Any]) -> str:
+    source = params.get('source') or TASK_STATS_SOURCE
+    if source not in ('live', 'summary'):
+        raise ValueError('Invalid source')
+    return source
+
+TASK_EVENTS_RETENTION_DAYS = 7
+TASK_EVENTS_BATCH_SIZE = int(os.environ.get('TASK_EVENTS_BATCH_SIZE', '500'))
+TASK_EVENTS_RETRY_MS = int(os.environ.get('TASK_EVENTS_RETRY_MS', '1000'))
+LONG_POLL_ACTIONS = ('events',)
+EMPTY_TASK_ROWS = {'objects': {'tasks': []}, 'columns': {'columns': [], 'rows': []}}
+
+TASK_EVENTS_QUERY = '''
+    SELECT e.id, e.txid::text AS txid, e.op, e.task_id, e.version, e.created_at, h.xmin::text AS horizon
+    FROM (SELECT pg_snapshot_xmin(pg_current_snapshot()) AS xmin) h
+    LEFT JOIN LATERAL (
+        SELECT id, txid, op, task_id, version, created_at
+        FROM task_events
+        WHERE workspace_id = %s AND (txid, id) > (%s::text::xid8, %s) AND txid < h.xmin
+        ORDER BY txid, id
+        LIMIT %s
+    ) e ON true
+    ORDER BY e.txid, e.id
+'''
+
+def encode_events_cursor(txid: int, event_id: int) -> str:
+    raw = json.dumps({'x': txid, 'i': event_id, 't': int(time.time())}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_events_cursor(token: str) -> Dict[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        data = json.loads(raw)
+        return {'txid': int(data['x']), 'id': int(data['i']), 'issued_at': int(data['t'])}
+    except (ValueError, UnicodeDecodeError, KeyError, TypeError):
+        raise ValueError('Invalid events cursor')
+
+def events_statement(event: Dict[str, Any], params: Dict[str, Any], workspace_id: int) -> Tuple[Optional[Dict[str, int]], Tuple[str, List[Any]]]:
+    '''
+    Business: чтение ленты изменений из outbox task_events после позиции клиента
+    Args: params - after (курсор ленты; для EventSource - заголовок Last-Event-ID), fields, format
+    Returns: позиция (None для нового подписчика - он получает только курсор на текущий
+             горизонт) и запрос пачки событий; ValueError, если параметры неверны
+    
+    Порядок ленты - (txid, id), и читаются только транзакции старше xmin текущего снимка:
+    все они уже завершены, поэтому событие не может появиться позади выданного курсора.
+    '''
+    select_task_columns(params, ('id',))
+    parse_list_format(params)
+    token = params.get('after') or get_header(event, 'Last-Event-ID')
+    if not token:
+        return None, (TASK_EVENTS_QUERY, [workspace_id, '0', 0, 0])
+    position = decode_events_cursor(token)
+    args = [workspace_id, str(position['txid']), position['id'], TASK_EVENTS_BATCH_SIZE]
+    return position, (TASK_EVENTS_QUERY, args)
+
+def read_events_batch(rows: List[Dict[str, Any]], position: Optional[Dict[str, int]]) -> Tuple[List[Dict[str, Any]], str]:
+    '''
+    Business: события пачки и курсор, с которого продолжать
+    Returns: события без служебных полей и курсор: последнее событие полной пачки, иначе
+             горизонт снимка - всё, что до него, клиент уже получил
+    '''
+    events = [row for row in rows if row['id'] is not None]
+    if len(events) >= TASK_EVENTS_BATCH_SIZE:
+        last = events[-1]
+        next_position = (int(last['txid']), last['id'])
+    else:
+        next_position = (int(rows[0]['horizon']), 0)
+        if position:
+            next_position = max(next_position, (position['txid'], position['id']))
+    return [
+        {key: row[key] for key in ('id', 'op', 'task_id', 'version', 'created_at')} for row in events
+    ], encode_events_cursor(*next_position)
+
+def changed_tasks_statement(params: Dict[str, Any], events: List[Dict[str, Any]], workspace_id: int) -> Optional[Tuple[str, List[Any]]]:
+    task_ids = sorted({e['task_id'] for e in events if e['op'] not in ('delete', 'archive')})
+    if not task_ids:
+        return None
+    return f'''
+        SELECT {select_task_columns(params, ('id',))}
+        FROM tasks
+        WHERE workspace_id = %s AND id = ANY(%s)
+        ORDER BY id
+    ''', [workspace_id, task_ids]
+
+def events_response(event: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    '''
+    Business: ответ ленты: JSON для long-poll или одно событие text/event-stream для EventSource,
+              который с id и retry сам переподключается с Last-Event-ID
+    '''
+    headers = {'Cache-Control': 'no-store'}
+    if 'text/event-stream' not in (get_header(event, 'Accept') or ''):
+        return json_response(200, payload, headers)
+    body = f"retry: {TASK_EVENTS_RETRY_MS}\nid: {payload['cursor']}\nevent: changes\ndata: {dumps(payload)}\n\n"
+    return raw_response(200, body, {**headers, 'Content-Type': 'text/event-stream; charset=utf-8'})
+
+def events_expired(position: Optional[Dict[str, int]]) -> bool:
+    return position is not None and time.time() - position['issued_at'] > TASK_EVENTS_RETENTION_DAYS * 86400
+
+def poll(event: Dict[str, Any], conn, cursor, workspace_id: int, final: bool) -> Optional[Dict[str, Any]]:
+    '''
+    Business: одна попытка чтения ленты изменений задач (GET ?action=events) для router.long_poll
+    Args: event - как у handle, final - последняя попытка, ответ нужен даже без событий
+    Returns: HTTP response dict; None, если событий нет и можно ждать уведомления
+    '''
+    params = event.get('queryStringParameters') or {}
+    try:
+        position, statement = events_statement(event, params, workspace_id)
+        list_format = parse_list_format(params)
+    except ValueError as e:
+        return json_response(400, {'error': str(e)})
+    if events_expired(position):
+        return json_response(410, {'error': 'Events cursor expired, reload all tasks'})
+    
+    with conn.cursor(cursor_factory=InstrumentedCursor) as rows_cursor:
+        rows_cursor.execute(*statement)
+        rows = get_row_encoder(rows_cursor.description).encode(rows_cursor.fetchall())
+    events, next_cursor = read_events_batch(rows, position)
+    if not events and position is not None and not final:
+        return None
+    
+    payload: Dict[str, Any] = {'events': events, 'cursor': next_cursor}
+    tasks_statement = changed_tasks_statement(params, events, workspace_id)
+    if tasks_statement:
+        with conn.cursor(cursor_factory=InstrumentedCursor) as rows_cursor:
+            rows_cursor.execute(*tasks_statement)
+            payload.update(encode_task_rows(get_row_encoder(rows_cursor.description), rows_cursor.fetchall(), list_format))
+    else:
+        payload.update(EMPTY_TASK_ROWS[list_format])
+    if events and params.get('stats') == 'true':
+        cursor.execute(SUMMARY_STATS_QUERY, (workspace_id,))
+        payload['stats'] = build_stats(cursor.fetchall())
+    return events_response(event, payload)
+
+async def poll_async(event: Dict[str, Any], db, workspace_id: int, final: bool) -> Optional[Dict[str, Any]]:
+    '''
+    Business: poll для асинхронного движка; задачи и счётчики читаются одним пакетом конвейера
+    Returns: как у poll
+    '''
+    params = event.get('queryStringParameters') or {}
+    try:
+        position, statement = events_statement(event, params, workspace_id)
+        list_format = parse_list_format(params)
+    except ValueError as e:
+        return json_response(400, {'error': str(e)})
+    if events_expired(position):
+        return json_response(410, {'error': 'Events cursor expired, reload all tasks'})
+    
+    [(rows, description)] = await db.run([statement])
+    events, next_cursor = read_events_batch(get_row_encoder(description).encode(rows), position)
+    if not events and position is not None and not final:
+        return None
+    
+    payload: Dict[str, Any] = {'events': events, 'cursor': next_cursor}
+    tasks_statement = changed_tasks_statement(params, events, workspace_id)
+    with_stats = bool(events) and params.get('stats') == 'true'
+    statements = [tasks_statement] if tasks_statement else []
+    if with_stats:
+        statements.append((SUMMARY_STATS_QUERY, (workspace_id,)))
+    results = await db.run(statements) if statements else []
+    if tasks_statement:
+        rows, description = results[0]
+        payload.update(encode_task_rows(get_row_encoder(description), rows, list_format))
+    else:
+        payload.update(EMPTY_TASK_ROWS[list_format])
+    if with_stats:
+        rows, description = results[-1]
+        payload['stats'] = build_stats(get_row_encoder(description).encode(rows))
+    return events_response(event, payload)
+
+def invalidate_catalogs(workspace_id: int) -> None:
+    for namespace in CACHE_INVALIDATES:
+        catalog_cache.invalidate(f'{namespace}:{workspace_id}', shared=False)
+
+event_dispatcher.subscribe(invalidate_catalogs)
+
+def handles_async(method: str, params: Dict[str, Any]) -> bool:
+    return (
+        method == 'GET' and params.get('action') in (None, '', 'stats', 'bootstrap', 'events')
+        and not params.get('since') and not params.get('q')
+    )
+
+async def handle_async(event: Dict[str, Any], db, workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: чтения задач асинхронным движком - список, представления, статистика и bootstrap;
+              независимые запросы (версии для ETag, токен синхронизации, страница, счётчики,
+              справочники) уходят в БД одним пакетом конвейера
+    Args: event - как у handle, db - AsyncReader соединения, workspace_id - рабочее пространство
+    Returns: HTTP response dict, совпадающий с ответом handle
+    '''
+    params = event.get('queryStringParameters') or {}
+    action = params.get('action')
+    is_view = action != 'stats' and bool(params.get('view'))
+    bootstrap = action == 'bootstrap' and not is_view
+    statements: List[Tuple[str, Any]] = []
+    
+    try:
+        if action == 'stats':
+            source = read_stats_source(params)
+            archived = parse_archived(params)
+            statements.extend(stats_statements(source, archived, workspace_id))
+        elif is_view:
+            query, args, key = build_view_query(params, workspace_id)
+            list_format = parse_list_format(params)
+            limit = args[-1] - 1
+            statements.append((query, args))
+        else:
+            query, args, limit, list_format = build_list_page(params, workspace_id)
+            key = 'created_at'
+            statements.append((query, args))
+            if not params.get('cursor'):
+                statements.append((SYNC_TOKEN_QUERY, (workspace_id,)))
+    except ValueError as e:
+        return json_response(400, {'error': str(e)})
+    
+    with_stats = bootstrap and params.get('stats') != 'false'
+    if bootstrap:
+        with_counts = params.get('with_counts') == 'true'
+        statements.append((list_tags_query(with_counts), (workspace_id,)))
+        statements.append((list_projects_query(with_counts), (workspace_id,)))
+        if with_stats:
+            statements.append((SUMMARY_STATS_QUERY, (workspace_id,)))
+    
+    not_modified, cache_headers, results = await db.read(
+        event, TASK_ETAG_TABLES, task_etag_params(event, params), statements, snapshot=bootstrap
+    )
+    if not_modified is not None:
+        return not_modified
+    
+    if action == 'stats':
+        stats = build_stats(merge_stats_rows([get_row_encoder(description).encode(rows) for rows, description in results]))
+        stats['source'] = source
+        if archived != 'exclude':
+            stats['archived'] = archived
+        return json_response(200, stats, cache_headers)
+    
+    rows, description = results[0]
+    encoder = get_row_encoder(description)
+    tasks, next_cursor = paginate(encoder, rows, limit, key)
+    payload = {**encode_task_rows(encoder, tasks, list_format), 'next_cursor': next_cursor}
+    if is_view:
+        return json_response(200, payload, cache_headers)
+    
+    payload['sync_token'] = None
+    if not params.get('cursor'):
+        token_rows, _ = results[1]
+        payload['sync_token'] = make_sync_token(*token_rows[0])[0]
+    if not bootstrap:
+        return json_response(200, payload, cache_headers)
+    
+    (tags_rows, _), (projects_rows, _) = results[-3:-1] if with_stats else results[-2:]
+    if with_stats:
+        stats_rows, description = results[-1]
+        payload['stats'] = build_stats(get_row_encoder(description).encode(stats_rows))
+    body = dumps(payload)[:-1] + ',"tags":' + tags_rows[0][0] + ',"projects":' + projects_rows[0][0] + '}'
+    return raw_response(200, body, cache_headers)
+
+def handle(event: Dict[str, Any], conn, cursor, workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: API для управления задачами с поддержкой CRUD операций
+    Args: event - dict с httpMethod, body, queryStringParameters
+          conn, cursor - соединение из общего пула и курсор со строками-словарями,
+          workspace_id - рабочее пространство запроса
+    Returns: HTTP response dict
+    '''
+    method: str = event.get('httpMethod', 'GET')
+    params = event.get('queryStringParameters') or {}
+    
+    cache_headers = {}
+    if method == 'GET':
+        etag = get_table_etag(cursor, TASK_ETAG_TABLES, task_etag_params(event, params), workspace_id)
+        cache_headers = etag_headers(etag)
+        if etag_matches(event, etag):
+            return empty_response(304, cache_headers)
+    
+    if method == 'GET' and params.get('action') == 'stats':
+        try:
+            source = read_stats_source(params)
+            archived = parse_archived(params)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        row_sets = []
+        for statement in stats_statements(source, archived, workspace_id):
+            cursor.execute(*statement)
+            row_sets.append(cursor.fetchall())
+        stats = build_stats(merge_stats_rows(row_sets))
+        stats['source'] = source
+        if archived != 'exclude':
+            stats['archived'] = archived
+        
+        return json_response(200, stats, cache_headers)
+    
+    elif method == 'GET' and params.get('action') == 'export':
+        export_format = params.get('format') or 'ndjson'
+        try:
+            if export_format not in TASKS_EXPORT_FORMATS:
+                raise ValueError('Invalid format')
+            max_rows = TASKS_EXPORT_MAX_ROWS
+            if params.get('limit'):
+                if not params['limit'].isdigit() or int(params['limit']) < 1:
+                    raise ValueError('Invalid limit')
+                max_rows = min(int(params['limit']), TASKS_EXPORT_MAX_ROWS)
+            extra: Tuple[List[str], List[Any]] = ([], [])
+            if params.get('cursor'):
+                extra = (['(created_at, id) < (%s, %s)'], list(decode_cursor(params['cursor'])))
+            query, args = build_tasks_query(params, workspace_id, ('id', 'created_at'), extra, max_rows + 1)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        compress = choose_encoding(event, ('gzip',)) == 'gzip'
+        buffer = io.BytesIO()
+        sink = gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=TASKS_EXPORT_GZIP_LEVEL) if compress else buffer
+        exported, next_cursor = export_tasks(conn, query, args, export_format, sink, max_rows)
+        if compress:
+            sink.close()
+        
+        headers = {
+            **cache_headers,
+            'Content-Type': TASKS_EXPORT_FORMATS[export_format],
+            'Content-Disposition': f'attachment; filename="tasks.{export_format}"',
+            'Vary': 'X-Workspace-Id, Accept-Encoding',
+            'X-Export-Count': str(exported),
+            'Access-Control-Expose-Headers': 'ETag, X-Export-Count, X-Next-Cursor'
+        }
+        if next_cursor:
+            headers['X-Next-Cursor'] = next_cursor
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+            return binary_response(200, buffer.getvalue(), headers)
+        return raw_response(200, buffer.getvalue().decode(), headers)
+    
+    elif method == 'GET' and params.get('since'):
+        try:
+            token = decode_sync_token(params['since'])
+            columns = select_task_columns(params, ('id',))
+            list_format = parse_list_format(params)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        if time.time() - token['issued_at'] > TASKS_SYNC_RETENTION_DAYS * 86400:
+            return json_response(410, {'error': 'Sync token expired, reload all tasks'})
+        
+        conn.rollback()
+        cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        sync_token, versions = read_sync_token(cursor, workspace_id)
+        with conn.cursor(cursor_factory=InstrumentedCursor) as rows_cursor:
+            rows_cursor.execute(f'''
+                SELECT {columns}
+                FROM tasks
+                WHERE workspace_id = %s AND change_xid >= %s::text::xid8
+                ORDER BY id
+                LIMIT %s
+            ''', (workspace_id, str(token['xmin']), TASKS_SYNC_MAX_CHANGES + 1))
+            tasks = rows_cursor.fetchall()
+            encoder = get_row_encoder(rows_cursor.description)
+        
+        if len(tasks) > TASKS_SYNC_MAX_CHANGES:
+            return json_response(410, {'error': 'Too many changes, reload all tasks'})
+        
+        cursor.execute('''
+            SELECT DISTINCT task_id
+            FROM task_tombstones
+            WHERE workspace_id = %s AND deleted_xid >= %s::text::xid8
+        ''', (workspace_id, str(token['xmin'])))
+        deleted = [row['task_id'] for row in cursor.fetchall()]
+        
+        return json_response(200, {
+            **encode_task_rows(encoder, tasks, list_format),
+            'deleted': deleted,
+            'sync_token': sync_token,
+            'catalog_changed': versions != token['versions']
+        }, cache_headers)
+    
+    elif method == 'GET' and params.get('q'):
+        try:
+            columns = select_task_columns(params, ('id', 'title', 'description'))
+            list_format = parse_list_format(params)
+            conditions, args = build_task_filters(params, workspace_id)
+            limit = parse_limit(params)
+            if not (params.get('offset') or '0').isdigit():
+                raise ValueError('Invalid offset')
+            offset = int(params.get('offset') or 0)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        with conn.cursor(cursor_factory=InstrumentedCursor) as rows_cursor:
+            tasks = search_tasks(rows_cursor, params['q'].strip(), columns, conditions, args, limit + 1, offset)
+            encoder = get_row_encoder(rows_cursor.description)
+        next_offset = offset + limit if len(tasks) > limit else None
+        
+        return json_response(200, {
+            **encode_task_rows(encoder, tasks[:limit], list_format),
+            'next_offset': next_offset
+        }, cache_headers)
+    
+    elif method == 'GET' and params.get('view'):
+        try:
+            query, args, key = build_view_query(params, workspace_id)
+            list_format = parse_list_format(params)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        limit = args[-1] - 1
+        with conn.cursor(cursor_factory=InstrumentedCursor) as rows_cursor:
+            rows_cursor.execute(query, args)
+            tasks = rows_cursor.fetchall()
+            encoder = get_row_encoder(rows_cursor.description)
+        
+        tasks, next_cursor = paginate(encoder, tasks, limit, key)
+        return json_response(200, {
+            **encode_task_rows(encoder, tasks, list_format),
+            'next_cursor': next_cursor
+        }, cache_headers)
+    
+    elif method == 'GET' and params.get('action') == 'bootstrap':
+        conn.rollback()
+        cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        try:
+            payload = list_tasks_page(conn, cursor, params, workspace_id)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        if params.get('stats') != 'false':
+            cursor.execute(SUMMARY_STATS_QUERY, (workspace_id,))
+            payload['stats'] = build_stats(cursor.fetchall())
+        with_counts = params.get('with_counts') == 'true'
+        tags_json = list_tags_json(cursor, workspace_id, with_counts)
+        projects_json = list_projects_json(cursor, workspace_id, with_counts)
+        conn.commit()
+        
+        body = dumps(payload)[:-1] + ',"tags":' + tags_json + ',"projects":' + projects_json + '}'
+        return raw_response(200, body, cache_headers)
+    
+    elif method == 'GET':
+        try:
+            payload = list_tasks_page(conn, cursor, params, workspace_id)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        return json_response(200, payload, cache_headers)
+    
+    elif method == 'POST' and params.get('action') == 'bulk':
+        body = json.loads(event.get('body') or '{}')
+        operations = body.get('operations')
+        
+        try:
+            if not isinstance(operations, list):
+                raise ValueError('operations must be a list')
+            chunk_size = int(params.get('chunk_size') or TASKS_BULK_CHUNK_SIZE)
+            if chunk_size < 1:
+                raise ValueError('Invalid chunk_size')
+            results = run_bulk_operations(cursor, operations, chunk_size, workspace_id)
+        except (ValueError, TypeError, psycopg2.DataError, psycopg2.IntegrityError) as e:
+            conn.rollback()
+            return json_response(400, {'error': str(e).strip()})
+        conn.commit()
+        
+        return json_response(200, {'results': results})
+    
+    elif method == 'POST' and params.get('action') == 'archive':
+        if not archive_job_allowed(event):
+            return json_response(403, {'error': 'Archive job requires a maintenance token'})
+        
+        try:
+            older_than_days = parse_archive_setting(params, 'older_than_days', TASKS_ARCHIVE_AFTER_DAYS)
+            batch_size = parse_archive_setting(params, 'batch_size', TASKS_ARCHIVE_BATCH_SIZE,
+                                               TASKS_ARCHIVE_MAX_BATCH_SIZE)
+            max_batches = parse_archive_setting(params, 'max_batches', TASKS_ARCHIVE_MAX_BATCHES)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        archived, batches, done = 0, 0, False
+        while not done and batches < max_batches:
+            moved = archive_tasks_batch(cursor, workspace_id, older_than_days, batch_size)
+            conn.commit()
+            archived += moved
+            batches += 1
+            done = moved < batch_size
+        
+        return json_response(200, {'archived': archived, 'batches': batches, 'done': done})
+    
+    elif method == 'POST' and params.get('action') == 'import':
+        body = event.get('body') or ''
+        if event.get('isBase64Encoded'):
+            body = base64.b64decode(body).decode('utf-8')
+        
+        try:
+            imported = copy_import_tasks(cursor, body, get_header(event, 'Content-Type') or '')
+        except (ValueError, TypeError, psycopg2.DataError, psycopg2.IntegrityError) as e:
+            conn.rollback()
+            return json_response(400, {'error': str(e).strip()})
+        conn.commit()
+        
+        return json_response(201, {'imported': imported})
+    
+    elif method == 'POST':
+        body = json.loads(event.get('body', '{}'))
+        
+        cursor.execute('''
+            INSERT INTO tasks (title, description, completed, priority, tags, category, project, due_date)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            RETURNING id
+        ''', (
+            body.get('title'),
+            body.get('description'),
+            body.get('completed', False),
+            body.get('priority', 'medium'),
+            body.get('tags', []),
+            body.get('category'),
+            body.get('project'),
+            body.get('due_date')
+        ))
+        
+        task_id = cursor.fetchone()['id']
+        task = read_written_tasks(cursor, workspace_id, [task_id])[task_id]
+        conn.commit()
+        
+        task_dict = serialize_task(task)
+        
+        return json_response(201, {'task': task_dict}, task_headers(task))
+    
+    elif method in ('PUT', 'PATCH'):
+        body = json.loads(event.get('body') or '{}')
+        task_id = body.get('id') or params.get('id')
+        
+        try:
+            if task_id is None:
+                raise ValueError('Task id is required')
+            if method == 'PATCH':
+                values = patch_values(body)
+            else:
+                values = {field: body.get(field) for field in TASK_FIELDS}
+                values['tags'] = body.get('tags', [])
+            versions = read_write_precondition(event, body, task_id)
+        except ValueError as e:
+            return json_response(400, {'error': str(e)})
+        
+        conditions, args = ['id = %s', 'workspace_id = %s'], [task_id, workspace_id]
+        if versions is not None:
+            conditions.append('version = ANY(%s)')
+            args.append(versions)
+        
+        cursor.execute(f'''
+            UPDATE tasks
+            SET {', '.join(f'{field} = %s' for field in values)}, updated_at = CURRENT_TIMESTAMP
+            WHERE {' AND '.join(conditions)}
+            RETURNING id
+        ''', list(values.values()) + args)
+        
+        task = cursor.fetchone()
+        if task:
+            task = read_written_tasks(cursor, workspace_id, [task['id']])[task['id']]
+        current = None
+        if not task and versions is not None:
+            cursor.execute('SELECT id, version FROM tasks WHERE id = %s AND workspace_id = %s', (task_id, workspace_id))
+            current = cursor.fetchone()
+        conn.commit()
+        
+        if current:
+            return json_response(412, {
+                'error': 'Task was modified by another request',
+                'version': current['version']
+            }, task_headers(current))
+        
+        if not task and versions is not None:
+            return json_response(412, {'error': 'Task no longer exists'})
+        
+        if not task:
+            return json_response(404, {'error': 'Task not found'})
+        
+        task_dict = serialize_task(task)
+        
+        return json_response(200, {'task': task_dict}, task_headers(task))
+    
+    elif method == 'DELETE':
+        params = event.get('queryStringParameters', {})
+        task_id = params.get('id')
+        
+        cursor.execute('DELETE FROM tasks WHERE id = %s AND workspace_id = %s RETURNING id', (task_id, workspace_id))
+        deleted = cursor.fetchone()
+        conn.commit()
+        
+        if not deleted:
+            return json_response(404, {'error': 'Task not found'})
+        
+        return json_response(200, {'success': True})
+    
+    return json_response(405, {'error': 'Method not allowed'})
@@ -0,0 +1,117 @@
+import functools
+import importlib
+import time
+from typing import Dict, Any, Callable
+
+from core import (
+    catalog_cache, compress_response, current_metrics, db_pool, empty_response, etag_matches,
+    event_dispatcher, get_db_connection, get_workspace_id, instrument_handler, json_response,
+    options_response, parse_wait, raw_response, release_db_connection
+)
+
+RESOURCES = ('tasks', 'tags', 'projects')
+
+def cached_response(event: Dict[str, Any], cached: Dict[str, Any]) -> Dict[str, Any]:
+    headers = cached['headers']
+    if etag_matches(event, headers.get('ETag', '')):
+        return empty_response(304, headers)
+    return compress_response(event, raw_response(200, cached['body'], headers))
+
+def long_poll(module, event: Dict[str, Any], workspace_id: int) -> Dict[str, Any]:
+    '''
+    Business: long-poll чтение: module.poll повторяется по уведомлениям EventDispatcher, пока не
+              вернёт ответ или не выйдет время wait; соединение из пула на время ожидания отпускается
+    Args: module - ресурс с poll(event, conn, cursor, workspace_id, final), event - как у handler,
+          workspace_id - рабочее пространство запроса
+    Returns: HTTP response dict от module.poll
+    '''
+    try:
+        wait = parse_wait(event.get('queryStringParameters') or {})
+    except ValueError as e:
+        return json_response(400, {'error': str(e)})
+    
+    deadline = time.monotonic() + wait
+    if wait:
+        event_dispatcher.start()
+    while True:
+        position = event_dispatcher.position(workspace_id)
+        final = not event_dispatcher.running or time.monotonic() >= deadline
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            if not db_pool.bind_workspace(conn, workspace_id):
+                return json_response(404, {'error': 'Workspace not found'})
+            response = module.poll(event, conn, cursor, workspace_id, final)
+        finally:
+            cursor.close()
+            release_db_connection(conn)
+        if response is not None:
+            return response
+        event_dispatcher.wait(workspace_id, position, max(deadline - time.monotonic(), 0))
+
+def serve(resource: str, event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    '''
+    Business: общая часть обработки запроса: CORS, статистика пула и кэша, рабочее пространство
+              из X-Workspace-Id, кэш справочников, соединение из общего пула, сжатие ответа
+    Args: resource - имя ресурса, event/context - как у handler
+    Returns: HTTP response dict от обработчика ресурса или из кэша
+    '''
+    method: str = event.get('httpMethod', 'GET')
+    if method == 'OPTIONS':
+        return options_response()
+    
+    params = event.get('queryStringParameters') or {}
+    if method == 'GET' and params.get('action') == 'pool':
+        return json_response(200, {'pool': db_pool.get_stats()})
+    if method == 'GET' and params.get('action') == 'cache':
+        return json_response(200, {'cache': catalog_cache.get_stats(), 'events': event_dispatcher.get_stats()})
+    
+    try:
+        workspace_id = get_workspace_id(event)
+    except ValueError as e:
+        return json_response(400, {'error': str(e)})
+    
+    module = importlib.import_module(f'resources.{resource}')
+    if method == 'GET' and params.get('action') in getattr(module, 'LONG_POLL_ACTIONS', ()):
+        return compress_response(event, long_poll(module, event, workspace_id))
+    
+    namespace = getattr(module, 'CACHE_NAMESPACE', None)
+    cache_key = None
+    if namespace and method == 'GET' and not params.get('action'):
+        namespace = f'{namespace}:{workspace_id}'
+        cache_key = catalog_cache.make_key(params)
+        generation = catalog_cache.generation(namespace)
+        cached = catalog_cache.get(namespace, cache_key, generation)
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.cache = 'miss' if cached is None else 'hit'
+        if cached is not None:
+            return cached_response(event, cached)
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        if not db_pool.bind_workspace(conn, workspace_id):
+            return json_response(404, {'error': 'Workspace not found'})
+        response = module.handle(event, conn, cursor, workspace_id)
+    finally:
+        cursor.close()
+        release_db_connection(conn)
+    
+    if cache_key is not None and response['statusCode'] == 200:
+        catalog_cache.set(namespace, cache_key, {'body': response['body'], 'headers': response['headers']}, generation)
+    elif method != 'GET' and response['statusCode'] < 400:
+        for invalidated in getattr(module, 'CACHE_INVALIDATES', ()):
+            catalog_cache.invalidate(f'{invalidated}:{workspace_id}')
+    return compress_response(event, response)
+
+handlers: Dict[str, Callable[[Dict[str, Any], Any], Dict[str, Any]]] = {
+    resource: instrument_handler(resource)(functools.partial(serve, resource))
+    for resource in RESOURCES
+}
+
+def dispatch(resource: str, event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    handler = handlers.get(resource)
+    if handler is None:
+        return json_response(404, {'error': 'Unknown resource'})
+    return handler(event, context)
@@ -0,0 +1,89 @@
+'''
+Business: замер холодного старта функций: импорт модуля и первый запрос в свежем процессе
+Args: DATABASE_URL в окружении; --root дерево исходников для сравнения (например git worktree
+      прошлой ревизии), --runs число повторов, --entry точки входа backend/<entry>/index.py
+Returns: медианы import_ms/first_request_ms по каждой точке входа и для всех трёх подряд
+         в одном процессе (тёплый контейнер, обслуживающий несколько ресурсов)
+'''
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CHILD = '''
+import importlib.util, json, os, sys, time
+root, entries = sys.argv[1], sys.argv[2].split(',')
+os.environ.setdefault('REQUEST_LOG', 'false')
+class Context:
+    request_id = 'cold-start'
+    function_name = 'cold-start'
+timings = []
+for entry in entries:
+    path = os.path.join(root, 'backend', entry, 'index.py')
+    started = time.perf_counter()
+    sys.path.insert(0, os.path.dirname(path))
+    spec = importlib.util.spec_from_file_location(f'cold_{entry}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    imported = time.perf_counter()
+    params = {'resource': 'tasks'} if entry == 'api' else {}
+    response = module.handler({'httpMethod': 'GET', 'queryStringParameters': params, 'headers': {}}, Context())
+    finished = time.perf_counter()
+    timings.append({
+        'entry': entry,
+        'status': response['statusCode'],
+        'import_ms': (imported - started) * 1000,
+        'first_request_ms': (finished - imported) * 1000
+    })
+print(json.dumps(timings))
+'''
+
+def measure(root: str, entries: List[str], runs: int) -> List[Dict[str, float]]:
+    samples: List[List[Dict[str, float]]] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', CHILD, root, ','.join(entries)],
+            capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    summary = []
+    for index, entry in enumerate(entries):
+        summary.append({
+            'entry': entry,
+            'import_ms': round(statistics.median(run[index]['import_ms'] for run in samples), 2),
+            'first_request_ms': round(statistics.median(run[index]['first_request_ms'] for run in samples), 2)
+        })
+    return summary
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Cold start benchmark for the function entry points')
+    parser.add_argument('--root', default=ROOT, help='source tree to measure')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--entry', action='append', help='entry points (default: tasks, tags, projects)')
+    args = parser.parse_args()
+
+    entries = args.entry or ['tasks', 'tags', 'projects']
+    print(f"{'scenario':<28} {'import_ms':>10} {'first_request_ms':>17} {'total_ms':>9}")
+    cold_total = 0.0
+    for entry in entries:
+        row = measure(args.root, [entry], args.runs)[0]
+        total = row['import_ms'] + row['first_request_ms']
+        cold_total += total
+        print(f"{'cold ' + entry:<28} {row['import_ms']:>10} {row['first_request_ms']:>17} {total:>9.2f}")
+    if len(entries) > 1:
+        print(f"{'separate processes: all':<28} {'':>10} {'':>17} {cold_total:>9.2f}")
+        rows = measure(args.root, entries, args.runs)
+        for row in rows:
+            total = row['import_ms'] + row['first_request_ms']
+            print(f"{'same process: ' + row['entry']:<28} {row['import_ms']:>10} {row['first_request_ms']:>17} {total:>9.2f}")
+        total = sum(row['import_ms'] + row['first_request_ms'] for row in rows)
+        print(f"{'same process: all':<28} {'':>10} {'':>17} {total:>9.2f}")
+
+if __name__ == '__main__':
+    main()
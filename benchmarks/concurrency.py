@@ -0,0 +1,148 @@
+'''
+Business: масштабирование по конкурентности одного тёплого процесса: синхронный движок
+          (пул потоков поверх psycopg2) против API_ENGINE=async (asyncio, AsyncPool, конвейер)
+Args: DATABASE_URL в окружении, данные засеяны benchmarks/load.py --seed; --levels уровни
+      конкурентности, --requests запросов на уровень, --pool-size размер пула соединений обоих движков
+Returns: по каждому движку и уровню пропускная способность, p50/p95/p99 и число ошибок;
+         JSON с результатами в --output
+'''
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from load import ROOT, RESULTS_DIR, BenchContext, git_revision, percentile
+
+READ_MIX = {'list': 30, 'list_filtered': 20, 'overdue': 10, 'stats': 10, 'tags': 10, 'projects': 10, 'bootstrap': 10}
+
+def make_event(scenario: str, rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+    if scenario == 'list':
+        resource, params = 'tasks', {'limit': '50'}
+    elif scenario == 'list_filtered':
+        resource, params = 'tasks', {
+            'limit': '50', 'completed': 'false', 'priority': rng.choice(['high', 'medium']),
+            'tags': f'tag{rng.randint(0, 29)}'
+        }
+    elif scenario == 'overdue':
+        resource, params = 'tasks', {'view': 'overdue', 'limit': '50'}
+    elif scenario == 'stats':
+        resource, params = 'tasks', {'action': 'stats', 'source': 'summary'}
+    elif scenario == 'bootstrap':
+        resource, params = 'tasks', {'action': 'bootstrap', 'limit': '50'}
+    else:
+        resource, params = scenario, {}
+    return resource, {'httpMethod': 'GET', 'queryStringParameters': params, 'headers': {}}
+
+def make_plan(requests: int, seed_value: int) -> List[Tuple[str, Dict[str, Any]]]:
+    rng = random.Random(seed_value)
+    scenarios = rng.choices(list(READ_MIX), weights=list(READ_MIX.values()), k=requests)
+    return [make_event(scenario, rng) for scenario in scenarios]
+
+def summarize(samples: List[Tuple[float, bool]], elapsed: float) -> Dict[str, Any]:
+    latencies = [latency for latency, _ in samples]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, ok in samples if not ok),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3)
+    }
+
+def run_sync(dispatch: Callable, plan: List[Tuple[str, Dict[str, Any]]], concurrency: int) -> Dict[str, Any]:
+    samples: List[Tuple[float, bool]] = []
+    samples_lock = threading.Lock()
+
+    def call(item: Tuple[str, Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            ok = dispatch(item[0], item[1], BenchContext())['statusCode'] < 400
+        except Exception as e:
+            print(f'sync {item[0]}: {e!r}', file=sys.stderr)
+            ok = False
+        with samples_lock:
+            samples.append(((time.perf_counter() - started) * 1000, ok))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, plan))
+    return summarize(samples, time.perf_counter() - started)
+
+async def run_async(dispatch: Callable, plan: List[Tuple[str, Dict[str, Any]]], concurrency: int) -> Dict[str, Any]:
+    samples: List[Tuple[float, bool]] = []
+    position = iter(plan)
+
+    async def worker() -> None:
+        for resource, event in position:
+            started = time.perf_counter()
+            try:
+                ok = (await dispatch(resource, event, BenchContext()))['statusCode'] < 400
+            except Exception as e:
+                print(f'async {resource}: {e!r}', file=sys.stderr)
+                ok = False
+            samples.append(((time.perf_counter() - started) * 1000, ok))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - started)
+
+async def run_async_levels(dispatch: Callable, plans: Dict[int, List], warmup: List) -> Dict[int, Dict[str, Any]]:
+    await run_async(dispatch, warmup, 4)
+    return {level: await run_async(dispatch, plan, level) for level, plan in plans.items()}
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Concurrency scaling benchmark: sync vs async engine')
+    parser.add_argument('--levels', default='1,4,16,64', help='comma separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=1000, help='requests per level')
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--pool-size', type=int, default=10, help='DB_POOL_MAX_SIZE for both engines')
+    parser.add_argument('--engine', choices=['sync', 'async', 'both'], default='both')
+    parser.add_argument('--random-seed', type=int, default=42)
+    parser.add_argument('--output', help='results file (default: benchmarks/results/concurrency-<timestamp>.json)')
+    args = parser.parse_args()
+
+    os.environ['DB_POOL_MAX_SIZE'] = str(args.pool_size)
+    os.environ.setdefault('REQUEST_LOG', 'false')
+    os.environ.setdefault('CATALOG_CACHE_TTL', '0')
+    sys.path.insert(0, os.path.join(ROOT, 'backend', 'api'))
+    import router
+
+    levels = [int(level) for level in args.levels.split(',')]
+    plans = {level: make_plan(args.requests, args.random_seed + level) for level in levels}
+    warmup = make_plan(args.warmup, args.random_seed)
+    results: Dict[str, Dict[int, Dict[str, Any]]] = {}
+
+    if args.engine in ('sync', 'both'):
+        run_sync(router.dispatch, warmup, 4)
+        results['sync'] = {level: run_sync(router.dispatch, plan, level) for level, plan in plans.items()}
+    if args.engine in ('async', 'both'):
+        import aio
+        results['async'] = asyncio.run(run_async_levels(aio.dispatch_async, plans, warmup))
+
+    print(f"{'engine':<8} {'concurrency':>11} {'rps':>9} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'errors':>7}")
+    for engine, rows in results.items():
+        for level, row in rows.items():
+            print(f"{engine:<8} {level:>11} {row['throughput_rps']:>9} {row['p50_ms']:>9} "
+                  f"{row['p95_ms']:>9} {row['p99_ms']:>9} {row['errors']:>7}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"concurrency-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'revision': git_revision(),
+            'config': {'levels': levels, 'requests': args.requests, 'pool_size': args.pool_size},
+            'results': {engine: {str(level): row for level, row in rows.items()} for engine, rows in results.items()}
+        }, f, indent=2)
+    print(f'\nresults: {output}', file=sys.stderr)
+    return 1 if any(row['errors'] for rows in results.values() for row in rows.values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
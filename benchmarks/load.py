@@ -0,0 +1,435 @@
+'''
+Business: нагрузочный прогон обработчиков tasks/tags/projects против локального Postgres
+Args: DATABASE_URL в окружении; --tasks объём данных, --seed пересоздать данные,
+      --requests/--concurrency/--mix параметры нагрузки, --output/--compare файлы результатов
+Returns: p50/p95/p99, пропускная способность, обращения к БД на запрос и пиковый RSS;
+         JSON с результатами, код выхода 1 при регрессии относительно --compare
+'''
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import psycopg2
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+SEED_BATCH_SIZE = 50000
+
+SEED_QUERY = '''
+    INSERT INTO tasks (title, description, completed, priority, tags, category, project,
+                       due_date, created_at, updated_at)
+    SELECT (ARRAY['Подготовить', 'Проверить', 'Согласовать', 'Обновить', 'Исправить', 'Отправить'])[1 + g %% 6]
+               || ' ' || (ARRAY['отчёт', 'договор', 'релиз', 'макет', 'бюджет', 'презентацию', 'тесты'])[1 + g %% 7]
+               || ' №' || g,
+           CASE WHEN g %% 3 = 0 THEN NULL
+                ELSE 'Задача ' || g || ': ' || (ARRAY['срочно', 'после встречи', 'по итогам квартала', 'для клиента'])[1 + g %% 4]
+           END,
+           random() < 0.3,
+           (ARRAY['low', 'medium', 'medium', 'high'])[1 + g %% 4],
+           (SELECT COALESCE(array_agg(DISTINCT 'tag' || ((g * 7 + i * 13) %% 30)), '{}')
+            FROM generate_series(1, g %% 4) i),
+           (ARRAY['work', 'personal', 'study', 'home'])[1 + g %% 4],
+           CASE WHEN g %% 10 = 0 THEN NULL ELSE 'project' || (g %% 15) END,
+           CASE WHEN g %% 5 < 3 THEN now() + ((g %% 120) - 60) * interval '1 day' END,
+           now() - (g %% 365) * interval '1 day' - (g %% 86400) * interval '1 second',
+           now() - (g %% 30) * interval '1 day'
+    FROM generate_series(%s, %s) g
+'''
+
+MIXES = {
+    'read': {
+        'list': 30, 'list_filtered': 20, 'list_next_page': 10, 'search': 10,
+        'overdue': 5, 'calendar': 5, 'stats': 10, 'tags': 5, 'projects': 5
+    },
+    'mixed': {
+        'list': 15, 'list_filtered': 15, 'list_next_page': 5, 'search': 10, 'overdue': 5,
+        'calendar': 5, 'stats': 5, 'tags': 5, 'projects': 5, 'create': 15, 'update': 10, 'delete': 5
+    },
+    'write': {'create': 50, 'update': 35, 'delete': 15},
+}
+
+class Counter:
+    '''
+    Business: счётчик обращений к БД текущего потока
+    '''
+    local = threading.local()
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.local.round_trips = 0
+
+    @classmethod
+    def add(cls) -> None:
+        cls.local.round_trips = getattr(cls.local, 'round_trips', 0) + 1
+
+    @classmethod
+    def value(cls) -> int:
+        return getattr(cls.local, 'round_trips', 0)
+
+class CountingCursor:
+    '''
+    Business: обёртка курсора, считающая execute/executemany/copy_expert
+    '''
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+    def execute(self, *args, **kwargs):
+        Counter.add()
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        Counter.add()
+        return self._cursor.executemany(*args, **kwargs)
+
+    def copy_expert(self, *args, **kwargs):
+        Counter.add()
+        return self._cursor.copy_expert(*args, **kwargs)
+
+class CountingConnection:
+    '''
+    Business: обёртка соединения: курсоры считают запросы, commit/rollback тоже обращаются к БД
+    '''
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return CountingCursor(self._conn.cursor(*args, **kwargs))
+
+    def commit(self):
+        Counter.add()
+        return self._conn.commit()
+
+    def rollback(self):
+        Counter.add()
+        return self._conn.rollback()
+
+def instrument(router) -> None:
+    get_db_connection = router.get_db_connection
+    release_db_connection = router.release_db_connection
+    wrappers: Dict[int, CountingConnection] = {}
+
+    def counting_connection() -> CountingConnection:
+        conn = get_db_connection()
+        wrapper = wrappers.get(id(conn))
+        if wrapper is None or wrapper._conn is not conn:
+            wrapper = wrappers[id(conn)] = CountingConnection(conn)
+        return wrapper
+
+    router.get_db_connection = counting_connection
+    router.release_db_connection = lambda conn: release_db_connection(conn._conn)
+
+def connect():
+    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('app.workspace_id', %s, false)",
+            (os.environ.get('DEFAULT_WORKSPACE_ID', '1'),)
+        )
+    conn.commit()
+    return conn
+
+class BenchContext:
+    def __init__(self):
+        self.request_id = str(uuid.uuid4())
+        self.function_name = 'benchmark'
+
+def seed(tasks: int) -> None:
+    conn = connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('TRUNCATE task_tags, tasks, tags, projects, task_tombstones RESTART IDENTITY')
+            cursor.execute('DELETE FROM task_stats')
+            conn.commit()
+            for start in range(1, tasks + 1, SEED_BATCH_SIZE):
+                started = time.perf_counter()
+                end = min(start + SEED_BATCH_SIZE - 1, tasks)
+                cursor.execute(SEED_QUERY, (start, end))
+                conn.commit()
+                print(f'seeded {end}/{tasks} ({time.perf_counter() - started:.1f}s)', file=sys.stderr)
+            cursor.execute('ANALYZE tasks')
+            cursor.execute('ANALYZE task_tags')
+    finally:
+        conn.close()
+
+class Workload:
+    '''
+    Business: генератор событий для сценариев нагрузки
+    Args: handlers - обработчики по имени ресурса (router.handlers), max_task_id - верхняя граница засеянных id
+    '''
+    def __init__(self, handlers: Dict[str, Callable], max_task_id: int):
+        self.handlers = handlers
+        self.max_task_id = max_task_id
+        self.created: List[int] = []
+        self.lock = threading.Lock()
+        self.next_cursor: Optional[str] = None
+
+    def call(self, function: str, method: str, params: Optional[Dict[str, str]] = None,
+             body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        event = {
+            'httpMethod': method,
+            'queryStringParameters': params or {},
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps(body) if body is not None else None
+        }
+        return self.handlers[function](event, BenchContext())
+
+    def prepare(self) -> None:
+        page = json.loads(self.call('tasks', 'GET', {'limit': '50'})['body'])
+        self.next_cursor = page.get('next_cursor')
+
+    def task_body(self, rng: random.Random) -> Dict[str, Any]:
+        return {
+            'title': f'Нагрузочная задача {rng.randint(1, 10 ** 6)}',
+            'description': 'Создано нагрузочным тестом',
+            'priority': rng.choice(['low', 'medium', 'high']),
+            'tags': rng.sample([f'tag{i}' for i in range(30)], rng.randint(0, 3)),
+            'project': f'project{rng.randint(0, 14)}',
+            'category': rng.choice(['work', 'personal', 'study', 'home']),
+            'completed': rng.random() < 0.3
+        }
+
+    def run(self, scenario: str, rng: random.Random) -> Dict[str, Any]:
+        if scenario == 'list':
+            return self.call('tasks', 'GET')
+        if scenario == 'list_filtered':
+            return self.call('tasks', 'GET', {
+                'limit': '50', 'completed': 'false', 'priority': rng.choice(['high', 'medium']),
+                'tags': f'tag{rng.randint(0, 29)}'
+            })
+        if scenario == 'list_next_page':
+            params = {'limit': '50'}
+            if self.next_cursor:
+                params['cursor'] = self.next_cursor
+            return self.call('tasks', 'GET', params)
+        if scenario == 'search':
+            return self.call('tasks', 'GET', {'q': rng.choice(['отчёт', 'договор', 'релиз', 'бюджет', 'клиента'])})
+        if scenario == 'overdue':
+            return self.call('tasks', 'GET', {'view': 'overdue', 'limit': '50'})
+        if scenario == 'calendar':
+            month = datetime.now().replace(day=1) + timedelta(days=31 * rng.randint(-2, 1))
+            start = month.replace(day=1)
+            end = (start + timedelta(days=32)).replace(day=1)
+            return self.call('tasks', 'GET', {
+                'view': 'calendar', 'due_from': start.date().isoformat(),
+                'due_to': end.date().isoformat(), 'limit': '500'
+            })
+        if scenario == 'stats':
+            return self.call('tasks', 'GET', {'action': 'stats', 'source': 'summary'})
+        if scenario == 'tags':
+            return self.call('tags', 'GET', {'with_counts': 'true'})
+        if scenario == 'projects':
+            return self.call('projects', 'GET', {'with_counts': 'true'})
+        if scenario == 'create':
+            response = self.call('tasks', 'POST', body=self.task_body(rng))
+            if response['statusCode'] < 300:
+                with self.lock:
+                    self.created.append(json.loads(response['body'])['task']['id'])
+            return response
+        if scenario == 'update':
+            body = self.task_body(rng)
+            body['id'] = rng.randint(1, self.max_task_id)
+            return self.call('tasks', 'PUT', body=body)
+        if scenario == 'delete':
+            with self.lock:
+                task_id = self.created.pop() if self.created else None
+            if task_id is None:
+                return self.run('create', rng)
+            return self.call('tasks', 'DELETE', {'id': str(task_id)})
+        raise ValueError(f'Unknown scenario {scenario}')
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def summarize(samples: List[Tuple[float, int, bool]], elapsed: float) -> Dict[str, Any]:
+    latencies = [sample[0] for sample in samples]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if not sample[2]),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'max_ms': round(max(latencies), 3) if latencies else 0.0,
+        'round_trips_per_request': round(sum(sample[1] for sample in samples) / len(samples), 2) if samples else 0.0
+    }
+
+def run_load(workload: Workload, mix: Dict[str, int], requests: int, concurrency: int,
+             warmup: int, seed_value: int) -> Dict[str, Any]:
+    scenarios = list(mix)
+    weights = [mix[name] for name in scenarios]
+    plan_rng = random.Random(seed_value)
+    plan = plan_rng.choices(scenarios, weights=weights, k=warmup + requests)
+    samples: Dict[str, List[Tuple[float, int, bool]]] = {name: [] for name in scenarios}
+    position = iter(range(len(plan)))
+    position_lock = threading.Lock()
+    samples_lock = threading.Lock()
+    measured_from = [0.0]
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(seed_value * 1000 + worker_id)
+        while True:
+            with position_lock:
+                index = next(position, None)
+                if index == warmup:
+                    measured_from[0] = time.perf_counter()
+            if index is None:
+                return
+            scenario = plan[index]
+            Counter.reset()
+            started = time.perf_counter()
+            try:
+                ok = workload.run(scenario, rng)['statusCode'] < 500
+            except Exception as e:
+                print(f'{scenario}: {e!r}', file=sys.stderr)
+                ok = False
+            latency = (time.perf_counter() - started) * 1000
+            if index >= warmup:
+                with samples_lock:
+                    samples[scenario].append((latency, Counter.value(), ok))
+
+    if warmup == 0:
+        measured_from[0] = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - measured_from[0]
+
+    all_samples = [sample for items in samples.values() for sample in items]
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'overall': summarize(all_samples, elapsed),
+        'scenarios': {name: summarize(items, elapsed) for name, items in samples.items() if items}
+    }
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    regressed = False
+    print(f"\n{'scenario':<16} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    rows = [('overall', result['overall'], baseline.get('overall', {}))]
+    rows += [
+        (name, metrics, baseline.get('scenarios', {}).get(name, {}))
+        for name, metrics in result['scenarios'].items()
+    ]
+    for name, current, previous in rows:
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps'):
+            if not previous.get(metric):
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            worse = change < -threshold if metric == 'throughput_rps' else change > threshold
+            regressed = regressed or worse
+            marker = ' !' if worse else ''
+            print(f'{name:<16} {metric:<15} {previous[metric]:>10} {current[metric]:>10} {change:>+8.1%}{marker}')
+    return regressed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Load benchmark for the task tracker handlers')
+    parser.add_argument('--tasks', type=int, default=100000, help='tasks to seed with --seed')
+    parser.add_argument('--seed', action='store_true', help='truncate and reseed the database')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--mix', choices=sorted(MIXES), default='mixed')
+    parser.add_argument('--random-seed', type=int, default=42)
+    parser.add_argument('--output', help='results file (default: benchmarks/results/load-<timestamp>.json)')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative change treated as regression')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DB_POOL_MAX_SIZE', str(max(args.concurrency, 5)))
+    os.environ.setdefault('REQUEST_LOG', 'false')
+    if args.seed:
+        seed(args.tasks)
+
+    sys.path.insert(0, os.path.join(ROOT, 'backend', 'api'))
+    import router
+    instrument(router)
+
+    conn = connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT COALESCE(MAX(id), 0), COUNT(*) FROM tasks')
+            max_task_id, task_count = cursor.fetchone()
+    finally:
+        conn.close()
+    if not task_count:
+        print('tasks table is empty, run with --seed', file=sys.stderr)
+        return 2
+
+    workload = Workload(router.handlers, max_task_id)
+    workload.prepare()
+    result = run_load(workload, MIXES[args.mix], args.requests, args.concurrency, args.warmup, args.random_seed)
+    result = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'config': {
+            'tasks': task_count, 'requests': args.requests, 'concurrency': args.concurrency,
+            'warmup': args.warmup, 'mix': args.mix, 'random_seed': args.random_seed
+        },
+        **result,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'pool': sys.modules['core'].db_pool.get_stats()
+    }
+
+    print(f"{'scenario':<16} {'requests':>8} {'errors':>6} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'rps':>9} {'trips':>6}")
+    for name, metrics in [('overall', result['overall'])] + list(result['scenarios'].items()):
+        print(
+            f"{name:<16} {metrics['requests']:>8} {metrics['errors']:>6} {metrics['p50_ms']:>9} "
+            f"{metrics['p95_ms']:>9} {metrics['p99_ms']:>9} {metrics['throughput_rps']:>9} "
+            f"{metrics['round_trips_per_request']:>6}"
+        )
+    print(f"peak RSS: {result['peak_rss_kb'] / 1024:.1f} MiB")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f'results: {output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(result, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
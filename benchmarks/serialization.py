@@ -0,0 +1,95 @@
+'''
+Business: сравнение путей сериализации списка задач на 1k/100k/1M строк
+Args: DATABASE_URL в окружении, размеры выборок аргументами (по умолчанию 1000 100000 1000000)
+Returns: таблица времени и размера ответа для каждого пути
+'''
+
+import json
+import os
+import sys
+import time
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend', 'api'))
+
+import core
+from resources.tasks import serialize_task
+
+SEED_QUERY = '''
+    CREATE TEMP TABLE bench_tasks ON COMMIT DROP AS
+    SELECT g AS id,
+           'Задача ' || g AS title,
+           CASE WHEN g %% 3 = 0 THEN NULL ELSE 'Описание задачи ' || g END AS description,
+           g %% 4 = 0 AS completed,
+           (ARRAY['low', 'medium', 'high'])[g %% 3 + 1] AS priority,
+           ARRAY['tag' || g %% 20, 'tag' || g %% 7] AS tags,
+           'category' || g %% 5 AS category,
+           'project' || g %% 10 AS project,
+           CASE WHEN g %% 2 = 0 THEN now() + g * interval '1 minute' END AS due_date,
+           now() - g * interval '1 second' AS created_at,
+           now() - g * interval '1 second' AS updated_at
+    FROM generate_series(1, %s) g
+'''
+
+BENCH_QUERY = '''
+    SELECT id, title, description, completed, priority, tags, category, project,
+           due_date, created_at, updated_at
+    FROM bench_tasks
+    ORDER BY created_at DESC, id DESC
+'''
+
+def dict_rows(conn) -> str:
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(BENCH_QUERY)
+        tasks = cursor.fetchall()
+    return json.dumps({'tasks': [serialize_task(task) for task in tasks]})
+
+def row_encoder(conn) -> str:
+    with conn.cursor() as cursor:
+        cursor.execute(BENCH_QUERY)
+        tasks = cursor.fetchall()
+        encoder = core.get_row_encoder(cursor.description)
+    return core.dumps({'tasks': encoder.encode(tasks)})
+
+def row_encoder_columns(conn) -> str:
+    with conn.cursor() as cursor:
+        cursor.execute(BENCH_QUERY)
+        tasks = cursor.fetchall()
+        encoder = core.get_row_encoder(cursor.description)
+    return core.dumps({'columns': list(encoder.columns), 'rows': encoder.encode_rows(tasks)})
+
+def json_agg(conn) -> str:
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT COALESCE(json_agg(r), '[]')::text FROM ({BENCH_QUERY}) r")
+        return '{"tasks":' + cursor.fetchone()[0] + '}'
+
+PATHS = (
+    ('RealDictCursor + json.dumps', dict_rows),
+    ('RowEncoder + dumps', row_encoder),
+    ('RowEncoder columns + dumps', row_encoder_columns),
+    ('json_agg', json_agg),
+)
+
+def main() -> None:
+    sizes = [int(size) for size in sys.argv[1:]] or [1000, 100000, 1000000]
+    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    encoder_name = 'orjson' if core.orjson is not None else 'json'
+    print(f'encoder: {encoder_name}')
+    print(f"{'rows':>9}  {'path':<28} {'seconds':>9} {'bytes':>12}")
+    try:
+        for size in sizes:
+            with conn.cursor() as cursor:
+                cursor.execute(SEED_QUERY, (size,))
+                cursor.execute('ANALYZE bench_tasks')
+            for name, path in PATHS:
+                started = time.perf_counter()
+                body = path(conn)
+                elapsed = time.perf_counter() - started
+                print(f'{size:>9}  {name:<28} {elapsed:>9.3f} {len(body):>12}')
+            conn.commit()
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+CREATE OR REPLACE PROCEDURE backfill_tasks_created_at(batch_size INTEGER) AS $$
+DECLARE
+    last_id INTEGER := 0;
+    max_id INTEGER;
+BEGIN
+    SELECT COALESCE(MAX(id), 0) INTO max_id FROM tasks;
+    WHILE last_id < max_id LOOP
+        UPDATE tasks
+        SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP)
+        WHERE id > last_id AND id <= last_id + batch_size AND created_at IS NULL;
+        last_id := last_id + batch_size;
+        COMMIT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CALL backfill_tasks_created_at(5000);
+
+DROP PROCEDURE backfill_tasks_created_at(INTEGER);
@@ -0,0 +1,3 @@
+ALTER TABLE tasks VALIDATE CONSTRAINT chk_tasks_created_at_not_null;
+ALTER TABLE tasks ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE tasks DROP CONSTRAINT chk_tasks_created_at_not_null;
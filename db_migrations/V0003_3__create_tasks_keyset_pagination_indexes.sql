@@ -0,0 +1,3 @@
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_created_at_id ON tasks(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_tags ON tasks USING GIN(tags);
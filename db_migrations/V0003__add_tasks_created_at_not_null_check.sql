@@ -0,0 +1 @@
+ALTER TABLE tasks ADD CONSTRAINT chk_tasks_created_at_not_null CHECK (created_at IS NOT NULL) NOT VALID;
@@ -0,0 +1,49 @@
+CREATE OR REPLACE PROCEDURE backfill_task_stats(batch_size INTEGER) AS $$
+DECLARE
+    from_id INTEGER := 0;
+    to_id INTEGER;
+    max_id INTEGER;
+BEGIN
+    SELECT cutoff_id INTO max_id FROM task_stats_backfill;
+    WHILE from_id < max_id LOOP
+        to_id := LEAST(from_id + batch_size, max_id);
+        PERFORM 1 FROM tasks WHERE id > from_id AND id <= to_id FOR SHARE;
+
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT kind, key, SUM(total), SUM(completed), SUM(high_priority)
+        FROM (
+            SELECT 'total' AS kind, '' AS key, 1 AS total, completed::int AS completed,
+                   (priority = 'high' AND NOT completed)::int AS high_priority
+            FROM tasks WHERE id > from_id AND id <= to_id
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM tasks WHERE id > from_id AND id <= to_id
+            UNION ALL
+            SELECT 'project', COALESCE(project, ''), 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM tasks WHERE id > from_id AND id <= to_id
+            UNION ALL
+            SELECT 'tag', tag, 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM tasks CROSS JOIN LATERAL unnest(tags) AS tag WHERE id > from_id AND id <= to_id
+        ) counts
+        GROUP BY kind, key
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+
+        UPDATE task_stats_backfill SET last_id = to_id;
+        from_id := to_id;
+        COMMIT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CALL backfill_task_stats(5000);
+
+DROP PROCEDURE backfill_task_stats(INTEGER);
+
+CREATE OR REPLACE FUNCTION task_stats_counted(p_id INTEGER) RETURNS boolean AS $$
+    SELECT TRUE;
+$$ LANGUAGE sql IMMUTABLE;
+
+DROP TABLE task_stats_backfill;
@@ -0,0 +1,91 @@
+CREATE TABLE IF NOT EXISTS task_stats (
+    kind VARCHAR(20) NOT NULL,
+    key TEXT NOT NULL DEFAULT '',
+    total INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    high_priority INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, key)
+);
+
+CREATE TABLE IF NOT EXISTS task_stats_backfill (
+    last_id INTEGER NOT NULL,
+    cutoff_id INTEGER NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION task_stats_counted(p_id INTEGER) RETURNS boolean AS $$
+    SELECT NOT EXISTS (
+        SELECT 1 FROM task_stats_backfill WHERE p_id > last_id AND p_id <= cutoff_id
+    );
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION apply_task_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT kind, key, -SUM(total), -SUM(completed), -SUM(high_priority)
+        FROM (
+            SELECT 'total' AS kind, '' AS key, 1 AS total, completed::int AS completed,
+                   (priority = 'high' AND NOT completed)::int AS high_priority
+            FROM old_rows WHERE task_stats_counted(id)
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM old_rows WHERE task_stats_counted(id)
+            UNION ALL
+            SELECT 'project', COALESCE(project, ''), 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM old_rows WHERE task_stats_counted(id)
+            UNION ALL
+            SELECT 'tag', tag, 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM old_rows CROSS JOIN LATERAL unnest(tags) AS tag WHERE task_stats_counted(id)
+        ) delta
+        GROUP BY kind, key
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT kind, key, SUM(total), SUM(completed), SUM(high_priority)
+        FROM (
+            SELECT 'total' AS kind, '' AS key, 1 AS total, completed::int AS completed,
+                   (priority = 'high' AND NOT completed)::int AS high_priority
+            FROM new_rows WHERE task_stats_counted(id)
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM new_rows WHERE task_stats_counted(id)
+            UNION ALL
+            SELECT 'project', COALESCE(project, ''), 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM new_rows WHERE task_stats_counted(id)
+            UNION ALL
+            SELECT 'tag', tag, 1, completed::int, (priority = 'high' AND NOT completed)::int
+            FROM new_rows CROSS JOIN LATERAL unnest(tags) AS tag WHERE task_stats_counted(id)
+        ) delta
+        GROUP BY kind, key
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_task_stats_insert ON tasks;
+CREATE TRIGGER trg_task_stats_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_task_stats();
+
+DROP TRIGGER IF EXISTS trg_task_stats_update ON tasks;
+CREATE TRIGGER trg_task_stats_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_task_stats();
+
+DROP TRIGGER IF EXISTS trg_task_stats_delete ON tasks;
+CREATE TRIGGER trg_task_stats_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_task_stats();
+
+INSERT INTO task_stats_backfill (last_id, cutoff_id)
+SELECT 0, COALESCE(MAX(id), 0) FROM tasks;
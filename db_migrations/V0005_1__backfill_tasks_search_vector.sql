@@ -0,0 +1,21 @@
+CREATE OR REPLACE PROCEDURE backfill_tasks_search_vector(batch_size INTEGER) AS $$
+DECLARE
+    last_id INTEGER := 0;
+    max_id INTEGER;
+BEGIN
+    SELECT COALESCE(MAX(id), 0) INTO max_id FROM tasks;
+    WHILE last_id < max_id LOOP
+        UPDATE tasks
+        SET search_vector =
+            setweight(to_tsvector('russian', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('russian', COALESCE(description, '')), 'B')
+        WHERE id > last_id AND id <= last_id + batch_size AND search_vector IS NULL;
+        last_id := last_id + batch_size;
+        COMMIT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CALL backfill_tasks_search_vector(5000);
+
+DROP PROCEDURE backfill_tasks_search_vector(INTEGER);
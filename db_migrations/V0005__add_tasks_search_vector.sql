@@ -0,0 +1,16 @@
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION tasks_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('russian', COALESCE(NEW.description, '')), 'B');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_search_vector ON tasks;
+CREATE TRIGGER trg_tasks_search_vector BEFORE INSERT OR UPDATE OF title, description ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_search_vector_update();
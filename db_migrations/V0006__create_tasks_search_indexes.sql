@@ -0,0 +1,2 @@
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_search_vector ON tasks USING GIN(search_vector);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_search_trgm ON tasks USING GIN((title || ' ' || COALESCE(description, '')) gin_trgm_ops);
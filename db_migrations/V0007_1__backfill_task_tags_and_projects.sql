@@ -0,0 +1,53 @@
+CREATE OR REPLACE PROCEDURE backfill_task_tags_and_projects(batch_size INTEGER) AS $$
+DECLARE
+    last_id INTEGER := 0;
+    max_id INTEGER;
+BEGIN
+    SELECT COALESCE(MAX(id), 0) INTO max_id FROM tasks;
+    WHILE last_id < max_id LOOP
+        PERFORM 1 FROM tasks WHERE id > last_id AND id <= last_id + batch_size FOR UPDATE;
+
+        INSERT INTO tags (name)
+        SELECT DISTINCT tag_name FROM tasks CROSS JOIN LATERAL unnest(tags) AS tag_name
+        WHERE id > last_id AND id <= last_id + batch_size AND tag_name <> ''
+        ON CONFLICT (name) DO NOTHING;
+
+        INSERT INTO projects (name)
+        SELECT DISTINCT project FROM tasks
+        WHERE id > last_id AND id <= last_id + batch_size AND project <> ''
+        ON CONFLICT (name) DO NOTHING;
+
+        WITH linked AS (
+            INSERT INTO task_tags (task_id, tag_id)
+            SELECT DISTINCT t.id, g.id
+            FROM tasks t CROSS JOIN LATERAL unnest(t.tags) AS tag_name
+            JOIN tags g ON g.name = tag_name
+            WHERE t.id > last_id AND t.id <= last_id + batch_size
+            ON CONFLICT DO NOTHING
+            RETURNING task_id, tag_id
+        )
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT 'tag', l.tag_id::text, COUNT(*),
+               COUNT(*) FILTER (WHERE t.completed),
+               COUNT(*) FILTER (WHERE t.priority = 'high' AND NOT t.completed)
+        FROM linked l JOIN tasks t ON t.id = l.task_id
+        GROUP BY l.tag_id
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+
+        UPDATE tasks t SET project_id = p.id
+        FROM projects p
+        WHERE p.name = t.project AND t.project_id IS NULL
+          AND t.id > last_id AND t.id <= last_id + batch_size;
+
+        last_id := last_id + batch_size;
+        COMMIT;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+CALL backfill_task_tags_and_projects(5000);
+
+DROP PROCEDURE backfill_task_tags_and_projects(INTEGER);
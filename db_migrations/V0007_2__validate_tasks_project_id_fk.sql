@@ -0,0 +1 @@
+ALTER TABLE tasks VALIDATE CONSTRAINT fk_tasks_project_id;
@@ -0,0 +1,153 @@
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    tag_id INTEGER NOT NULL REFERENCES tags(id) ON DELETE CASCADE,
+    PRIMARY KEY (task_id, tag_id)
+);
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS project_id INTEGER;
+ALTER TABLE tasks ADD CONSTRAINT fk_tasks_project_id
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE SET NULL NOT VALID;
+
+CREATE OR REPLACE FUNCTION sync_task_project() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.project IS NOT DISTINCT FROM OLD.project THEN
+        RETURN NEW;
+    END IF;
+    IF COALESCE(NEW.project, '') = '' THEN
+        NEW.project_id := NULL;
+        RETURN NEW;
+    END IF;
+    INSERT INTO projects (name) VALUES (NEW.project) ON CONFLICT (name) DO NOTHING;
+    SELECT id INTO NEW.project_id FROM projects WHERE name = NEW.project;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION apply_task_tag_stats(p_task_id INTEGER, p_sign INTEGER, p_completed BOOLEAN, p_priority TEXT)
+RETURNS void AS $$
+    INSERT INTO task_stats (kind, key, total, completed, high_priority)
+    SELECT 'tag', tag_id::text, p_sign,
+           p_sign * COALESCE(p_completed, FALSE)::int,
+           p_sign * COALESCE(p_priority = 'high' AND NOT p_completed, FALSE)::int
+    FROM task_tags
+    WHERE task_id = p_task_id
+    ON CONFLICT (kind, key) DO UPDATE SET
+        total = task_stats.total + EXCLUDED.total,
+        completed = task_stats.completed + EXCLUDED.completed,
+        high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION sync_task_tags() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_task_tag_stats(OLD.id, -1, OLD.completed, OLD.priority);
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+
+    IF TG_OP = 'INSERT' OR NEW.tags IS DISTINCT FROM OLD.tags THEN
+        INSERT INTO tags (name)
+        SELECT DISTINCT tag_name FROM unnest(NEW.tags) AS tag_name WHERE tag_name <> ''
+        ON CONFLICT (name) DO NOTHING;
+        DELETE FROM task_tags
+        WHERE task_id = NEW.id
+          AND tag_id NOT IN (SELECT id FROM tags WHERE name = ANY(COALESCE(NEW.tags, '{}')));
+        INSERT INTO task_tags (task_id, tag_id)
+        SELECT NEW.id, id FROM tags WHERE name = ANY(NEW.tags)
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    PERFORM apply_task_tag_stats(NEW.id, 1, NEW.completed, NEW.priority);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION apply_task_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT kind, key, -SUM(total), -SUM(completed), -SUM(high_priority)
+        FROM (
+            SELECT 'total' AS kind, '' AS key, 1 AS total, COALESCE(completed, FALSE)::int AS completed,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int AS high_priority
+            FROM old_rows
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM old_rows
+            UNION ALL
+            SELECT CASE WHEN project_id IS NULL THEN 'project' ELSE 'project_id' END,
+                   COALESCE(project_id::text, project, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM old_rows
+        ) delta
+        GROUP BY kind, key
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT kind, key, SUM(total), SUM(completed), SUM(high_priority)
+        FROM (
+            SELECT 'total' AS kind, '' AS key, 1 AS total, COALESCE(completed, FALSE)::int AS completed,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int AS high_priority
+            FROM new_rows
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM new_rows
+            UNION ALL
+            SELECT CASE WHEN project_id IS NULL THEN 'project' ELSE 'project_id' END,
+                   COALESCE(project_id::text, project, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM new_rows
+        ) delta
+        GROUP BY kind, key
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP FUNCTION IF EXISTS task_stats_counted(INTEGER);
+
+CREATE OR REPLACE FUNCTION drop_tag_stats() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM task_stats WHERE kind = 'tag' AND key = OLD.id::text;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_project_id ON tasks;
+CREATE TRIGGER trg_tasks_project_id BEFORE INSERT OR UPDATE OF project ON tasks
+    FOR EACH ROW EXECUTE FUNCTION sync_task_project();
+
+DROP TRIGGER IF EXISTS trg_tasks_tags_link ON tasks;
+CREATE TRIGGER trg_tasks_tags_link AFTER INSERT ON tasks
+    FOR EACH ROW EXECUTE FUNCTION sync_task_tags();
+
+DROP TRIGGER IF EXISTS trg_tasks_tags_relink ON tasks;
+CREATE TRIGGER trg_tasks_tags_relink AFTER UPDATE ON tasks
+    FOR EACH ROW
+    WHEN (OLD.tags IS DISTINCT FROM NEW.tags
+          OR OLD.completed IS DISTINCT FROM NEW.completed
+          OR OLD.priority IS DISTINCT FROM NEW.priority)
+    EXECUTE FUNCTION sync_task_tags();
+
+DROP TRIGGER IF EXISTS trg_tasks_tags_unlink ON tasks;
+CREATE TRIGGER trg_tasks_tags_unlink BEFORE DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION sync_task_tags();
+
+DROP TRIGGER IF EXISTS trg_tags_drop_stats ON tags;
+CREATE TRIGGER trg_tags_drop_stats AFTER DELETE ON tags
+    FOR EACH ROW EXECUTE FUNCTION drop_tag_stats();
+
+DELETE FROM task_stats WHERE kind = 'tag';
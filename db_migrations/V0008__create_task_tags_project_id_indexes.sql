@@ -0,0 +1,2 @@
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_tags_tag_id ON task_tags(tag_id, task_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_project_id ON tasks(project_id, created_at DESC, id DESC);
@@ -0,0 +1,31 @@
+CREATE TABLE IF NOT EXISTS table_versions (
+    name VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO table_versions (name)
+VALUES ('tasks'), ('task_tags'), ('tags'), ('projects')
+ON CONFLICT (name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_version ON tasks;
+CREATE TRIGGER trg_tasks_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_task_tags_version ON task_tags;
+CREATE TRIGGER trg_task_tags_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON task_tags
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_tags_version ON tags;
+CREATE TRIGGER trg_tags_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tags
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+
+DROP TRIGGER IF EXISTS trg_projects_version ON projects;
+CREATE TRIGGER trg_projects_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON projects
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
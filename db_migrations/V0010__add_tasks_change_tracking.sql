@@ -0,0 +1,88 @@
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS change_xid xid8;
+
+CREATE OR REPLACE FUNCTION tasks_change_xid_update() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_change_xid ON tasks;
+CREATE TRIGGER trg_tasks_change_xid BEFORE INSERT OR UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_change_xid_update();
+
+CREATE TABLE IF NOT EXISTS task_tombstones (
+    task_id INTEGER NOT NULL,
+    deleted_xid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_tombstones_deleted_xid ON task_tombstones(deleted_xid);
+CREATE INDEX IF NOT EXISTS idx_task_tombstones_deleted_at ON task_tombstones(deleted_at);
+
+CREATE OR REPLACE FUNCTION record_task_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO task_tombstones (task_id) SELECT id FROM old_rows;
+    DELETE FROM task_tombstones WHERE deleted_at < CURRENT_TIMESTAMP - INTERVAL '30 days';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_tombstones ON tasks;
+CREATE TRIGGER trg_tasks_tombstones AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_task_tombstones();
+
+CREATE OR REPLACE FUNCTION sync_task_project() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.project IS NOT DISTINCT FROM OLD.project THEN
+        RETURN NEW;
+    END IF;
+    IF COALESCE(NEW.project, '') = '' THEN
+        NEW.project_id := NULL;
+        RETURN NEW;
+    END IF;
+    SELECT id INTO NEW.project_id FROM projects WHERE name = NEW.project;
+    IF NEW.project_id IS NULL THEN
+        INSERT INTO projects (name) VALUES (NEW.project) ON CONFLICT (name) DO NOTHING;
+        SELECT id INTO NEW.project_id FROM projects WHERE name = NEW.project;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_task_tags() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_task_tag_stats(OLD.id, -1, OLD.completed, OLD.priority);
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+
+    IF TG_OP = 'INSERT' OR NEW.tags IS DISTINCT FROM OLD.tags THEN
+        IF EXISTS (
+            SELECT 1 FROM unnest(NEW.tags) AS tag_name
+            WHERE tag_name <> '' AND NOT EXISTS (SELECT 1 FROM tags WHERE name = tag_name)
+        ) THEN
+            INSERT INTO tags (name)
+            SELECT DISTINCT tag_name FROM unnest(NEW.tags) AS tag_name WHERE tag_name <> ''
+            ON CONFLICT (name) DO NOTHING;
+        END IF;
+        IF EXISTS (
+            SELECT 1 FROM task_tags tt JOIN tags g ON g.id = tt.tag_id
+            WHERE tt.task_id = NEW.id AND NOT g.name = ANY(COALESCE(NEW.tags, '{}'))
+        ) THEN
+            DELETE FROM task_tags
+            WHERE task_id = NEW.id
+              AND tag_id NOT IN (SELECT id FROM tags WHERE name = ANY(COALESCE(NEW.tags, '{}')));
+        END IF;
+        INSERT INTO task_tags (task_id, tag_id)
+        SELECT NEW.id, id FROM tags WHERE name = ANY(NEW.tags)
+        ON CONFLICT DO NOTHING;
+    END IF;
+
+    PERFORM apply_task_tag_stats(NEW.id, 1, NEW.completed, NEW.priority);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
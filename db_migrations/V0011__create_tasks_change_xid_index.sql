@@ -0,0 +1 @@
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_change_xid ON tasks(change_xid);
@@ -0,0 +1,243 @@
+ALTER TABLE task_tags DROP CONSTRAINT IF EXISTS task_tags_task_id_fkey;
+ALTER TABLE task_tags ADD CONSTRAINT task_tags_task_id_fkey
+    FOREIGN KEY (task_id) REFERENCES tasks(id)
+    DEFERRABLE INITIALLY DEFERRED NOT VALID;
+ALTER TABLE task_tags VALIDATE CONSTRAINT task_tags_task_id_fkey;
+
+CREATE OR REPLACE FUNCTION link_inserted_task_tags() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM new_rows n CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        WHERE tag_name <> '' AND NOT EXISTS (SELECT 1 FROM tags WHERE name = tag_name)
+    ) THEN
+        INSERT INTO tags (name)
+        SELECT DISTINCT tag_name FROM new_rows n CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        WHERE tag_name <> ''
+        ON CONFLICT (name) DO NOTHING;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM new_rows WHERE cardinality(tags) > 0) THEN
+        WITH added AS (
+            INSERT INTO task_tags (task_id, tag_id)
+            SELECT DISTINCT n.id, g.id
+            FROM new_rows n CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+            JOIN tags g ON g.name = tag_name
+            ON CONFLICT DO NOTHING
+            RETURNING task_id, tag_id
+        )
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT 'tag', a.tag_id::text, COUNT(*),
+               COUNT(*) FILTER (WHERE n.completed),
+               COUNT(*) FILTER (WHERE n.priority = 'high' AND NOT n.completed)
+        FROM added a JOIN new_rows n ON n.id = a.task_id
+        GROUP BY a.tag_id
+        ORDER BY a.tag_id::text
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION relink_updated_task_tags() RETURNS trigger AS $$
+DECLARE
+    changed INTEGER[];
+    retagged INTEGER[];
+BEGIN
+    SELECT array_agg(n.id), array_agg(n.id) FILTER (WHERE n.tags IS DISTINCT FROM o.tags)
+    INTO changed, retagged
+    FROM new_rows n JOIN old_rows o ON o.id = n.id
+    WHERE n.tags IS DISTINCT FROM o.tags
+       OR n.completed IS DISTINCT FROM o.completed
+       OR n.priority IS DISTINCT FROM o.priority;
+    IF changed IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM unnest(retagged) AS r(id)
+        JOIN new_rows n ON n.id = r.id
+        CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        WHERE tag_name <> '' AND NOT EXISTS (SELECT 1 FROM tags WHERE name = tag_name)
+    ) THEN
+        INSERT INTO tags (name)
+        SELECT DISTINCT tag_name
+        FROM unnest(retagged) AS r(id)
+        JOIN new_rows n ON n.id = r.id
+        CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        WHERE tag_name <> ''
+        ON CONFLICT (name) DO NOTHING;
+    END IF;
+
+    WITH old_links AS (
+        SELECT tt.task_id, tt.tag_id
+        FROM unnest(changed) AS c(id) JOIN task_tags tt ON tt.task_id = c.id
+    ), removed AS (
+        DELETE FROM task_tags tt
+        USING unnest(retagged) AS r(id), new_rows n, tags g
+        WHERE n.id = r.id AND tt.task_id = r.id AND g.id = tt.tag_id
+          AND NOT g.name = ANY(COALESCE(n.tags, '{}'))
+        RETURNING tt.task_id, tt.tag_id
+    ), added AS (
+        INSERT INTO task_tags (task_id, tag_id)
+        SELECT DISTINCT n.id, g.id
+        FROM unnest(retagged) AS r(id)
+        JOIN new_rows n ON n.id = r.id
+        CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        JOIN tags g ON g.name = tag_name
+        ON CONFLICT DO NOTHING
+        RETURNING task_id, tag_id
+    ), new_links AS (
+        (SELECT task_id, tag_id FROM old_links EXCEPT SELECT task_id, tag_id FROM removed)
+        UNION ALL
+        SELECT task_id, tag_id FROM added
+    ), delta AS (
+        SELECT l.tag_id, -1 AS total, -COALESCE(o.completed, FALSE)::int AS completed,
+               -COALESCE(o.priority = 'high' AND NOT o.completed, FALSE)::int AS high_priority
+        FROM old_links l JOIN old_rows o ON o.id = l.task_id
+        UNION ALL
+        SELECT l.tag_id, 1, COALESCE(n.completed, FALSE)::int,
+               COALESCE(n.priority = 'high' AND NOT n.completed, FALSE)::int
+        FROM new_links l JOIN new_rows n ON n.id = l.task_id
+    )
+    INSERT INTO task_stats (kind, key, total, completed, high_priority)
+    SELECT 'tag', tag_id::text, SUM(total), SUM(completed), SUM(high_priority)
+    FROM delta
+    GROUP BY tag_id
+    HAVING SUM(total) <> 0 OR SUM(completed) <> 0 OR SUM(high_priority) <> 0
+    ORDER BY tag_id::text
+    ON CONFLICT (kind, key) DO UPDATE SET
+        total = task_stats.total + EXCLUDED.total,
+        completed = task_stats.completed + EXCLUDED.completed,
+        high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION unlink_deleted_task_tags() RETURNS trigger AS $$
+BEGIN
+    WITH removed AS (
+        DELETE FROM task_tags tt
+        USING old_rows o
+        WHERE tt.task_id = o.id
+        RETURNING tt.tag_id, o.completed, o.priority
+    )
+    INSERT INTO task_stats (kind, key, total, completed, high_priority)
+    SELECT 'tag', tag_id::text, -COUNT(*),
+           -COUNT(*) FILTER (WHERE completed),
+           -COUNT(*) FILTER (WHERE priority = 'high' AND NOT completed)
+    FROM removed
+    GROUP BY tag_id
+    ORDER BY tag_id::text
+    ON CONFLICT (kind, key) DO UPDATE SET
+        total = task_stats.total + EXCLUDED.total,
+        completed = task_stats.completed + EXCLUDED.completed,
+        high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION apply_task_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT kind, key, -SUM(total), -SUM(completed), -SUM(high_priority)
+        FROM (
+            SELECT 'total' AS kind, '' AS key, 1 AS total, COALESCE(completed, FALSE)::int AS completed,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int AS high_priority
+            FROM old_rows
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM old_rows
+            UNION ALL
+            SELECT CASE WHEN project_id IS NULL THEN 'project' ELSE 'project_id' END,
+                   COALESCE(project_id::text, project, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM old_rows
+        ) delta
+        GROUP BY kind, key
+        ORDER BY kind, key
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT kind, key, SUM(total), SUM(completed), SUM(high_priority)
+        FROM (
+            SELECT 'total' AS kind, '' AS key, 1 AS total, COALESCE(completed, FALSE)::int AS completed,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int AS high_priority
+            FROM new_rows
+            UNION ALL
+            SELECT 'category', COALESCE(category, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM new_rows
+            UNION ALL
+            SELECT CASE WHEN project_id IS NULL THEN 'project' ELSE 'project_id' END,
+                   COALESCE(project_id::text, project, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM new_rows
+        ) delta
+        GROUP BY kind, key
+        ORDER BY kind, key
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    ELSE
+        WITH changed_rows AS (
+            SELECT -1 AS sign, * FROM old_rows
+            UNION ALL
+            SELECT 1, * FROM new_rows
+        )
+        INSERT INTO task_stats (kind, key, total, completed, high_priority)
+        SELECT kind, key, SUM(sign * total), SUM(sign * completed), SUM(sign * high_priority)
+        FROM (
+            SELECT sign, 'total' AS kind, '' AS key, 1 AS total, COALESCE(completed, FALSE)::int AS completed,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int AS high_priority
+            FROM changed_rows
+            UNION ALL
+            SELECT sign, 'category', COALESCE(category, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM changed_rows
+            UNION ALL
+            SELECT sign, CASE WHEN project_id IS NULL THEN 'project' ELSE 'project_id' END,
+                   COALESCE(project_id::text, project, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM changed_rows
+        ) delta
+        GROUP BY kind, key
+        HAVING SUM(sign * total) <> 0 OR SUM(sign * completed) <> 0 OR SUM(sign * high_priority) <> 0
+        ORDER BY kind, key
+        ON CONFLICT (kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_tags_link ON tasks;
+CREATE TRIGGER trg_tasks_tags_link AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION link_inserted_task_tags();
+
+DROP TRIGGER IF EXISTS trg_tasks_tags_relink ON tasks;
+CREATE TRIGGER trg_tasks_tags_relink AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION relink_updated_task_tags();
+
+DROP TRIGGER IF EXISTS trg_tasks_tags_unlink ON tasks;
+CREATE TRIGGER trg_tasks_tags_unlink AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION unlink_deleted_task_tags();
+
+DROP FUNCTION IF EXISTS sync_task_tags();
+DROP FUNCTION IF EXISTS apply_task_tag_stats(INTEGER, INTEGER, BOOLEAN, TEXT);
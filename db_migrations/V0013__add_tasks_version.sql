@@ -0,0 +1,17 @@
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE FUNCTION tasks_track_change() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id();
+    IF TG_OP = 'UPDATE' THEN
+        NEW.version := OLD.version + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_change_xid ON tasks;
+CREATE TRIGGER trg_tasks_change_xid BEFORE INSERT OR UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_track_change();
+
+DROP FUNCTION IF EXISTS tasks_change_xid_update();
@@ -0,0 +1,4 @@
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_due_date_id ON tasks(due_date, id) WHERE due_date IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_open_due_date ON tasks(due_date, id) WHERE NOT completed AND due_date IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_open_priority ON tasks(priority, created_at DESC, id DESC) WHERE NOT completed;
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_due_date;
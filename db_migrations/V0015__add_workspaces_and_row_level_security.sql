@@ -0,0 +1,320 @@
+CREATE TABLE IF NOT EXISTS workspaces (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO workspaces (id, name) VALUES (1, 'Default') ON CONFLICT (id) DO NOTHING;
+SELECT setval(pg_get_serial_sequence('workspaces', 'id'), GREATEST((SELECT MAX(id) FROM workspaces), 1));
+
+CREATE OR REPLACE FUNCTION current_workspace_id() RETURNS INTEGER AS $$
+    SELECT NULLIF(current_setting('app.workspace_id', true), '')::int
+$$ LANGUAGE sql STABLE;
+
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS workspace_id INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE tags ADD COLUMN IF NOT EXISTS workspace_id INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS workspace_id INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE task_stats ADD COLUMN IF NOT EXISTS workspace_id INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE task_tombstones ADD COLUMN IF NOT EXISTS workspace_id INTEGER NOT NULL DEFAULT 1;
+
+ALTER TABLE tasks ALTER COLUMN workspace_id SET DEFAULT current_workspace_id();
+ALTER TABLE tags ALTER COLUMN workspace_id SET DEFAULT current_workspace_id();
+ALTER TABLE projects ALTER COLUMN workspace_id SET DEFAULT current_workspace_id();
+ALTER TABLE task_stats ALTER COLUMN workspace_id DROP DEFAULT;
+ALTER TABLE task_tombstones ALTER COLUMN workspace_id DROP DEFAULT;
+
+ALTER TABLE tasks ADD CONSTRAINT fk_tasks_workspace_id FOREIGN KEY (workspace_id) REFERENCES workspaces(id) NOT VALID;
+ALTER TABLE tasks VALIDATE CONSTRAINT fk_tasks_workspace_id;
+ALTER TABLE tags ADD CONSTRAINT fk_tags_workspace_id FOREIGN KEY (workspace_id) REFERENCES workspaces(id);
+ALTER TABLE projects ADD CONSTRAINT fk_projects_workspace_id FOREIGN KEY (workspace_id) REFERENCES workspaces(id);
+
+ALTER TABLE tags ADD CONSTRAINT tags_workspace_id_name_key UNIQUE (workspace_id, name);
+ALTER TABLE tags DROP CONSTRAINT IF EXISTS tags_name_key;
+ALTER TABLE projects ADD CONSTRAINT projects_workspace_id_name_key UNIQUE (workspace_id, name);
+ALTER TABLE projects DROP CONSTRAINT IF EXISTS projects_name_key;
+
+ALTER TABLE task_stats DROP CONSTRAINT task_stats_pkey;
+ALTER TABLE task_stats ADD PRIMARY KEY (workspace_id, kind, key);
+
+CREATE OR REPLACE FUNCTION sync_task_project() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.project IS NOT DISTINCT FROM OLD.project THEN
+        RETURN NEW;
+    END IF;
+    IF COALESCE(NEW.project, '') = '' THEN
+        NEW.project_id := NULL;
+        RETURN NEW;
+    END IF;
+    SELECT id INTO NEW.project_id FROM projects WHERE workspace_id = NEW.workspace_id AND name = NEW.project;
+    IF NEW.project_id IS NULL THEN
+        INSERT INTO projects (workspace_id, name) VALUES (NEW.workspace_id, NEW.project)
+        ON CONFLICT (workspace_id, name) DO NOTHING;
+        SELECT id INTO NEW.project_id FROM projects WHERE workspace_id = NEW.workspace_id AND name = NEW.project;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION apply_task_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO task_stats (workspace_id, kind, key, total, completed, high_priority)
+        SELECT workspace_id, kind, key, -SUM(total), -SUM(completed), -SUM(high_priority)
+        FROM (
+            SELECT workspace_id, 'total' AS kind, '' AS key, 1 AS total, COALESCE(completed, FALSE)::int AS completed,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int AS high_priority
+            FROM old_rows
+            UNION ALL
+            SELECT workspace_id, 'category', COALESCE(category, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM old_rows
+            UNION ALL
+            SELECT workspace_id, CASE WHEN project_id IS NULL THEN 'project' ELSE 'project_id' END,
+                   COALESCE(project_id::text, project, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM old_rows
+        ) delta
+        GROUP BY workspace_id, kind, key
+        ORDER BY workspace_id, kind, key
+        ON CONFLICT (workspace_id, kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO task_stats (workspace_id, kind, key, total, completed, high_priority)
+        SELECT workspace_id, kind, key, SUM(total), SUM(completed), SUM(high_priority)
+        FROM (
+            SELECT workspace_id, 'total' AS kind, '' AS key, 1 AS total, COALESCE(completed, FALSE)::int AS completed,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int AS high_priority
+            FROM new_rows
+            UNION ALL
+            SELECT workspace_id, 'category', COALESCE(category, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM new_rows
+            UNION ALL
+            SELECT workspace_id, CASE WHEN project_id IS NULL THEN 'project' ELSE 'project_id' END,
+                   COALESCE(project_id::text, project, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM new_rows
+        ) delta
+        GROUP BY workspace_id, kind, key
+        ORDER BY workspace_id, kind, key
+        ON CONFLICT (workspace_id, kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    ELSE
+        WITH changed_rows AS (
+            SELECT -1 AS sign, * FROM old_rows
+            UNION ALL
+            SELECT 1, * FROM new_rows
+        )
+        INSERT INTO task_stats (workspace_id, kind, key, total, completed, high_priority)
+        SELECT workspace_id, kind, key, SUM(sign * total), SUM(sign * completed), SUM(sign * high_priority)
+        FROM (
+            SELECT workspace_id, sign, 'total' AS kind, '' AS key, 1 AS total, COALESCE(completed, FALSE)::int AS completed,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int AS high_priority
+            FROM changed_rows
+            UNION ALL
+            SELECT workspace_id, sign, 'category', COALESCE(category, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM changed_rows
+            UNION ALL
+            SELECT workspace_id, sign, CASE WHEN project_id IS NULL THEN 'project' ELSE 'project_id' END,
+                   COALESCE(project_id::text, project, ''), 1, COALESCE(completed, FALSE)::int,
+                   COALESCE(priority = 'high' AND NOT completed, FALSE)::int
+            FROM changed_rows
+        ) delta
+        GROUP BY workspace_id, kind, key
+        HAVING SUM(sign * total) <> 0 OR SUM(sign * completed) <> 0 OR SUM(sign * high_priority) <> 0
+        ORDER BY workspace_id, kind, key
+        ON CONFLICT (workspace_id, kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION link_inserted_task_tags() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM new_rows n CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        WHERE tag_name <> ''
+          AND NOT EXISTS (SELECT 1 FROM tags WHERE workspace_id = n.workspace_id AND name = tag_name)
+    ) THEN
+        INSERT INTO tags (workspace_id, name)
+        SELECT DISTINCT n.workspace_id, tag_name FROM new_rows n CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        WHERE tag_name <> ''
+        ON CONFLICT (workspace_id, name) DO NOTHING;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM new_rows WHERE cardinality(tags) > 0) THEN
+        WITH added AS (
+            INSERT INTO task_tags (task_id, tag_id)
+            SELECT DISTINCT n.id, g.id
+            FROM new_rows n CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+            JOIN tags g ON g.workspace_id = n.workspace_id AND g.name = tag_name
+            ON CONFLICT DO NOTHING
+            RETURNING task_id, tag_id
+        )
+        INSERT INTO task_stats (workspace_id, kind, key, total, completed, high_priority)
+        SELECT n.workspace_id, 'tag', a.tag_id::text, COUNT(*),
+               COUNT(*) FILTER (WHERE n.completed),
+               COUNT(*) FILTER (WHERE n.priority = 'high' AND NOT n.completed)
+        FROM added a JOIN new_rows n ON n.id = a.task_id
+        GROUP BY n.workspace_id, a.tag_id
+        ORDER BY n.workspace_id, a.tag_id::text
+        ON CONFLICT (workspace_id, kind, key) DO UPDATE SET
+            total = task_stats.total + EXCLUDED.total,
+            completed = task_stats.completed + EXCLUDED.completed,
+            high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION relink_updated_task_tags() RETURNS trigger AS $$
+DECLARE
+    changed INTEGER[];
+    retagged INTEGER[];
+BEGIN
+    SELECT array_agg(n.id), array_agg(n.id) FILTER (WHERE n.tags IS DISTINCT FROM o.tags)
+    INTO changed, retagged
+    FROM new_rows n JOIN old_rows o ON o.id = n.id
+    WHERE n.tags IS DISTINCT FROM o.tags
+       OR n.completed IS DISTINCT FROM o.completed
+       OR n.priority IS DISTINCT FROM o.priority;
+    IF changed IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM unnest(retagged) AS r(id)
+        JOIN new_rows n ON n.id = r.id
+        CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        WHERE tag_name <> ''
+          AND NOT EXISTS (SELECT 1 FROM tags WHERE workspace_id = n.workspace_id AND name = tag_name)
+    ) THEN
+        INSERT INTO tags (workspace_id, name)
+        SELECT DISTINCT n.workspace_id, tag_name
+        FROM unnest(retagged) AS r(id)
+        JOIN new_rows n ON n.id = r.id
+        CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        WHERE tag_name <> ''
+        ON CONFLICT (workspace_id, name) DO NOTHING;
+    END IF;
+
+    WITH old_links AS (
+        SELECT tt.task_id, tt.tag_id
+        FROM unnest(changed) AS c(id) JOIN task_tags tt ON tt.task_id = c.id
+    ), removed AS (
+        DELETE FROM task_tags tt
+        USING unnest(retagged) AS r(id), new_rows n, tags g
+        WHERE n.id = r.id AND tt.task_id = r.id AND g.id = tt.tag_id
+          AND NOT g.name = ANY(COALESCE(n.tags, '{}'))
+        RETURNING tt.task_id, tt.tag_id
+    ), added AS (
+        INSERT INTO task_tags (task_id, tag_id)
+        SELECT DISTINCT n.id, g.id
+        FROM unnest(retagged) AS r(id)
+        JOIN new_rows n ON n.id = r.id
+        CROSS JOIN LATERAL unnest(n.tags) AS tag_name
+        JOIN tags g ON g.workspace_id = n.workspace_id AND g.name = tag_name
+        ON CONFLICT DO NOTHING
+        RETURNING task_id, tag_id
+    ), new_links AS (
+        (SELECT task_id, tag_id FROM old_links EXCEPT SELECT task_id, tag_id FROM removed)
+        UNION ALL
+        SELECT task_id, tag_id FROM added
+    ), delta AS (
+        SELECT o.workspace_id, l.tag_id, -1 AS total, -COALESCE(o.completed, FALSE)::int AS completed,
+               -COALESCE(o.priority = 'high' AND NOT o.completed, FALSE)::int AS high_priority
+        FROM old_links l JOIN old_rows o ON o.id = l.task_id
+        UNION ALL
+        SELECT n.workspace_id, l.tag_id, 1, COALESCE(n.completed, FALSE)::int,
+               COALESCE(n.priority = 'high' AND NOT n.completed, FALSE)::int
+        FROM new_links l JOIN new_rows n ON n.id = l.task_id
+    )
+    INSERT INTO task_stats (workspace_id, kind, key, total, completed, high_priority)
+    SELECT workspace_id, 'tag', tag_id::text, SUM(total), SUM(completed), SUM(high_priority)
+    FROM delta
+    GROUP BY workspace_id, tag_id
+    HAVING SUM(total) <> 0 OR SUM(completed) <> 0 OR SUM(high_priority) <> 0
+    ORDER BY workspace_id, tag_id::text
+    ON CONFLICT (workspace_id, kind, key) DO UPDATE SET
+        total = task_stats.total + EXCLUDED.total,
+        completed = task_stats.completed + EXCLUDED.completed,
+        high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION unlink_deleted_task_tags() RETURNS trigger AS $$
+BEGIN
+    WITH removed AS (
+        DELETE FROM task_tags tt
+        USING old_rows o
+        WHERE tt.task_id = o.id
+        RETURNING o.workspace_id, tt.tag_id, o.completed, o.priority
+    )
+    INSERT INTO task_stats (workspace_id, kind, key, total, completed, high_priority)
+    SELECT workspace_id, 'tag', tag_id::text, -COUNT(*),
+           -COUNT(*) FILTER (WHERE completed),
+           -COUNT(*) FILTER (WHERE priority = 'high' AND NOT completed)
+    FROM removed
+    GROUP BY workspace_id, tag_id
+    ORDER BY workspace_id, tag_id::text
+    ON CONFLICT (workspace_id, kind, key) DO UPDATE SET
+        total = task_stats.total + EXCLUDED.total,
+        completed = task_stats.completed + EXCLUDED.completed,
+        high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_task_tombstones() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO task_tombstones (workspace_id, task_id) SELECT workspace_id, id FROM old_rows;
+    DELETE FROM task_tombstones WHERE deleted_at < CURRENT_TIMESTAMP - INTERVAL '30 days';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION drop_tag_stats() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM task_stats WHERE workspace_id = OLD.workspace_id AND kind = 'tag' AND key = OLD.id::text;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE tasks ENABLE ROW LEVEL SECURITY;
+ALTER TABLE tasks FORCE ROW LEVEL SECURITY;
+ALTER TABLE tags ENABLE ROW LEVEL SECURITY;
+ALTER TABLE tags FORCE ROW LEVEL SECURITY;
+ALTER TABLE projects ENABLE ROW LEVEL SECURITY;
+ALTER TABLE projects FORCE ROW LEVEL SECURITY;
+ALTER TABLE task_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE task_stats FORCE ROW LEVEL SECURITY;
+ALTER TABLE task_tombstones ENABLE ROW LEVEL SECURITY;
+ALTER TABLE task_tombstones FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS workspace_isolation ON tasks;
+CREATE POLICY workspace_isolation ON tasks
+    USING (workspace_id = current_workspace_id() OR current_setting('app.all_workspaces', true) = 'on');
+DROP POLICY IF EXISTS workspace_isolation ON tags;
+CREATE POLICY workspace_isolation ON tags
+    USING (workspace_id = current_workspace_id() OR current_setting('app.all_workspaces', true) = 'on');
+DROP POLICY IF EXISTS workspace_isolation ON projects;
+CREATE POLICY workspace_isolation ON projects
+    USING (workspace_id = current_workspace_id() OR current_setting('app.all_workspaces', true) = 'on');
+DROP POLICY IF EXISTS workspace_isolation ON task_stats;
+CREATE POLICY workspace_isolation ON task_stats
+    USING (workspace_id = current_workspace_id() OR current_setting('app.all_workspaces', true) = 'on');
+DROP POLICY IF EXISTS workspace_isolation ON task_tombstones;
+CREATE POLICY workspace_isolation ON task_tombstones
+    USING (workspace_id = current_workspace_id() OR current_setting('app.all_workspaces', true) = 'on');
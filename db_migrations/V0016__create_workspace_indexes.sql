@@ -0,0 +1,12 @@
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_workspace_created_at_id ON tasks(workspace_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_workspace_change_xid ON tasks(workspace_id, change_xid);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_workspace_due_date_id ON tasks(workspace_id, due_date, id) WHERE due_date IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_workspace_open_due_date ON tasks(workspace_id, due_date, id) WHERE NOT completed AND due_date IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_workspace_open_priority ON tasks(workspace_id, priority, created_at DESC, id DESC) WHERE NOT completed;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_tombstones_workspace_deleted_xid ON task_tombstones(workspace_id, deleted_xid);
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_created_at_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_change_xid;
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_due_date_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_open_due_date;
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_open_priority;
+DROP INDEX CONCURRENTLY IF EXISTS idx_task_tombstones_deleted_xid;
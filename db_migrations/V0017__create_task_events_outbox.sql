@@ -0,0 +1,50 @@
+CREATE TABLE IF NOT EXISTS task_events (
+    id BIGSERIAL PRIMARY KEY,
+    workspace_id INTEGER NOT NULL,
+    txid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+    op VARCHAR(10) NOT NULL,
+    task_id INTEGER NOT NULL,
+    version INTEGER,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_task_events_workspace_txid_id ON task_events(workspace_id, txid, id);
+CREATE INDEX IF NOT EXISTS idx_task_events_created_at ON task_events(created_at);
+
+CREATE OR REPLACE FUNCTION record_task_events() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO task_events (workspace_id, op, task_id, version)
+        SELECT workspace_id, 'delete', id, version FROM old_rows ORDER BY id;
+        PERFORM pg_notify('task_events', workspace_id::text) FROM (SELECT DISTINCT workspace_id FROM old_rows) w;
+    ELSE
+        INSERT INTO task_events (workspace_id, op, task_id, version)
+        SELECT workspace_id, lower(TG_OP), id, version FROM new_rows ORDER BY id;
+        PERFORM pg_notify('task_events', workspace_id::text) FROM (SELECT DISTINCT workspace_id FROM new_rows) w;
+    END IF;
+    DELETE FROM task_events WHERE created_at < LOCALTIMESTAMP - INTERVAL '7 days';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_events_insert ON tasks;
+CREATE TRIGGER trg_tasks_events_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_task_events();
+
+DROP TRIGGER IF EXISTS trg_tasks_events_update ON tasks;
+CREATE TRIGGER trg_tasks_events_update AFTER UPDATE ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_task_events();
+
+DROP TRIGGER IF EXISTS trg_tasks_events_delete ON tasks;
+CREATE TRIGGER trg_tasks_events_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_task_events();
+
+ALTER TABLE task_events ENABLE ROW LEVEL SECURITY;
+ALTER TABLE task_events FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS workspace_isolation ON task_events;
+CREATE POLICY workspace_isolation ON task_events
+    USING (workspace_id = current_workspace_id() OR current_setting('app.all_workspaces', true) = 'on');
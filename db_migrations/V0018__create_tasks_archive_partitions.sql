@@ -0,0 +1,56 @@
+CREATE TABLE IF NOT EXISTS tasks_archive (
+    id INTEGER NOT NULL,
+    workspace_id INTEGER NOT NULL,
+    title VARCHAR(500) NOT NULL,
+    description TEXT,
+    completed BOOLEAN,
+    priority VARCHAR(20),
+    tags TEXT[] NOT NULL DEFAULT '{}',
+    category VARCHAR(200),
+    project VARCHAR(200),
+    due_date TIMESTAMP,
+    created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP,
+    version INTEGER NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_archive_workspace_created_at_id ON tasks_archive(workspace_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_archive_id ON tasks_archive(id);
+
+CREATE OR REPLACE FUNCTION ensure_tasks_archive_partition(archive_year INTEGER) RETURNS void AS $$
+BEGIN
+    IF to_regclass('tasks_archive_' || archive_year) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF tasks_archive FOR VALUES FROM (%L) TO (%L)',
+            'tasks_archive_' || archive_year, make_date(archive_year, 1, 1), make_date(archive_year + 1, 1, 1)
+        );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION record_task_events() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO task_events (workspace_id, op, task_id, version)
+        SELECT workspace_id,
+               CASE WHEN current_setting('app.archiving', true) = 'on' THEN 'archive' ELSE 'delete' END,
+               id, version
+        FROM old_rows ORDER BY id;
+        PERFORM pg_notify('task_events', workspace_id::text) FROM (SELECT DISTINCT workspace_id FROM old_rows) w;
+    ELSE
+        INSERT INTO task_events (workspace_id, op, task_id, version)
+        SELECT workspace_id, lower(TG_OP), id, version FROM new_rows ORDER BY id;
+        PERFORM pg_notify('task_events', workspace_id::text) FROM (SELECT DISTINCT workspace_id FROM new_rows) w;
+    END IF;
+    DELETE FROM task_events WHERE created_at < LOCALTIMESTAMP - INTERVAL '7 days';
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE tasks_archive ENABLE ROW LEVEL SECURITY;
+ALTER TABLE tasks_archive FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS workspace_isolation ON tasks_archive;
+CREATE POLICY workspace_isolation ON tasks_archive
+    USING (workspace_id = current_workspace_id() OR current_setting('app.all_workspaces', true) = 'on');
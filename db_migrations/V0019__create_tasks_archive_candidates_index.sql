@@ -0,0 +1,2 @@
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_workspace_completed_updated_at ON tasks(workspace_id, updated_at, id) WHERE completed;
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_completed;
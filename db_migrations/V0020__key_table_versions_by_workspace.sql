@@ -0,0 +1,25 @@
+ALTER TABLE table_versions ADD COLUMN IF NOT EXISTS workspace_id INTEGER;
+ALTER TABLE table_versions DROP CONSTRAINT IF EXISTS table_versions_pkey;
+
+INSERT INTO table_versions (workspace_id, name, version)
+SELECT w.id, v.name, v.version
+FROM workspaces w CROSS JOIN table_versions v
+WHERE v.workspace_id IS NULL;
+
+DELETE FROM table_versions WHERE workspace_id IS NULL;
+
+ALTER TABLE table_versions ALTER COLUMN workspace_id SET NOT NULL;
+ALTER TABLE table_versions ADD PRIMARY KEY (workspace_id, name);
+
+CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' OR current_workspace_id() IS NULL THEN
+        UPDATE table_versions SET version = version + 1 WHERE name = TG_TABLE_NAME;
+    ELSE
+        INSERT INTO table_versions (workspace_id, name, version)
+        VALUES (current_workspace_id(), TG_TABLE_NAME, 1)
+        ON CONFLICT (workspace_id, name) DO UPDATE SET version = table_versions.version + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,32 @@
+CREATE OR REPLACE FUNCTION unlink_deleted_task_tags() RETURNS trigger AS $$
+BEGIN
+    PERFORM set_config('app.unlinking_tasks', 'on', true);
+    WITH removed AS (
+        DELETE FROM task_tags tt
+        USING old_rows o
+        WHERE tt.task_id = o.id
+        RETURNING o.workspace_id, tt.tag_id, o.completed, o.priority
+    )
+    INSERT INTO task_stats (workspace_id, kind, key, total, completed, high_priority)
+    SELECT workspace_id, 'tag', tag_id::text, -COUNT(*),
+           -COUNT(*) FILTER (WHERE completed),
+           -COUNT(*) FILTER (WHERE priority = 'high' AND NOT completed)
+    FROM removed
+    GROUP BY workspace_id, tag_id
+    ORDER BY workspace_id, tag_id::text
+    ON CONFLICT (workspace_id, kind, key) DO UPDATE SET
+        total = task_stats.total + EXCLUDED.total,
+        completed = task_stats.completed + EXCLUDED.completed,
+        high_priority = task_stats.high_priority + EXCLUDED.high_priority;
+    PERFORM set_config('app.unlinking_tasks', '', true);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE task_tags ENABLE ROW LEVEL SECURITY;
+ALTER TABLE task_tags FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS workspace_isolation ON task_tags;
+CREATE POLICY workspace_isolation ON task_tags
+    USING (EXISTS (SELECT 1 FROM tasks t WHERE t.id = task_tags.task_id)
+           OR current_setting('app.unlinking_tasks', true) = 'on');
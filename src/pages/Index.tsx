@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { Badge } from '@/components/ui/badge';
@@ -27,6 +27,7 @@ import { Popover, PopoverContent, PopoverTrigger } from '@/components/ui/popover
 import { format } from 'date-fns';
 import { ru } from 'date-fns/locale';
 import { cn } from '@/lib/utils';
+import funcUrls from '../../backend/func2url.json';
 
 type Priority = 'high' | 'medium' | 'low';
 type Task = {
@@ -39,11 +40,63 @@ type Task = {
   category: string;
   dueDate?: Date;
   project: string;
+  version?: number;
 };
 
-const API_URL = 'https://functions.poehali.dev/37060a48-8c02-4a5b-83a8-a95973964e04';
-const TAGS_API_URL = 'https://functions.poehali.dev/dfe17440-9403-49d6-9658-95fa61b61278';
-const PROJECTS_API_URL = 'https://functions.poehali.dev/e9abe4b2-f4aa-4109-abf5-7f9da963ea0b';
+const API_URL = funcUrls.tasks;
+const TAGS_API_URL = funcUrls.tags;
+const PROJECTS_API_URL = funcUrls.projects;
+const WORKSPACE_ID: string = import.meta.env.VITE_WORKSPACE_ID ?? '';
+const NO_PROJECT = 'Без проекта';
+
+const toApiProject = (project?: string) => (project && project !== NO_PROJECT ? project : null);
+
+const toTask = (task: any): Task => ({
+  id: task.id,
+  title: task.title,
+  description: task.description || '',
+  completed: task.completed,
+  priority: task.priority,
+  tags: task.tags || [],
+  category: task.category || 'Без категории',
+  project: task.project || NO_PROJECT,
+  dueDate: task.due_date ? new Date(task.due_date) : undefined,
+  version: task.version,
+});
+
+type Summary = {
+  stats: { total: number; completed: number; active: number; high_priority: number };
+  categories: { category: string | null; total: number; percentage: number }[];
+  tags: { tag: string; total: number; completed: number }[];
+  projects: { project: string | null; total: number; completed: number; high_priority: number }[];
+};
+
+type TaskPage = {
+  tasks: any[];
+  next_cursor?: string | null;
+  next_offset?: number | null;
+  sync_token?: string;
+};
+
+const nextPageQuery = (query: string, data: TaskPage): string | null => {
+  const params = new URLSearchParams(query);
+  if (data.next_cursor) params.set('cursor', data.next_cursor);
+  else if (data.next_offset != null) params.set('offset', String(data.next_offset));
+  else return null;
+  return params.toString();
+};
+
+const apiFetch = (url: string, init: RequestInit & { headers?: Record<string, string> } = {}) =>
+  fetch(url, WORKSPACE_ID ? { ...init, headers: { ...init.headers, 'X-Workspace-Id': WORKSPACE_ID } } : init);
+
+const eventsUrl = () => {
+  const params = new URLSearchParams({ action: 'events' });
+  if (WORKSPACE_ID) params.set('workspace_id', WORKSPACE_ID);
+  return `${API_URL}?${params}`;
+};
+
+const ifMatch = (task: Task): Record<string, string> =>
+  task.version ? { 'If-Match': `"${task.id}-${task.version}"` } : {};
 
 const Index = () => {
   const [activeTab, setActiveTab] = useState('tasks');
@@ -51,29 +104,74 @@ const Index = () => {
   const [dbTags, setDbTags] = useState<any[]>([]);
   const [dbProjects, setDbProjects] = useState<any[]>([]);
   const [isLoading, setIsLoading] = useState(true);
+  const [summary, setSummary] = useState<Summary | null>(null);
+  const [nextPage, setNextPage] = useState<string | null>(null);
+  const [searchQuery, setSearchQuery] = useState('');
+  const [selectedTags, setSelectedTags] = useState<string[]>([]);
+  const [selectedCategory, setSelectedCategory] = useState<string>('all');
+  const syncToken = useRef<string | null>(null);
+  const listQuery = useRef('');
+  const listRequest = useRef(0);
+  const filtersApplied = useRef(false);
+  const [calendarMonth, setCalendarMonth] = useState(() => new Date());
+  const [calendarDates, setCalendarDates] = useState<Date[]>([]);
 
   useEffect(() => {
-    loadTasks();
-    loadTags();
-    loadProjects();
+    loadBootstrap();
   }, []);
 
-  const loadTasks = async () => {
+  useEffect(() => {
+    const events = new EventSource(eventsUrl());
+    events.addEventListener('changes', (message) => {
+      const data = JSON.parse((message as MessageEvent).data);
+      if (data.events.length) syncTasks();
+    });
+    return () => events.close();
+  }, []);
+
+  useEffect(() => {
+    if (!filtersApplied.current) {
+      filtersApplied.current = true;
+      return;
+    }
+    const params = new URLSearchParams();
+    if (searchQuery.trim()) params.set('q', searchQuery.trim());
+    if (selectedTags.length) params.set('tags', selectedTags.join(','));
+    if (selectedCategory !== 'all') params.set('category', selectedCategory);
+    const timer = setTimeout(() => {
+      listQuery.current = params.toString();
+      loadTasks();
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [searchQuery, selectedTags, selectedCategory]);
+
+  const loadBootstrap = async () => {
     try {
-      const response = await fetch(API_URL);
+      const response = await apiFetch(`${API_URL}?action=bootstrap`);
+      if (!response.ok) throw new Error(`Bootstrap failed: ${response.status}`);
       const data = await response.json();
-      const loadedTasks = data.tasks.map((task: any) => ({
-        id: task.id,
-        title: task.title,
-        description: task.description || '',
-        completed: task.completed,
-        priority: task.priority,
-        tags: task.tags || [],
-        category: task.category || 'Без категории',
-        project: task.project || 'Без проекта',
-        dueDate: task.due_date ? new Date(task.due_date) : undefined,
-      }));
-      setTasks(loadedTasks);
+      setDbTags(data.tags || []);
+      setDbProjects(data.projects || []);
+      setSummary(data.stats);
+      await loadTasks(data);
+    } catch (error) {
+      console.error('Error loading bootstrap:', error);
+      loadTasks();
+      loadStats();
+      loadTags();
+      loadProjects();
+    }
+  };
+
+  const loadTasks = async (firstPage?: TaskPage) => {
+    const request = ++listRequest.current;
+    const query = listQuery.current;
+    try {
+      const data: TaskPage = firstPage ?? (await (await apiFetch(query ? `${API_URL}?${query}` : API_URL)).json());
+      if (request !== listRequest.current) return;
+      syncToken.current = data.sync_token ?? null;
+      setTasks(data.tasks.map(toTask));
+      setNextPage(nextPageQuery(query, data));
     } catch (error) {
       console.error('Error loading tasks:', error);
     } finally {
@@ -81,9 +179,90 @@ const Index = () => {
     }
   };
 
+  const loadMoreTasks = async () => {
+    if (!nextPage) return;
+    const request = listRequest.current;
+    try {
+      const response = await apiFetch(`${API_URL}?${nextPage}`);
+      const data: TaskPage = await response.json();
+      if (request !== listRequest.current) return;
+      setTasks((prev) => {
+        const known = new Set(prev.map((t) => t.id));
+        return [...prev, ...data.tasks.map(toTask).filter((t: Task) => !known.has(t.id))];
+      });
+      setNextPage(nextPageQuery(listQuery.current, data));
+    } catch (error) {
+      console.error('Error loading more tasks:', error);
+    }
+  };
+
+  const loadStats = async () => {
+    try {
+      const response = await apiFetch(`${API_URL}?action=stats`);
+      if (response.ok) setSummary(await response.json());
+    } catch (error) {
+      console.error('Error loading stats:', error);
+    }
+  };
+
+  const syncTasks = async () => {
+    loadStats();
+    if (!syncToken.current || listQuery.current) return loadTasks();
+    try {
+      const response = await apiFetch(`${API_URL}?since=${encodeURIComponent(syncToken.current)}`);
+      if (!response.ok) return loadTasks();
+      const data = await response.json();
+      if (data.catalog_changed) return loadTasks();
+      syncToken.current = data.sync_token;
+      const changed = new Map(
+        data.tasks.map((task: any): [Task['id'], Task] => [task.id, toTask(task)])
+      );
+      const removed = new Set<Task['id']>(data.deleted);
+      setTasks((prev) => {
+        const kept = prev
+          .filter((t) => !removed.has(t.id))
+          .map((t) => changed.get(t.id) ?? t);
+        const known = new Set(prev.map((t) => t.id));
+        const added = [...changed.values()].filter((t) => !known.has(t.id));
+        return [...added, ...kept];
+      });
+    } catch (error) {
+      console.error('Error syncing tasks:', error);
+    }
+  };
+
+  const loadCalendar = async (month: Date) => {
+    try {
+      const from = new Date(month.getFullYear(), month.getMonth(), 1);
+      const to = new Date(month.getFullYear(), month.getMonth() + 1, 1);
+      const dates: Date[] = [];
+      let cursor: string | null = null;
+      do {
+        const params = new URLSearchParams({
+          view: 'calendar',
+          due_from: from.toISOString(),
+          due_to: to.toISOString(),
+          limit: '500',
+        });
+        if (cursor) params.set('cursor', cursor);
+        const response = await apiFetch(`${API_URL}?${params}`);
+        const data = await response.json();
+        dates.push(...data.tasks.map((task: any) => new Date(task.due_date)));
+        cursor = data.next_cursor;
+      } while (cursor);
+      setCalendarDates(dates);
+    } catch (error) {
+      console.error('Error loading calendar:', error);
+    }
+  };
+
+  useEffect(() => {
+    if (activeTab === 'calendar') loadCalendar(calendarMonth);
+  }, [activeTab, calendarMonth, tasks]);
+
   const loadTags = async () => {
     try {
-      const response = await fetch(TAGS_API_URL);
+      const response = await apiFetch(TAGS_API_URL);
       const data = await response.json();
       setDbTags(data.tags || []);
     } catch (error) {
@@ -93,7 +272,7 @@ const Index = () => {
 
   const loadProjects = async () => {
     try {
-      const response = await fetch(PROJECTS_API_URL);
+      const response = await apiFetch(PROJECTS_API_URL);
       const data = await response.json();
       setDbProjects(data.projects || []);
     } catch (error) {
@@ -101,9 +280,6 @@ const Index = () => {
     }
   };
 
-  const [searchQuery, setSearchQuery] = useState('');
-  const [selectedTags, setSelectedTags] = useState<string[]>([]);
-  const [selectedCategory, setSelectedCategory] = useState<string>('all');
   const [isDialogOpen, setIsDialogOpen] = useState(false);
   const [editingTask, setEditingTask] = useState<Task | null>(null);
   const [isTagDialogOpen, setIsTagDialogOpen] = useState(false);
@@ -121,42 +297,27 @@ const Index = () => {
   const [newTag, setNewTag] = useState({ name: '', color: '#3B82F6', description: '' });
   const [newProject, setNewProject] = useState({ name: '', description: '', color: '#3B82F6' });
 
-  const allTags = Array.from(new Set(tasks.flatMap((t) => t.tags)));
-  const allCategories = Array.from(new Set(tasks.map((t) => t.category)));
-  const allProjects = Array.from(new Set(tasks.map((t) => t.project)));
-
-  const filteredTasks = tasks.filter((task) => {
-    const matchesSearch = task.title.toLowerCase().includes(searchQuery.toLowerCase());
-    const matchesTags =
-      selectedTags.length === 0 || selectedTags.some((tag) => task.tags.includes(tag));
-    const matchesCategory =
-      selectedCategory === 'all' || task.category === selectedCategory;
-    return matchesSearch && matchesTags && matchesCategory;
-  });
+  const allTags: string[] = dbTags.map((tag) => tag.name);
+  const allCategories = (summary?.categories ?? [])
+    .map((c) => c.category)
+    .filter((category): category is string => !!category);
 
   const toggleTask = async (id: string | number) => {
     const task = tasks.find((t) => t.id === id);
     if (!task) return;
 
     try {
-      const response = await fetch(API_URL, {
-        method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          id,
-          title: task.title,
-          description: task.description,
-          completed: !task.completed,
-          priority: task.priority,
-          tags: task.tags,
-          category: task.category,
-          project: task.project,
-          due_date: task.dueDate?.toISOString(),
-        }),
+      const response = await apiFetch(API_URL, {
+        method: 'PATCH',
+        headers: { 'Content-Type': 'application/json', ...ifMatch(task) },
+        body: JSON.stringify({ id, completed: !task.completed }),
       });
 
       if (response.ok) {
-        setTasks(tasks.map((t) => (t.id === id ? { ...t, completed: !t.completed } : t)));
+        const data = await response.json();
+        setTasks((prev) => prev.map((t) => (t.id === id ? toTask(data.task) : t)));
+      } else if (response.status === 412) {
+        await syncTasks();
       }
     } catch (error) {
       console.error('Error toggling task:', error);
@@ -173,7 +334,7 @@ const Index = () => {
     if (!newTask.title) return;
 
     try {
-      const response = await fetch(API_URL, {
+      const response = await apiFetch(API_URL, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -182,13 +343,13 @@ const Index = () => {
           priority: newTask.priority || 'medium',
           tags: newTask.tags || [],
           category: newTask.category || 'Без категории',
-          project: newTask.project || 'Без проекта',
+          project: toApiProject(newTask.project),
           due_date: newTask.dueDate?.toISOString(),
         }),
       });
 
       if (response.ok) {
-        await loadTasks();
+        await syncTasks();
         setNewTask({
           title: '',
           description: '',
@@ -208,9 +369,9 @@ const Index = () => {
     if (!editingTask || !editingTask.title) return;
 
     try {
-      const response = await fetch(API_URL, {
+      const response = await apiFetch(API_URL, {
         method: 'PUT',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...ifMatch(editingTask) },
         body: JSON.stringify({
           id: editingTask.id,
           title: editingTask.title,
@@ -219,14 +380,16 @@ const Index = () => {
           priority: editingTask.priority,
           tags: editingTask.tags,
           category: editingTask.category,
-          project: editingTask.project,
+          project: toApiProject(editingTask.project),
           due_date: editingTask.dueDate?.toISOString(),
         }),
       });
 
       if (response.ok) {
-        await loadTasks();
+        await syncTasks();
         setEditingTask(null);
+      } else if (response.status === 412) {
+        await syncTasks();
       }
     } catch (error) {
       console.error('Error updating task:', error);
@@ -235,12 +398,12 @@ const Index = () => {
 
   const deleteTask = async (id: string | number) => {
     try {
-      const response = await fetch(`${API_URL}?id=${id}`, {
+      const response = await apiFetch(`${API_URL}?id=${id}`, {
         method: 'DELETE',
       });
 
       if (response.ok) {
-        await loadTasks();
+        await syncTasks();
       }
     } catch (error) {
       console.error('Error deleting task:', error);
@@ -250,7 +413,7 @@ const Index = () => {
   const addTag = async () => {
     if (!newTag.name) return;
     try {
-      const response = await fetch(TAGS_API_URL, {
+      const response = await apiFetch(TAGS_API_URL, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(newTag),
@@ -268,7 +431,7 @@ const Index = () => {
   const updateTag = async () => {
     if (!editingTag || !editingTag.name) return;
     try {
-      const response = await fetch(TAGS_API_URL, {
+      const response = await apiFetch(TAGS_API_URL, {
         method: 'PUT',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(editingTag),
@@ -284,7 +447,7 @@ const Index = () => {
 
   const deleteTag = async (id: number) => {
     try {
-      const response = await fetch(`${TAGS_API_URL}?id=${id}`, {
+      const response = await apiFetch(`${TAGS_API_URL}?id=${id}`, {
         method: 'DELETE',
       });
       if (response.ok) {
@@ -298,7 +461,7 @@ const Index = () => {
   const addProject = async () => {
     if (!newProject.name) return;
     try {
-      const response = await fetch(PROJECTS_API_URL, {
+      const response = await apiFetch(PROJECTS_API_URL, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(newProject),
@@ -316,7 +479,7 @@ const Index = () => {
   const updateProject = async () => {
     if (!editingProject || !editingProject.name) return;
     try {
-      const response = await fetch(PROJECTS_API_URL, {
+      const response = await apiFetch(PROJECTS_API_URL, {
         method: 'PUT',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(editingProject),
@@ -332,7 +495,7 @@ const Index = () => {
 
   const deleteProject = async (id: number) => {
     try {
-      const response = await fetch(`${PROJECTS_API_URL}?id=${id}`, {
+      const response = await apiFetch(`${PROJECTS_API_URL}?id=${id}`, {
         method: 'DELETE',
       });
       if (response.ok) {
@@ -344,11 +507,15 @@ const Index = () => {
   };
 
   const stats = {
-    total: tasks.length,
-    completed: tasks.filter((t) => t.completed).length,
-    active: tasks.filter((t) => !t.completed).length,
-    highPriority: tasks.filter((t) => t.priority === 'high' && !t.completed).length,
+    total: summary?.stats.total ?? 0,
+    completed: summary?.stats.completed ?? 0,
+    active: summary?.stats.active ?? 0,
+    highPriority: summary?.stats.high_priority ?? 0,
   };
+  const categoryStats = (summary?.categories ?? []).filter((c) => c.total > 0);
+  const tagStats = (summary?.tags ?? []).filter((t) => t.total > 0);
+  const tagCounts = new Map((summary?.tags ?? []).map((t) => [t.tag, t]));
+  const projectCounts = new Map((summary?.projects ?? []).map((p) => [p.project, p]));
 
   const priorityColor = {
     high: 'bg-red-100 text-red-700 border-red-200',
@@ -688,7 +855,7 @@ const Index = () => {
             </div>
 
             <div className="space-y-3">
-              {filteredTasks.map((task) => (
+              {tasks.map((task) => (
                 <Card
                   key={task.id}
                   className={cn(
@@ -780,6 +947,15 @@ const Index = () => {
                 </Card>
               ))}
             </div>
+
+            {nextCursor && (
+              <div className="flex justify-center">
+                <Button variant="outline" onClick={loadMoreTasks} className="gap-2">
+                  <Icon name="ChevronDown" size={16} />
+                  Показать ещё
+                </Button>
+              </div>
+            )}
           </TabsContent>
 
           <TabsContent value="tags" className="animate-fade-in">
@@ -840,8 +1016,8 @@ const Index = () => {
               
               <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-4">
                 {dbTags.map((tag: any) => {
-                  const tagTasks = tasks.filter((t) => t.tags.includes(tag.name));
-                  const completed = tagTasks.filter((t) => t.completed).length;
+                  const total = tagCounts.get(tag.name)?.total ?? 0;
+                  const completed = tagCounts.get(tag.name)?.completed ?? 0;
                   
                   return (
                     <Card key={tag.id} className="p-5 border-2 hover:shadow-lg transition-all">
@@ -858,11 +1034,11 @@ const Index = () => {
                             <p className="text-sm text-slate-500 mb-2">{tag.description}</p>
                           )}
                           <p className="text-sm text-slate-600 mb-3">
-                            {tagTasks.length} {tagTasks.length === 1 ? 'задача' : 'задач'}
+                            {total} {total === 1 ? 'задача' : 'задач'}
                           </p>
                           <div className="space-y-1 text-xs text-slate-500">
                             <div>Завершено: {completed}</div>
-                            <div>В работе: {tagTasks.length - completed}</div>
+                            <div>В работе: {total - completed}</div>
                           </div>
                         </div>
                       </div>
@@ -1000,12 +1176,11 @@ const Index = () => {
 
               <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-4">
                 {dbProjects.map((project: any) => {
-                  const projectTasks = tasks.filter((t) => t.project === project.name);
-                  const completed = projectTasks.filter((t) => t.completed).length;
-                  const progress = projectTasks.length > 0 ? (completed / projectTasks.length) * 100 : 0;
-                  const highPriorityTasks = projectTasks.filter(
-                    (t) => t.priority === 'high' && !t.completed
-                  ).length;
+                  const counts = projectCounts.get(project.name);
+                  const total = counts?.total ?? 0;
+                  const completed = counts?.completed ?? 0;
+                  const progress = total > 0 ? (completed / total) * 100 : 0;
+                  const highPriorityTasks = counts?.high_priority ?? 0;
 
                   return (
                     <Card key={project.id} className="p-6 border-2 hover:shadow-lg transition-all">
@@ -1022,7 +1197,7 @@ const Index = () => {
                             <p className="text-sm text-slate-500 mb-2">{project.description}</p>
                           )}
                           <p className="text-sm text-slate-600">
-                            {projectTasks.length} {projectTasks.length === 1 ? 'задача' : 'задач'}
+                            {total} {total === 1 ? 'задача' : 'задач'}
                           </p>
                         </div>
                         {highPriorityTasks > 0 && (
@@ -1032,12 +1207,12 @@ const Index = () => {
                         )}
                       </div>
                       
-                      {projectTasks.length > 0 && (
+                      {total > 0 && (
                         <div className="space-y-2 mb-4">
                           <div className="flex justify-between text-sm">
                             <span className="text-slate-600">Прогресс</span>
                             <span className="font-semibold text-slate-800">
-                              {completed}/{projectTasks.length}
+                              {completed}/{total}
                             </span>
                           </div>
                           <div className="h-2 bg-slate-200 rounded-full overflow-hidden">
@@ -1130,11 +1305,9 @@ const Index = () => {
                 <Calendar
                   mode="single"
                   className="rounded-md border"
-                  modifiers={{
-                    hasTask: tasks
-                      .filter((t) => t.dueDate)
-                      .map((t) => t.dueDate as Date),
-                  }}
+                  month={calendarMonth}
+                  onMonthChange={setCalendarMonth}
+                  modifiers={{ hasTask: calendarDates }}
                   modifiersStyles={{
                     hasTask: {
                       fontWeight: 'bold',
@@ -1203,25 +1376,20 @@ const Index = () => {
                 Распределение по категориям
               </h3>
               <div className="space-y-3">
-                {allCategories.map((category) => {
-                  const count = tasks.filter((t) => t.category === category).length;
-                  const percentage = (count / tasks.length) * 100;
-
-                  return (
-                    <div key={category}>
-                      <div className="flex justify-between text-sm mb-1">
-                        <span className="text-slate-700">{category}</span>
-                        <span className="font-semibold text-slate-800">{count} задач</span>
-                      </div>
-                      <div className="h-2 bg-slate-200 rounded-full overflow-hidden">
-                        <div
-                          className="h-full bg-blue-600 transition-all"
-                          style={{ width: `${percentage}%` }}
-                        />
-                      </div>
+                {categoryStats.map(({ category, total, percentage }) => (
+                  <div key={category ?? ''}>
+                    <div className="flex justify-between text-sm mb-1">
+                      <span className="text-slate-700">{category || 'Без категории'}</span>
+                      <span className="font-semibold text-slate-800">{total} задач</span>
                     </div>
-                  );
-                })}
+                    <div className="h-2 bg-slate-200 rounded-full overflow-hidden">
+                      <div
+                        className="h-full bg-blue-600 transition-all"
+                        style={{ width: `${percentage}%` }}
+                      />
+                    </div>
+                  </div>
+                ))}
               </div>
             </Card>
           </TabsContent>
@@ -1261,18 +1429,15 @@ const Index = () => {
                   Популярные теги
                 </h3>
                 <div className="flex flex-wrap gap-2">
-                  {allTags.map((tag) => {
-                    const count = tasks.filter((t) => t.tags.includes(tag)).length;
-                    return (
-                      <Badge
-                        key={tag}
-                        variant="secondary"
-                        className="px-4 py-2 text-sm bg-blue-50 text-blue-700 border-blue-200"
-                      >
-                        {tag} ({count})
-                      </Badge>
-                    );
-                  })}
+                  {tagStats.map(({ tag, total }) => (
+                    <Badge
+                      key={tag}
+                      variant="secondary"
+                      className="px-4 py-2 text-sm bg-blue-50 text-blue-700 border-blue-200"
+                    >
+                      {tag} ({total})
+                    </Badge>
+                  ))}
                 </div>
               </Card>
             </div>